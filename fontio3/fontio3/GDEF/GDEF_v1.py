@@ -13,7 +13,13 @@ import logging
 
 # Other imports
 from fontio3.fontdata import simplemeta
-from fontio3.GDEF import attachlist, glyphclass, ligcaret, markclass, markset
+from fontio3.GDEF import (
+  attachlist,
+  glyphclass,
+  ignorables,
+  ligcaret,
+  markclass,
+  markset)
 from fontio3.opentype import version as otversion
 
 # -----------------------------------------------------------------------------
@@ -182,6 +188,15 @@ class GDEF(object, metaclass=simplemeta.FontDataMetaclass):
         for table, tableStake in toBeWritten:
             table.buildBinary(w, stakeValue=tableStake, **kwArgs)
     
+    def clearCaches(self):
+        """
+        Discards the glyph masks cached by ignorableMask(). The Editor's
+        changed(b'GDEF') call does this, so it only needs to be called
+        directly for GDEF objects that are not in an Editor.
+        """
+        
+        ignorables.clearCaches(self)
+    
     @classmethod
     def frommtxxtables(cls, editor, **kwArgs):
         """
@@ -540,8 +555,23 @@ class GDEF(object, metaclass=simplemeta.FontDataMetaclass):
                 r.__dict__[san[sti+1]] = _makers[sti]()
                 
         return r
-
-
+    
+    def ignorableMask(self, flags, markFilteringSet=None):
+        """
+        Returns a bytes object indexed by glyph, showing which glyphs a Lookup
+        with the specified LookupFlag (and mark filtering set, if used) will
+        ignore, and which are marks. See the ignorableMask() function in the
+        fontio3.GDEF.ignorables module for details. The masks are cached, so
+        this is fast after the first call for a given set of flags.
+        
+        >>> m = _testingValues[1].ignorableMask(
+        ...   lookupflag.LookupFlag(ignoreLigatures=True))
+        >>> [g for g in range(len(m) - 1) if m[g]]
+        [4, 5, 6, 10, 11, 15]
+        """
+        
+        return ignorables.ignorableMask(self, flags, markFilteringSet)
+    
     def writeFontWorkerSource(self, s, **kwArgs):
         """
         Write the GDEF table to stream 's' in Font Worker dump format.
@@ -603,6 +633,7 @@ if 0:
 
 if __debug__:
     from fontio3 import utilities
+    from fontio3.opentype import lookupflag
     from fontio3.utilities import namer
     from io import StringIO
     from fontio3.opentype.fontworkersource import FontWorkerSource
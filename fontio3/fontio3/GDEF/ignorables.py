@@ -0,0 +1,213 @@
+#
+# ignorables.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for masks showing which glyphs a Lookup ignores, and which glyphs are
+marks, as determined by a GDEF table and a LookupFlag. The masks are cached
+in the GDEF object, one for each distinct combination of flags, so that
+classifying a whole glyph array is a single gather from a bytes object.
+"""
+
+# System imports
+import operator
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# These are the bits in each entry of a mask.
+
+IGNORABLE = 1
+MARK = 2
+
+# -----------------------------------------------------------------------------
+
+#
+# Private functions
+#
+
+def _flagsKey(flags, markFilteringSet):
+    """
+    Returns a hashable key for the parts of the flags that affect the mask.
+    Different flags with the same effect (for instance, different mark
+    attachment types when all marks are ignored anyway) get the same key.
+    """
+    
+    if flags.ignoreMarks:
+        markKey = (True, None, 0)
+    elif flags.useMarkFilteringSet:
+        markKey = (False, id(markFilteringSet), 0)
+    else:
+        markKey = (False, None, flags.markAttachmentType)
+    
+    return (bool(flags.ignoreBaseGlyphs), bool(flags.ignoreLigatures)) + markKey
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def classify(mask, glyphArray):
+    """
+    Returns a pair of lists of Booleans with the same length as glyphArray:
+    whether each glyph is ignorable, and whether each glyph is a mark. The
+    mask is one returned by ignorableMask(). The glyph index -1 (a deleted
+    glyph) is both.
+    
+    >>> mask = bytes([0, 1, 2, 3, 3])
+    >>> classify(mask, [0, 1, 2, 3, -1, 9])
+    ([False, True, False, True, True, False], [False, False, True, True, True, False])
+    >>> classify(mask, [])
+    ([], [])
+    """
+    
+    if not glyphArray:
+        return [], []
+    
+    n = len(mask) - 1
+    
+    if -1 <= min(glyphArray) and max(glyphArray) < n:
+        bits = operator.itemgetter(*glyphArray)(mask)
+        
+        if len(glyphArray) == 1:
+            bits = (bits,)
+    
+    else:
+        bits = [
+          (mask[g] if -1 <= g < n else 0)
+          for g in glyphArray]
+    
+    return (
+      [(b & IGNORABLE) != 0 for b in bits],
+      [(b & MARK) != 0 for b in bits])
+
+def clearCaches(gdefObj):
+    """
+    Discards all the masks cached in the specified GDEF object.
+    
+    >>> obj = _makeTestGDEF()
+    >>> m = ignorableMask(obj, LF(ignoreMarks=True))
+    >>> clearCaches(obj)
+    >>> ignorableMask(obj, LF(ignoreMarks=True)) is m
+    False
+    """
+    
+    gdefObj.__dict__.pop('_ignorableMasks', None)
+
+def ignorableMask(gdefObj, flags, markFilteringSet=None):
+    """
+    Returns a bytes object with one entry for each glyph index covered by the
+    GDEF object's glyph classes, made of the IGNORABLE and MARK bits for a
+    Lookup with the specified flags and mark filtering set. There is one more
+    entry at the end, for glyph index -1, which is both, so the mask may be
+    indexed directly by any glyph index from -1 up to (but not including) its
+    length minus one. Glyphs beyond that have class zero, and so are neither.
+    
+    The mask is made the first time it is needed and then cached in the GDEF
+    object until clearCaches() is called. Edits to the GDEF are not noticed
+    otherwise, so after any change to its glyphClasses or markClasses the
+    Editor's changed(b'GDEF') method (which calls clearCaches()) must be
+    called, or clearCaches() itself for a GDEF object not in an Editor.
+    
+    >>> obj = _makeTestGDEF()
+    >>> sorted(obj.glyphClasses.items())
+    [(1, 1), (2, 2), (3, 3), (4, 3), (5, 3)]
+    >>> list(ignorableMask(obj, LF()))
+    [0, 0, 0, 2, 2, 2, 3]
+    >>> list(ignorableMask(obj, LF(ignoreBaseGlyphs=True, ignoreMarks=True)))
+    [0, 1, 0, 3, 3, 3, 3]
+    >>> list(ignorableMask(obj, LF(markAttachmentType=1)))
+    [0, 0, 0, 2, 3, 3, 3]
+    >>> list(ignorableMask(obj, LF(useMarkFilteringSet=True), {4, 5}))
+    [0, 0, 0, 3, 2, 2, 3]
+    >>> m = ignorableMask(obj, LF(ignoreLigatures=True))
+    >>> ignorableMask(obj, LF(ignoreLigatures=True)) is m
+    True
+    >>> list(m)
+    [0, 0, 1, 2, 2, 2, 3]
+    >>> obj.glyphClasses[2] = 1
+    >>> clearCaches(obj)
+    >>> list(ignorableMask(obj, LF(ignoreLigatures=True)))
+    [0, 0, 0, 2, 2, 2, 3]
+    """
+    
+    cache = gdefObj.__dict__.setdefault('_ignorableMasks', {})
+    key = _flagsKey(flags, markFilteringSet)
+    t = cache.get(key, None)
+    
+    if t is not None:
+        return t[1]
+    
+    gc = gdefObj.glyphClasses or {}
+    mc = gdefObj.markClasses or {}
+    mfs = markFilteringSet or ()
+    mask = bytearray(1 + (max(gc) + 1 if gc else 0))
+    mask[-1] = IGNORABLE | MARK
+    
+    for g, c in gc.items():
+        if c == 1:
+            if flags.ignoreBaseGlyphs:
+                mask[g] = IGNORABLE
+        
+        elif c == 2:
+            if flags.ignoreLigatures:
+                mask[g] = IGNORABLE
+        
+        elif c == 3:
+            if flags.ignoreMarks:
+                ignore = True
+            elif flags.useMarkFilteringSet:
+                ignore = g not in mfs
+            elif flags.markAttachmentType:
+                ignore = flags.markAttachmentType != mc.get(g, 0)
+            else:
+                ignore = False
+            
+            mask[g] = (MARK | IGNORABLE if ignore else MARK)
+    
+    # The mark filtering set is kept with its mask, so its id() in the key
+    # cannot be reused by another set while the mask is cached.
+    
+    mask = bytes(mask)
+    cache[key] = (markFilteringSet, mask)
+    return mask
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+if __debug__:
+    from fontio3.GDEF import glyphclass, markclass
+    from fontio3.opentype import lookupflag
+    
+    LF = lookupflag.LookupFlag
+    
+    def _makeTestGDEF():
+        from fontio3.GDEF import GDEF_v1
+        
+        return GDEF_v1.GDEF(
+          glyphClasses = glyphclass.GlyphClassTable(
+            {1: 1, 2: 2, 3: 3, 4: 3, 5: 3}),
+          markClasses = markclass.MarkClassTable({3: 1, 4: 2, 5: 2}))
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
@@ -22,6 +22,7 @@ from fontio3.opentype import (
   featuredict,
   featurevariations,
   lookuplist,
+  overflow,
   scriptdict)
 
 from fontio3.opentype import version as otversion
@@ -154,6 +155,11 @@ class GPOS(GPOS_v10, metaclass=simplemeta.FontDataMetaclass):
         Adds the binary data for the GPOS object to the specified LinkedWriter.
         (Note that this class has an explicit binaryString() method as well).
         
+        The table is built and resolved on its own, and any offsets that
+        would overflow are fixed automatically (see the overflow module in
+        fontio3.opentype), unless the resolveOverflows keyword argument is
+        False.
+        
         >>> utilities.hexdump(_testingValues[1].binaryString())
                0 | 0001 0001 000E 0040  006E 0000 0000 0001 |.......@.n......|
               10 | 6C61 746E 0008 0010  0002 656E 4742 001A |latn......enGB..|
@@ -164,15 +170,22 @@ class GPOS(GPOS_v10, metaclass=simplemeta.FontDataMetaclass):
               60 | 0004 012C 0050 0078  0000 0001 0001 0002 |...,.P.x........|
               70 | 0006 0016 0009 0002  0001 0008 0001 0002 |................|
               80 | 0000 0018 0009 0000  0001 0008 0001 0001 |................|
-              90 | 0000 005A 0001 000E  0081 0031 0002 0016 |...Z.......1....|
-              A0 | 0030 0001 0002 0008  000A 0002 000F 0000 |.0..............|
-              B0 | 0000 FFF6 0000 0000  0014 0000 0034 0000 |.............4..|
-              C0 | 0000 0000 0001 0014  001E 001A 0000 001A |................|
-              D0 | 000E 000C 0014 0002  BDF0 0020 3000 000C |........... 0...|
-              E0 | 0012 0001 8C04 0001  0008 0001 FFF6 0001 |................|
+              90 | 0000 003E 0001 003E  0081 0031 0002 000E |...>...>...1....|
+              A0 | 0028 0002 000F 0000  0000 FFF6 0000 0000 |.(..............|
+              B0 | 0014 0000 0044 0000  0000 0000 0001 0014 |.....D..........|
+              C0 | 001E 002A 0000 002A  001E 0001 0024 0001 |...*...*.....$..|
+              D0 | FFF6 0001 0002 0008  000A 000C 0014 0002 |................|
+              E0 | BDF0 0020 3000 000C  0012 0001 8C04 0001 |... 0...........|
               F0 | 0001 000A                                |....            |
         """
         
+        if kwArgs.get('resolveOverflows', True):
+            if 'stakeValue' in kwArgs:
+                w.stakeCurrentWithValue(kwArgs.pop('stakeValue'))
+            
+            w.addString(overflow.buildResolved(self.buildBinary, **kwArgs))
+            return
+        
         if 'stakeValue' in kwArgs:
             stakeValue = kwArgs.pop('stakeValue')
             w.stakeCurrentWithValue(stakeValue)
@@ -256,8 +269,7 @@ class GPOS(GPOS_v10, metaclass=simplemeta.FontDataMetaclass):
                   tagToFeatureIndex=ttfi,
                   **kwArgs)
             
-            for i, obj, stake in sorted(extPool.values()):
-                obj.buildBinary(w, stakeValue=stake, **kwArgs)
+            lookuplist.buildExtensionPool(w, extPool, **kwArgs)
 
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
@@ -280,28 +292,28 @@ class GPOS(GPOS_v10, metaclass=simplemeta.FontDataMetaclass):
         GPOS_test.GPOS.lookuplist.lookup 0.lookup - DEBUG - Subtable offset 0 is 8
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair - DEBUG - Walker has 96 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs - DEBUG - Walker has 96 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.coverage - DEBUG - Walker has 82 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.coverage - DEBUG - Walker has 34 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.coverage - DEBUG - Format is 1, count is 2
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.coverage - DEBUG - Raw data are [8, 10]
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 15.pairvalues - DEBUG - Walker has 70 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 15.pairvalues.value - DEBUG - Walker has 70 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 15.pairvalues.value - DEBUG - Walker has 66 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues - DEBUG - Walker has 58 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 58 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - Walker has 22 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 15.pairvalues - DEBUG - Walker has 78 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 15.pairvalues.value - DEBUG - Walker has 78 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 15.pairvalues.value - DEBUG - Walker has 74 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues - DEBUG - Walker has 66 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 66 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - Walker has 14 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - StartSize=12, endSize=18, format=1
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - Data are (35844,)
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 54 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues - DEBUG - Walker has 44 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 44 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - Walker has 22 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 62 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues - DEBUG - Walker has 52 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 52 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - Walker has 14 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - StartSize=12, endSize=18, format=1
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yAdvDevice.device - DEBUG - Data are (35844,)
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 40 remaining bytes.
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.xPlaDevice.device - DEBUG - Walker has 22 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value - DEBUG - Walker has 48 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.xPlaDevice.device - DEBUG - Walker has 14 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.xPlaDevice.device - DEBUG - StartSize=12, endSize=18, format=1
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.xPlaDevice.device - DEBUG - Data are (35844,)
-        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yPlaDevice.device - DEBUG - Walker has 34 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yPlaDevice.device - DEBUG - Walker has 26 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yPlaDevice.device - DEBUG - StartSize=12, endSize=20, format=2
         GPOS_test.GPOS.lookuplist.lookup 0.lookup.subtable 0.pair.pairglyphs.second glyph 20.pairvalues.value.yPlaDevice.device - DEBUG - Data are (48624, 32, 12288)
         GPOS_test.GPOS.lookuplist - DEBUG - Offset 1 is 22
@@ -309,11 +321,11 @@ class GPOS(GPOS_v10, metaclass=simplemeta.FontDataMetaclass):
         GPOS_test.GPOS.lookuplist.lookup 1.lookup - DEBUG - Kind is 9
         GPOS_test.GPOS.lookuplist.lookup 1.lookup - DEBUG - Number of subtables is 1
         GPOS_test.GPOS.lookuplist.lookup 1.lookup - DEBUG - Subtable offset 0 is 8
-        GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single - DEBUG - Walker has 14 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single - DEBUG - Walker has 42 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single.coverage - DEBUG - Walker has 6 remaining bytes.
         GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single.coverage - DEBUG - Format is 1, count is 1
         GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single.coverage - DEBUG - Raw data are [10]
-        GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single.value - DEBUG - Walker has 8 remaining bytes.
+        GPOS_test.GPOS.lookuplist.lookup 1.lookup.subtable 0.single.value - DEBUG - Walker has 36 remaining bytes.
         GPOS_test.GPOS.featuredict - DEBUG - Walker has 180 remaining bytes.
         GPOS_test.GPOS.featuredict - DEBUG - Count is 3
         GPOS_test.GPOS.featuredict - DEBUG - Feature 0: tag is 'abcd', offset is 20
@@ -12,7 +12,7 @@ Support for anchored locations, specified solely via FUnit values.
 import logging
 
 # Other imports
-from fontio3 import utilities
+from fontio3 import utilities, utilitiesbackend
 from fontio3.fontmath import point
 from fontio3.utilities import valassist
 
@@ -68,13 +68,14 @@ class Anchor_Coord(point.Point):
                0 | 0001 FFD8 0012                           |......          |
         """
         
+        s = utilitiesbackend.utPack("H2h", 1, *self)
+        
         if 'stakeValue' in kwArgs:
-            stakeValue = kwArgs.pop('stakeValue')
-            w.stakeCurrentWithValue(stakeValue)
-        else:
-            stakeValue = w.stakeCurrent()
+            w.addSharedString(kwArgs.pop('stakeValue'), s)
         
-        w.add("H2h", 1, *self)
+        else:
+            w.stakeCurrent()
+            w.addString(s)
     
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
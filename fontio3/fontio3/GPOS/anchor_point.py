@@ -12,7 +12,7 @@ Support for anchored locations, specified as FUnit deltas from an anchor point.
 import logging
 
 # Other imports
-from fontio3 import utilities
+from fontio3 import utilities, utilitiesbackend
 from fontio3.glyf import ttcompositeglyph
 from fontio3.GPOS import anchor_coord
 
@@ -228,13 +228,14 @@ class Anchor_Point(anchor_coord.Anchor_Coord):
                0 | 0002 FFD8 0012 0006                      |........        |
         """
         
+        s = utilitiesbackend.utPack("H3h", 2, self.x, self.y, self.pointIndex)
+        
         if 'stakeValue' in kwArgs:
-            stakeValue = kwArgs.pop('stakeValue')
-            w.stakeCurrentWithValue(stakeValue)
-        else:
-            stakeValue = w.stakeCurrent()
+            w.addSharedString(kwArgs.pop('stakeValue'), s)
         
-        w.add("H3h", 2, self.x, self.y, self.pointIndex)
+        else:
+            w.stakeCurrent()
+            w.addString(s)
     
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
@@ -422,6 +422,18 @@ class Cursive(dict, metaclass=mapmeta.FontDataMetaclass):
         
         return {}
 
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs that have an EntryExit record. The glyph
+        at the start index must be one of these, so the Lookup uses this to
+        skip the subtable for other glyphs.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [5, 12, 40]
+        """
+        
+        return set(self)
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
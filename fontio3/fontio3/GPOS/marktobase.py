@@ -589,6 +589,18 @@ class MarkToBase(object, metaclass=simplemeta.FontDataMetaclass):
         cache[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the mark glyphs in this subtable. Processing starts
+        at the mark, so the Lookup uses this to skip the subtable for all
+        other glyphs.
+        
+        >>> sorted(_makeTest()[0].firstGlyphs())
+        [12, 13, 14, 15]
+        """
+        
+        return set(self.mark)
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
@@ -240,6 +240,26 @@ class PairClasses(dict, metaclass=mapmeta.FontDataMetaclass):
     # Methods
     #
     
+    def asMatrix(self, **kwArgs):
+        """
+        Returns a pairclasses_matrix.Matrix with the values in this object.
+        This gives constant-time access to each class pair's values and fast
+        whole-table edits; use updateFromMatrix() to bring the edits back. The
+        keyword arguments are passed to Matrix.frompairclasses().
+        
+        >>> m = _testingValues[0].asMatrix()
+        >>> m.count1, m.count2
+        (3, 2)
+        >>> m[1, 1].pprint()
+        Second adjustment:
+          FUnit adjustment to origin's x-coordinate: -10
+        """
+        
+        # The matrix module's test data uses this module, so import it here
+        from fontio3.GPOS import pairclasses_matrix
+        
+        return pairclasses_matrix.Matrix.frompairclasses(self, **kwArgs)
+    
     def asVOLT(self, lookupLabel, **kwArgs):
         """
         Returns 1) VOLT-compatible Glyph Group definitions (.vtg) and 2)
@@ -374,21 +394,30 @@ class PairClasses(dict, metaclass=mapmeta.FontDataMetaclass):
         count1 = 1 + utilities.safeMax(self.classDef1.values())
         count2 = 1 + utilities.safeMax(self.classDef2.values())
         w.add("HH", count1, count2)
-        emptyPV = pairvalues.PairValues(value.Value(), value.Value())
         devicePool = {}
-        Key = pairclasses_key.Key
         
-        for c1 in range(count1):
-            for c2 in range(count2):
-                obj = self.get(Key([c1, c2]), emptyPV)
-                
-                obj.buildBinary(
-                  w,
-                  devicePool = devicePool,
-                  posBase = stakeValue,
-                  valueFormatFirst = vf1,
-                  valueFormatSecond = vf2,
-                  **kwArgs)
+        if (vf1 | vf2) & 0xFFF0:
+            emptyPV = pairvalues.PairValues(value.Value(), value.Value())
+            Key = pairclasses_key.Key
+            
+            for c1 in range(count1):
+                for c2 in range(count2):
+                    obj = self.get(Key([c1, c2]), emptyPV)
+                    
+                    obj.buildBinary(
+                      w,
+                      devicePool = devicePool,
+                      posBase = stakeValue,
+                      valueFormatFirst = vf1,
+                      valueFormatSecond = vf2,
+                      **kwArgs)
+        
+        else:
+            # Only FUnit fields, so the class records can be written straight
+            # from a dense matrix without any per-record objects.
+            
+            m = self.asMatrix(valueFormats=(vf1, vf2))
+            w.addString(m.binaryString())
         
         # Now add the deferred objects
         covTable.buildBinary(w, stakeValue=covStake)
@@ -515,6 +544,25 @@ class PairClasses(dict, metaclass=mapmeta.FontDataMetaclass):
         cache[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs whose first class is used by at least one
+        key. Glyphs in the coverageExtras are included if class zero is used.
+        The Lookup uses this to skip the subtable for glyphs that cannot start
+        a pair.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [5, 6, 7, 15]
+        """
+        
+        classes = {key[0] for key in self}
+        r = {g for g, c in self.classDef1.items() if c in classes}
+        
+        if 0 in classes:
+            r.update(self.coverageExtras)
+        
+        return r
+    
     @classmethod
     def fromformat2(cls, f2, **kwArgs):
         """
@@ -1195,18 +1243,20 @@ class PairClasses(dict, metaclass=mapmeta.FontDataMetaclass):
         igsFunc = kwArgs['igsFunc']
         igs = igsFunc(glyphArray, **kwArgs)
         
-        v = [
-          (g, i)
-          for i, g in enumerate(glyphArray[startIndex:], start=startIndex)
-          if (not igs[i])]
+        # Only the first two non-ignorables are needed, so stop looking once
+        # they have been found.
+        
+        it = (
+          i
+          for i in range(startIndex, len(glyphArray))
+          if (not igs[i]))
         
-        if len(v) < 2:
+        vBackMap = list(itertools.islice(it, 2))
+        
+        if len(vBackMap) < 2:
             return (None, 0)
         
-        vNonIgs = [x[0] for x in v]
-        vBackMap = [x[1] for x in v]
-        keyG = tuple(vNonIgs[:2])
-        g1, g2 = keyG
+        g1, g2 = glyphArray[vBackMap[0]], glyphArray[vBackMap[1]]
         cd1 = self.classDef1
         cd2 = self.classDef2
         c1 = cd1.get(g1, (0 if g1 in self.coverageExtras else -1))
@@ -1231,6 +1281,50 @@ class PairClasses(dict, metaclass=mapmeta.FontDataMetaclass):
         r[vBackMap[1]].add(fv(pvObj.second, **kwArgs))
         return (r, (2 if pvObj.second is not None else 1))
 
+    def splitForSize(self, **kwArgs):
+        """
+        Returns a list of subtables which together do what this object does,
+        but with a smaller total binary size where possible. See the function
+        of the same name in pairclasses_split for the keyword arguments.
+        
+        >>> obj = _testingValues[0]
+        >>> obj.splitForSize(allowFormat1=False)[0] is obj
+        True
+        """
+        
+        # The split module's test data uses this module, so import it here
+        from fontio3.GPOS import pairclasses_split
+        
+        return pairclasses_split.splitForSize(self, **kwArgs)
+
+    def updateFromMatrix(self, m):
+        """
+        Replaces the contents of this object with the values in the specified
+        pairclasses_matrix.Matrix, which should have been made by asMatrix()
+        from this object (or from another with the same class definitions).
+        Cells that were present, or that are now nonzero, are kept; all others
+        are removed.
+        
+        >>> obj = _testingValues[0].__deepcopy__()
+        >>> m = obj.asMatrix()
+        >>> m.zeroRow(2)
+        >>> m.scale(2)
+        >>> obj.updateFromMatrix(m)
+        >>> for key in sorted(obj): print(key, bool(obj[key]))
+        (1, 1) True
+        (2, 0) False
+        (2, 1) False
+        >>> obj[1, 1].pprint()
+        Second adjustment:
+          FUnit adjustment to origin's x-coordinate: -20
+        """
+        
+        Key = pairclasses_key.Key
+        self.clear()
+        
+        for key, obj in m.items():
+            self[Key(key)] = obj
+    
     def writeFontWorkerSource(self, s, **kwArgs):
         """
         Write Class definitions and PairValues for our keys. Must pass
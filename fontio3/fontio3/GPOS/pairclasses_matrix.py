@@ -0,0 +1,357 @@
+#
+# pairclasses_matrix.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Dense class-by-class matrices of the values in format 2 GPOS pair positioning
+tables.
+"""
+
+# System imports
+import array
+import sys
+
+# Other imports
+from fontio3 import utilities
+from fontio3.GPOS import pairclasses_key, pairvalues, value
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# These are the Value attributes stored in the matrix, in mask bit order. The
+# Device and Variation attributes are offsets in the binary data, so they
+# cannot be kept in a flat array of values.
+
+fieldNames = ('xPlacement', 'yPlacement', 'xAdvance', 'yAdvance')
+
+# -----------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+if 0:
+    def __________________(): pass
+
+class Matrix(object):
+    """
+    Objects holding the values of a PairClasses object as a dense grid, with
+    one row for each first class and one column for each second class. The
+    FUnit fields of all the cells are kept in a single array of signed 16-bit
+    values, laid out exactly as the class records in the binary data. This
+    gives constant-time access to any cell, whole-matrix edits without any
+    per-cell objects, and binary output straight from the array. There are
+    seven attributes:
+        
+        count1          The number of first classes (rows).
+        
+        count2          The number of second classes (columns).
+        
+        extras          A dict mapping (class1, class2) pairs to PairValues
+                        objects, for cells whose Values have Device or
+                        Variation parts. The FUnit fields of these cells are
+                        still kept in values, which take precedence.
+        
+        fields          A tuple of (which, fieldName) pairs, one for each array
+                        entry in a cell, in binary order. The which value is 0
+                        for the first Value and 1 for the second.
+        
+        present         A bytearray with one entry for each cell, nonzero if
+                        the cell has a key in the PairClasses object.
+        
+        valueFormats    A pair with the first and second value formats.
+        
+        values          The array of FUnit values, row by row.
+    
+    >>> m = Matrix.frompairclasses(_testingValues[1])
+    >>> m.count1, m.count2, m.valueFormats, m.fields
+    (3, 3, (4, 0), ((0, 'xAdvance'),))
+    >>> list(m.values)
+    [0, 0, 0, 0, -40, -25, 0, 15, 0]
+    >>> m[1, 1].pprint()
+    First adjustment:
+      FUnit adjustment to horizontal advance: -40
+    >>> print(m[0, 1])
+    None
+    """
+    
+    #
+    # Methods
+    #
+    
+    def __init__(self, count1, count2, valueFormats, **kwArgs):
+        """
+        Initializes an empty (all zero) matrix with the specified number of
+        rows and columns and the specified (first, second) value formats.
+        """
+        
+        self.count1 = count1
+        self.count2 = count2
+        self.valueFormats = tuple(valueFormats)
+        
+        self.fields = tuple(
+          (which, name)
+          for which, mask in enumerate(self.valueFormats)
+          for i, name in enumerate(fieldNames)
+          if mask & (1 << i))
+        
+        cellCount = count1 * count2
+        self.values = array.array('h', [0]) * (cellCount * len(self.fields))
+        self.present = bytearray(cellCount)
+        self.extras = {}
+    
+    def __getitem__(self, key):
+        """
+        Returns a PairValues object for the specified (class1, class2) pair,
+        or None if that cell is all zeroes and has no Device or Variation
+        parts. A new object is returned each time, so changes made to it will
+        not affect the matrix.
+        
+        >>> m = Matrix.frompairclasses(_testingValues[0])
+        >>> m[1, 1].pprint()
+        Second adjustment:
+          FUnit adjustment to origin's x-coordinate: -10
+        >>> m[2, 0].pprint()
+        First adjustment:
+          Device for vertical advance:
+            Tweak at 12 ppem: -2
+            Tweak at 14 ppem: -1
+            Tweak at 18 ppem: 1
+        """
+        
+        c1, c2 = key
+        n = len(self.fields)
+        start = (c1 * self.count2 + c2) * n
+        cell = self.values[start:start+n]
+        extra = self.extras.get((c1, c2), None)
+        
+        if extra is None:
+            if not any(cell):
+                return None
+            
+            extra = pairvalues.PairValues()
+        
+        vals = [
+          (None if obj is None else obj.__copy__())
+          for obj in (extra.first, extra.second)]
+        
+        for (which, name), x in zip(self.fields, cell):
+            if vals[which] is None:
+                if not x:
+                    continue
+                
+                vals[which] = value.Value()
+            
+            vals[which].__dict__[name] = x
+        
+        return pairvalues.PairValues(*vals)
+    
+    def binaryString(self):
+        """
+        Returns the class records as a binary string, in the form used in a
+        PairPosFormat2 subtable. This is only possible if the value formats
+        have no Device or Variation bits set.
+        
+        >>> utilities.hexdump(Matrix.frompairclasses(_testingValues[1]).binaryString())
+               0 | 0000 0000 0000 0000  FFD8 FFE7 0000 000F |................|
+              10 | 0000                                     |..              |
+        
+        >>> Matrix.frompairclasses(_testingValues[0]).binaryString()
+        Traceback (most recent call last):
+          ...
+        ValueError: Value formats with Device or Variation parts cannot be written from the matrix!
+        """
+        
+        vf1, vf2 = self.valueFormats
+        
+        if (vf1 | vf2) & 0xFFF0:
+            raise ValueError(
+              "Value formats with Device or Variation parts cannot be "
+              "written from the matrix!")
+        
+        if sys.byteorder == 'big':
+            return self.values.tobytes()
+        
+        a = array.array('h', self.values)
+        a.byteswap()
+        return a.tobytes()
+    
+    @classmethod
+    def frompairclasses(cls, obj, **kwArgs):
+        """
+        Creates and returns a new Matrix from the specified PairClasses object.
+        The following keyword argument is supported:
+            
+            valueFormats    The (first, second) value formats to use. If not
+                            specified, the PairClasses object's getMasks() will
+                            be used.
+        
+        >>> m = Matrix.frompairclasses(_testingValues[0])
+        >>> m.valueFormats, sorted(m.extras)
+        ((129, 49), [(2, 0), (2, 1)])
+        """
+        
+        vf = kwArgs.get('valueFormats', None)
+        
+        if vf is None:
+            vf = obj.getMasks()
+        
+        count1 = 1 + utilities.safeMax(obj.classDef1.values())
+        count2 = 1 + utilities.safeMax(obj.classDef2.values())
+        r = cls(count1, count2, vf)
+        n = len(r.fields)
+        values = r.values
+        
+        for (c1, c2), pvObj in obj.items():
+            if c1 >= count1 or c2 >= count2:
+                continue
+            
+            cellIndex = c1 * count2 + c2
+            r.present[cellIndex] = 1
+            start = cellIndex * n
+            vals = (pvObj.first, pvObj.second)
+            
+            for i, (which, name) in enumerate(r.fields, start=start):
+                v = vals[which]
+                
+                if v is not None:
+                    values[i] = v.__dict__[name]
+            
+            if any(v is not None and (v.getMask() & 0xFFF0) for v in vals):
+                r.extras[(c1, c2)] = pvObj
+        
+        return r
+    
+    def items(self):
+        """
+        Returns a generator over ((class1, class2), PairValues) pairs for all
+        the cells that are present or nonzero, in row order. Cells that are
+        present but all zero get an empty PairValues object.
+        
+        >>> m = Matrix.frompairclasses(_testingValues[1])
+        >>> m.zeroRow(1)
+        >>> for key, obj in m.items(): print(key, bool(obj))
+        (1, 1) False
+        (1, 2) False
+        (2, 1) True
+        """
+        
+        n = len(self.fields)
+        values = self.values
+        present = self.present
+        
+        for c1 in range(self.count1):
+            for c2 in range(self.count2):
+                cellIndex = c1 * self.count2 + c2
+                start = cellIndex * n
+                
+                if present[cellIndex] or any(values[start:start+n]):
+                    yield ((c1, c2), self[c1, c2] or pairvalues.PairValues())
+    
+    def scale(self, factor, **kwArgs):
+        """
+        Scales the values in the matrix, in place. Results are rounded as the
+        Value class rounds when scaling. The following keyword argument is
+        supported:
+            
+            fieldNames      An iterable with the names of the fields to scale
+                            (for instance, just 'xAdvance'). If not specified,
+                            all fields are scaled.
+        
+        >>> m = Matrix.frompairclasses(_testingValues[1])
+        >>> m.scale(1.1)
+        >>> list(m.values)
+        [0, 0, 0, 0, -44, -28, 0, 17, 0]
+        """
+        
+        names = set(kwArgs.get('fieldNames', fieldNames))
+        n = len(self.fields)
+        values = self.values
+        rnd = utilities.oldRound
+        
+        for j, (which, name) in enumerate(self.fields):
+            if name in names:
+                for i in range(j, len(values), n):
+                    if values[i]:
+                        values[i] = rnd(values[i] * factor, castType=int)
+    
+    def zeroColumn(self, c2):
+        """
+        Sets all the values in the specified second-class column to zero. Any
+        Device or Variation parts in the column are discarded.
+        
+        >>> m = Matrix.frompairclasses(_testingValues[1])
+        >>> m.zeroColumn(1)
+        >>> list(m.values)
+        [0, 0, 0, 0, 0, -25, 0, 0, 0]
+        """
+        
+        n = len(self.fields)
+        values = self.values
+        
+        for c1 in range(self.count1):
+            start = (c1 * self.count2 + c2) * n
+            values[start:start+n] = array.array('h', [0]) * n
+            self.extras.pop((c1, c2), None)
+    
+    def zeroRow(self, c1):
+        """
+        Sets all the values in the specified first-class row to zero. Any
+        Device or Variation parts in the row are discarded.
+        
+        >>> m = Matrix.frompairclasses(_testingValues[1])
+        >>> m.zeroRow(2)
+        >>> list(m.values)
+        [0, 0, 0, 0, -40, -25, 0, 0, 0]
+        """
+        
+        n = len(self.fields)
+        start = c1 * self.count2 * n
+        stop = start + self.count2 * n
+        self.values[start:stop] = array.array('h', [0]) * (stop - start)
+        
+        for c2 in range(self.count2):
+            self.extras.pop((c1, c2), None)
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+if __debug__:
+    from fontio3.GPOS import pairclasses
+    from fontio3.opentype import classdef
+    
+    K = pairclasses_key.Key
+    PV = pairvalues.PairValues
+    V = value.Value
+    
+    _testingValues = (
+        pairclasses._testingValues[0],
+        
+        pairclasses.PairClasses(
+          {
+            K([1, 1]): PV(first=V(xAdvance=-40)),
+            K([1, 2]): PV(first=V(xAdvance=-25)),
+            K([2, 1]): PV(first=V(xAdvance=15))},
+          classDef1 = classdef.ClassDef({5: 1, 6: 2}),
+          classDef2 = classdef.ClassDef({8: 1, 9: 2})))
+    
+    del K, PV, V
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
@@ -0,0 +1,470 @@
+#
+# pairclasses_split.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for splitting large format 2 GPOS pair positioning subtables into
+several smaller subtables, where that reduces the total size.
+"""
+
+# System imports
+import heapq
+import itertools
+
+# Other imports
+from fontio3 import utilities
+from fontio3.GPOS import pairclasses_key, pairglyphs, pairglyphs_key
+from fontio3.opentype import classdef
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# This is the size of the fixed part of a PairPosFormat2 subtable, plus the
+# two bytes for its offset in the Lookup and the eight bytes of the Extension
+# subtable normally wrapped around it.
+
+subtableOverhead = 16 + 2 + 8
+
+# -----------------------------------------------------------------------------
+
+#
+# Private functions
+#
+
+def _buildFormat1(obj, group, info):
+    """
+    Returns a PairGlyphs object with the pairs for the rows in the specified
+    group, or None if a row uses second class zero (which cannot be expressed
+    as a list of glyphs).
+    """
+    
+    rowGlyphs, colGlyphs, keysByRow = info
+    r = pairglyphs.PairGlyphs()
+    K = pairglyphs_key.Key
+    
+    for row in group:
+        for c2, pvObj in keysByRow[row].items():
+            if not c2:
+                return None
+            
+            for g1 in rowGlyphs[row]:
+                for g2 in colGlyphs[c2]:
+                    r[K([g1, g2])] = pvObj
+    
+    return r
+
+def _buildFormat2(obj, group, info, extraGlyphs=()):
+    """
+    Returns a PairClasses object with just the rows in the specified group.
+    The columns are limited to those used by these rows, and the classes are
+    numbered in order of their first glyph. If second class zero is used, the
+    glyphs of all the other columns are put into one extra class. Any
+    extraGlyphs are added so they are covered without matching any pair.
+    """
+    
+    rowGlyphs, colGlyphs, keysByRow = info
+    rows = sorted((row for row in group if row), key=lambda c: rowGlyphs[c][0])
+    newRow = {c: i for i, c in enumerate(rows, start=1)}
+    newRow[0] = 0
+    cols = {c2 for row in group for c2 in keysByRow[row] if c2}
+    cols = sorted(cols, key=lambda c: colGlyphs[c][0])
+    newCol = {c: i for i, c in enumerate(cols, start=1)}
+    newCol[0] = 0
+    cd2 = {g: newCol[c2] for c2 in cols for g in colGlyphs[c2]}
+    
+    # If second class zero is used, the glyphs of the dropped classes must be
+    # kept out of class zero, so they all share one extra class.
+    
+    if any(0 in keysByRow[row] for row in group):
+        c = len(cols) + 1
+        
+        for c2, glyphs in colGlyphs.items():
+            if c2 not in newCol:
+                cd2.update((g, c) for g in glyphs)
+    
+    K = pairclasses_key.Key
+    
+    r = type(obj)(
+      {
+        K([newRow[row], newCol[c2]]): pvObj
+        for row in group
+        for c2, pvObj in keysByRow[row].items()},
+      
+      classDef1 = classdef.ClassDef(
+        (g, newRow[row])
+        for row in rows
+        for g in rowGlyphs[row]),
+      
+      classDef2 = classdef.ClassDef(cd2))
+    
+    if 0 in group:
+        r.coverageExtras.update(rowGlyphs[0])
+    
+    if extraGlyphs:
+        if 0 in group:
+            c = len(rows) + 1
+            r.classDef1.update((g, c) for g in extraGlyphs)
+        else:
+            r.coverageExtras.update(extraGlyphs)
+    
+    return r
+
+def _estimate(group, info, recordSize):
+    """
+    Returns a rough size in bytes for a format 2 subtable holding the rows in
+    the specified group. Only the relative sizes matter, since the final
+    choice is made using the actual binary sizes.
+    """
+    
+    rowGlyphs, colGlyphs, keysByRow = info
+    cols = {c2 for row in group for c2 in keysByRow[row] if c2}
+    nCols = 1 + len(cols)
+    nRows = 1 + sum(1 for row in group if row)
+    g1Count = sum(len(rowGlyphs[row]) for row in group)
+    
+    if any(0 in keysByRow[row] for row in group) and len(cols) < len(colGlyphs):
+        nCols += 1
+        cols = colGlyphs
+    
+    g2Count = sum(len(colGlyphs[c2]) for c2 in cols)
+    
+    return (
+      subtableOverhead +
+      nRows * nCols * recordSize +
+      4 * g1Count +
+      2 * g2Count)
+
+def _gather(obj):
+    """
+    Returns a triple: a dict mapping first classes to sorted lists of their
+    glyphs (with the coverage-only glyphs as class 0), a dict mapping nonzero
+    second classes to sorted lists of their glyphs, and a dict mapping first
+    classes to dicts of second class to PairValues. Keys that no glyph pair
+    can ever reach are left out.
+    
+    A glyph in both the coverageExtras and the classDef1 takes its class from
+    the classDef1, so it is not put in class 0:
+    
+    >>> obj = _testingValues[2].__deepcopy__()
+    >>> obj.coverageExtras.update({5, 10})
+    >>> sorted(_gather(obj)[0].items())
+    [(0, [5]), (1, [10]), (2, [12])]
+    """
+    
+    rowGlyphs = utilities.invertDictFull(obj.classDef1, sorted=True)
+    extras = set(obj.coverageExtras) - set(obj.classDef1)
+    row0 = set(rowGlyphs.pop(0, [])) | extras
+    
+    if row0:
+        rowGlyphs[0] = sorted(row0)
+    
+    colGlyphs = utilities.invertDictFull(obj.classDef2, sorted=True)
+    colGlyphs.pop(0, None)
+    keysByRow = {row: {} for row in rowGlyphs}
+    
+    for (c1, c2), pvObj in obj.items():
+        if c1 in rowGlyphs and (c2 == 0 or c2 in colGlyphs):
+            keysByRow[c1][c2] = pvObj
+    
+    return rowGlyphs, colGlyphs, keysByRow
+
+def _mergeGroups(groups, info, recordSize, maxSize):
+    """
+    Greedily merges groups of rows while doing so saves bytes, merging the
+    pair with the largest saving first. Groups whose estimated size would
+    exceed maxSize are not merged.
+    """
+    
+    costs = [_estimate(g, info, recordSize) for g in groups]
+    versions = [0] * len(groups)
+    heap = []
+    
+    def push(i, j):
+        merged = _estimate(groups[i] | groups[j], info, recordSize)
+        saving = costs[i] + costs[j] - merged
+        
+        if saving > 0 and merged <= maxSize:
+            heapq.heappush(heap, (-saving, i, j, versions[i], versions[j]))
+    
+    for i, j in itertools.combinations(range(len(groups)), 2):
+        push(i, j)
+    
+    while heap:
+        negSaving, i, j, vi, vj = heapq.heappop(heap)
+        
+        if (vi, vj) != (versions[i], versions[j]):
+            continue  # one of the groups has changed since this was pushed
+        
+        groups[i] = groups[i] | groups[j]
+        groups[j] = None
+        costs[i] = _estimate(groups[i], info, recordSize)
+        versions[i] += 1
+        versions[j] += 1
+        
+        for k, g in enumerate(groups):
+            if k != i and g is not None:
+                push(min(i, k), max(i, k))
+    
+    return [g for g in groups if g is not None]
+
+def _size(obj):
+    """
+    Returns the binary size of the specified subtable, or None if it cannot
+    be built (for instance, if its offsets overflow).
+    """
+    
+    try:
+        return len(obj.binaryString())
+    except Exception:
+        return None
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+def splitEvenly(obj, pieceCount):
+    """
+    Returns a list of at most pieceCount PairClasses objects which together do
+    what the specified PairClasses object does, each with about the same
+    number of first classes. Unlike splitForSize() this splits whether or not
+    the total gets smaller, so it can be used when a single subtable is too
+    big for its own 16-bit offsets. The list is just [obj] if there are fewer
+    than two first classes with pairs.
+    
+    >>> v = splitEvenly(_testingValues[0], 2)
+    >>> [dict(x.classDef1) for x in v]
+    [{10: 1, 11: 1}, {12: 1, 13: 2}]
+    >>> [len(x) for x in v]
+    [20, 40]
+    >>> len(splitEvenly(_testingValues[0], 10))
+    3
+    >>> splitEvenly(_testingValues[0], 1)[0] is _testingValues[0]
+    True
+    """
+    
+    info = rowGlyphs, colGlyphs, keysByRow = _gather(obj)
+    
+    rows = sorted(
+      (row for row, d in keysByRow.items() if d),
+      key = lambda c: rowGlyphs[c][0])
+    
+    if pieceCount < 2 or len(rows) < 2:
+        return [obj]
+    
+    extraGlyphs = sorted(
+      g
+      for row, d in keysByRow.items() if not d
+      for g in rowGlyphs[row])
+    
+    n = min(pieceCount, len(rows))
+    
+    groups = [
+      rows[i * len(rows) // n:(i + 1) * len(rows) // n]
+      for i in range(n)]
+    
+    r = [_buildFormat2(obj, group, info) for group in groups]
+    
+    # As in splitForSize(), glyphs in rows with no pairs stay covered.
+    
+    if extraGlyphs:
+        r[0] = _buildFormat2(obj, groups[0], info, extraGlyphs)
+    
+    return r
+
+def splitForSize(obj, **kwArgs):
+    """
+    Returns a list of subtables which together do what the specified
+    PairClasses object does, chosen to make their total binary size as small
+    as possible. The list is just [obj] if splitting does not help.
+    
+    Each resulting subtable handles a separate set of first glyphs, so their
+    order does not matter. Each holds only the second classes its first
+    classes use, and its classes are renumbered in glyph order. Where it is
+    smaller, a subtable is made as a PairGlyphs object instead.
+    
+    The following keyword arguments are supported:
+        
+        allowFormat1    Default True. If False, only PairClasses objects are
+                        returned. A format 1 subtable lets shaping engines try
+                        later subtables in the Lookup for a first glyph with
+                        no matching pair, so this should be False unless no
+                        later subtable handles any of obj's first glyphs.
+        
+        maxSize         Default 0xFFFF. Rows are not combined into a subtable
+                        whose estimated size exceeds this, so that 16-bit
+                        offsets within each subtable do not overflow.
+    
+    Rows 1 and 2 of this table use the first 20 second classes, and row 3
+    uses the other 20, so it is smaller as two subtables:
+    
+    >>> obj = _testingValues[0]
+    >>> len(obj.binaryString())
+    454
+    >>> v = splitForSize(obj, allowFormat1=False)
+    >>> [(type(x).__name__, len(x.binaryString())) for x in v]
+    [('PairClasses', 210), ('PairClasses', 160)]
+    >>> dict(v[1].classDef1), min(v[1].classDef2), len(v[1].classDef2)
+    ({13: 1}, 40, 20)
+    >>> v = splitForSize(obj)
+    >>> [(type(x).__name__, len(x.binaryString())) for x in v]
+    [('PairClasses', 210), ('PairGlyphs', 100)]
+    
+    Unused second classes are dropped even when no split is made:
+    
+    >>> obj = _testingValues[1]
+    >>> len(obj.binaryString())
+    3054
+    >>> v = splitForSize(obj, allowFormat1=False)
+    >>> len(v), len(v[0].binaryString())
+    (1, 94)
+    >>> v[0].classDef2.pprint()
+    20: 1
+    21: 2
+    319: 3
+    
+    >>> obj = _testingValues[2]
+    >>> splitForSize(obj, allowFormat1=False)[0] is obj
+    True
+    """
+    
+    allowFormat1 = kwArgs.get('allowFormat1', True)
+    maxSize = kwArgs.get('maxSize', 0xFFFF)
+    info = rowGlyphs, colGlyphs, keysByRow = _gather(obj)
+    
+    extraGlyphs = sorted(
+      g
+      for row, d in keysByRow.items() if not d
+      for g in rowGlyphs[row])
+    
+    vf1, vf2 = obj.getMasks()
+    recordSize = 2 * (bin(vf1).count('1') + bin(vf2).count('1'))
+    
+    # Start with one group for each distinct set of used second classes, since
+    # rows using the same columns never cost more together than apart.
+    
+    bySignature = {}
+    
+    for row in sorted(keysByRow):
+        if keysByRow[row]:
+            sig = frozenset(keysByRow[row])
+            bySignature.setdefault(sig, set()).add(row)
+    
+    groups = _mergeGroups(
+      list(bySignature.values()),
+      info,
+      recordSize,
+      maxSize)
+    
+    if not groups:
+        return [obj]
+    
+    groups.sort(key=lambda g: min(rowGlyphs[row][0] for row in g))
+    r = []
+    
+    for group in groups:
+        best = _buildFormat2(obj, group, info)
+        bestSize = _size(best)
+        
+        if allowFormat1:
+            pairCount = sum(
+              len(rowGlyphs[row]) * len(colGlyphs.get(c2, ()))
+              for row in group
+              for c2 in keysByRow[row])
+            
+            if bestSize is None or pairCount * (2 + recordSize) < bestSize:
+                alt = _buildFormat1(obj, group, info)
+                altSize = (None if alt is None else _size(alt))
+                
+                if altSize is None:
+                    pass
+                
+                elif bestSize is None or altSize < bestSize:
+                    best, bestSize = alt, altSize
+        
+        if bestSize is None:
+            return [obj]
+        
+        r.append([best, bestSize, group])
+    
+    # Glyphs in rows with no pairs are still covered by obj, which matters to
+    # shaping engines, so they are added to one of the PairClasses results.
+    
+    if extraGlyphs:
+        v = [t for t in r if isinstance(t[0], type(obj))]
+        
+        if v:
+            t = v[0]
+        else:
+            t = max(r, key=lambda t: t[1])
+        
+        t[0] = _buildFormat2(obj, t[2], info, extraGlyphs)
+        t[1] = _size(t[0])
+        
+        if t[1] is None:
+            return [obj]
+    
+    origSize = _size(obj)
+    newSize = sum(t[1] for t in r) + (len(r) - 1) * (subtableOverhead - 16)
+    
+    if origSize is not None and newSize >= origSize:
+        return [obj]
+    
+    return [t[0] for t in r]
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+if __debug__:
+    from fontio3.GPOS import pairclasses, pairvalues, value
+    
+    def _pv(n):
+        return pairvalues.PairValues(first=value.Value(xAdvance=n))
+    
+    _K = pairclasses_key.Key
+    
+    _testingValues = (
+        pairclasses.PairClasses(
+          dict(
+            [(_K([1, c2]), _pv(-c2)) for c2 in range(1, 21)] +
+            [(_K([2, c2]), _pv(-c2)) for c2 in range(1, 21)] +
+            [(_K([3, c2]), _pv(c2)) for c2 in range(21, 41)]),
+          classDef1 = classdef.ClassDef({10: 1, 11: 1, 12: 2, 13: 3}),
+          classDef2 = classdef.ClassDef({20 + i: i + 1 for i in range(40)})),
+        
+        pairclasses.PairClasses(
+          {
+            _K([1, 1]): _pv(-50),
+            _K([1, 2]): _pv(-20),
+            _K([2, 1]): _pv(-30),
+            _K([3, 300]): _pv(-15)},
+          classDef1 = classdef.ClassDef({10: 1, 11: 1, 12: 2, 13: 3}),
+          classDef2 = classdef.ClassDef(
+            {20 + i: i + 1 for i in range(300)})),
+        
+        pairclasses.PairClasses(
+          {_K([1, 1]): _pv(-50), _K([2, 1]): _pv(-30)},
+          classDef1 = classdef.ClassDef({10: 1, 12: 2}),
+          classDef2 = classdef.ClassDef({20: 1})))
+    
+    del _K
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
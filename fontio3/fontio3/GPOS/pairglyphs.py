@@ -314,6 +314,17 @@ class PairGlyphs(dict, metaclass=mapmeta.FontDataMetaclass):
         cache[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the first glyphs of all the pairs. The Lookup uses
+        this to skip the subtable for glyphs that cannot start a pair.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [8, 10]
+        """
+        
+        return {key[0] for key in self}
+    
     @classmethod
     def frompairclasses(cls, pcObj, **kwArgs):
         """
@@ -254,6 +254,17 @@ class Single(dict, metaclass=mapmeta.FontDataMetaclass):
         cache[id(self)] = r
         return r
 
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs that have a Value in this subtable. The
+        Lookup uses this to skip the subtable for other glyphs.
+        
+        >>> sorted(_testingValues[1].firstGlyphs())
+        [5, 45, 98]
+        """
+        
+        return set(self)
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
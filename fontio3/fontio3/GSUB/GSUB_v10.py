@@ -20,6 +20,7 @@ from fontio3.opentype import (
   featuredict, 
   fontworkersource,
   lookuplist, 
+  overflow,
   scriptdict)
 
 from fontio3.opentype import version as otversion
@@ -72,8 +73,20 @@ class GSUB(object, metaclass=simplemeta.FontDataMetaclass):
         """
         Adds the binary data for the GSUB object to the specified LinkedWriter.
         (Note that this class has an explicit binaryString() method as well).
+        
+        The table is built and resolved on its own, and any offsets that
+        would overflow are fixed automatically (see the overflow module in
+        fontio3.opentype), unless the resolveOverflows keyword argument is
+        False.
         """
         
+        if kwArgs.get('resolveOverflows', True):
+            if 'stakeValue' in kwArgs:
+                w.stakeCurrentWithValue(kwArgs.pop('stakeValue'))
+            
+            w.addString(overflow.buildResolved(self.buildBinary, **kwArgs))
+            return
+        
         if 'stakeValue' in kwArgs:
             stakeValue = kwArgs.pop('stakeValue')
             w.stakeCurrentWithValue(stakeValue)
@@ -121,8 +134,21 @@ class GSUB(object, metaclass=simplemeta.FontDataMetaclass):
               extensionPool = extPool,
               **kwArgs)
             
-            for i, obj, stake in sorted(extPool.values()):
-                obj.buildBinary(w, stakeValue=stake, **kwArgs)
+            lookuplist.buildExtensionPool(w, extPool, **kwArgs)
+    
+    def clearCaches(self):
+        """
+        Discards the caches kept by all the Lookups in this GSUB, including
+        those only reachable from contextual Lookups. The Editor's changed()
+        method calls this, so it is only needed directly when the GSUB is used
+        outside an Editor and one of its subtables is edited in place.
+        """
+        
+        memo = set()
+        
+        for featureTable in self.features.values():
+            for lk in featureTable:
+                lk.clearCaches(memo=memo)
     
     def compacted(self, **kwArgs):
         """
@@ -22,6 +22,7 @@ from fontio3.opentype import (
   featurevariations,
   fontworkersource,
   lookuplist,
+  overflow,
   scriptdict)
 
 from fontio3.opentype import version as otversion
@@ -67,8 +68,20 @@ class GSUB(GSUB_v10, metaclass=simplemeta.FontDataMetaclass):
         """
         Adds the binary data for the GSUB object to the specified LinkedWriter.
         (Note that this class has an explicit binaryString() method as well).
+        
+        The table is built and resolved on its own, and any offsets that
+        would overflow are fixed automatically (see the overflow module in
+        fontio3.opentype), unless the resolveOverflows keyword argument is
+        False.
         """
         
+        if kwArgs.get('resolveOverflows', True):
+            if 'stakeValue' in kwArgs:
+                w.stakeCurrentWithValue(kwArgs.pop('stakeValue'))
+            
+            w.addString(overflow.buildResolved(self.buildBinary, **kwArgs))
+            return
+        
         if 'stakeValue' in kwArgs:
             stakeValue = kwArgs.pop('stakeValue')
             w.stakeCurrentWithValue(stakeValue)
@@ -142,8 +155,7 @@ class GSUB(GSUB_v10, metaclass=simplemeta.FontDataMetaclass):
                   tagToFeatureIndex = ttfi,
                   **kwArgs)
             
-            for i, obj, stake in sorted(extPool.values()):
-                obj.buildBinary(w, stakeValue=stake, **kwArgs)
+            lookuplist.buildExtensionPool(w, extPool, **kwArgs)
 
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
@@ -248,6 +248,17 @@ class Alternate(dict, metaclass=mapmeta.FontDataMetaclass):
         memo[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs that have alternates in this subtable.
+        The Lookup uses this to skip the subtable for other glyphs.
+        
+        >>> sorted(_testingValues[2].firstGlyphs())
+        [25, 26, 27]
+        """
+        
+        return set(self)
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
@@ -18,7 +18,7 @@ import operator
 # Other imports
 from fontio3 import utilities
 from fontio3.fontdata import mapmeta, seqmeta
-from fontio3.GSUB import ligature_glyphtuple
+from fontio3.GSUB import ligature_glyphtuple, ligature_trie
 from fontio3.GSUB.effects import EffectsSummary
 from fontio3.opentype import coverage, runningglyphs
 
@@ -658,6 +658,29 @@ class Ligature(dict, metaclass=mapmeta.FontDataMetaclass):
                 w.add("H", len(key))
                 w.addGroup("H", key[1:])
     
+    def clearCaches(self):
+        """
+        Discards the cached trie (see the trie() method). This needs to be
+        called after the keys or the keyOrder are edited in place; the Lookup
+        clearCaches() method calls it, as does the Editor's changed() method
+        for the GSUB.
+        
+        >>> LGT = ligature_glyphtuple.Ligature_GlyphTuple
+        >>> obj = Ligature({LGT([4, 5]): 77}, keyOrder=_GlyphList([(4, 5)]))
+        >>> ga = runningglyphs.GlyphList.fromiterable([4, 6])
+        >>> igsFunc = lambda *a, **k: [False, False]
+        >>> obj.runOne(ga, 0, igsFunc=igsFunc)[1]
+        0
+        >>> del obj[LGT([4, 5])]
+        >>> obj[LGT([4, 6])] = 77
+        >>> obj.keyOrder[:] = [LGT([4, 6])]
+        >>> obj.clearCaches()
+        >>> obj.runOne(ga, 0, igsFunc=igsFunc)[1]
+        2
+        """
+        
+        self.__dict__.pop('_trie', None)
+    
     def componentCounts(self):
         """
         Returns a dict mapping ligature glyph indices to counts of input glyphs
@@ -723,6 +746,18 @@ class Ligature(dict, metaclass=mapmeta.FontDataMetaclass):
         memo[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the first glyphs of all the ligature components
+        tuples. Only these can start a match, so the Lookup uses this to skip
+        the subtable for other glyphs.
+        
+        >>> sorted(_testingValues[2].firstGlyphs())
+        [5, 11]
+        """
+        
+        return {key[0] for key in self}
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
@@ -1130,70 +1165,79 @@ class Ligature(dict, metaclass=mapmeta.FontDataMetaclass):
         useEmpties = kwArgs.get('useEmpties', True)
         firstGlyph = glyphArray[startIndex]
         
-        # To make comparisons in the loop easier, we use the igs data to
-        # extract just the non-ignorables starting with startIndex into a
-        # separate list called vNonIgs.
+        # The trie walks the non-ignorables starting with startIndex only as
+        # far as some key could still match, and returns the matching key that
+        # comes first in our custom order, along with the indices it used.
         
-        v = [
-          (g, i)
-          for i, g in enumerate(glyphArray[startIndex:], start=startIndex)
-          if (not igs[i])]
+        m = self.trie().match(glyphArray, startIndex, igs)
         
-        vNonIgs = [x[0] for x in v]
-        vBackMap = [x[1] for x in v]
-        G = runningglyphs.Glyph
+        if m is None or firstGlyph != m[0][0]:
+            return (glyphArray, 0)
         
-        for key in self:  # custom order, remember...
-            if firstGlyph != key[0]:
-                continue
-            
-            if len(key) > len(vNonIgs):
-                continue
-            
-            if not all(a == b for a, b in zip(key, vNonIgs)):
-                continue
-            
-            # If we get here the key is a match
-            
-            r = glyphArray.fromiterable(glyphArray)  # preserves offsets
-            it = (g.shaperClass for g in vNonIgs[:len(key)] if g.shaperClass)
-            sc = '+'.join(it) or None
-            lastIndex = None
-            lio = []
-            toDel = []
+        key, vBackMap = m[0], m[2]
+        G = runningglyphs.Glyph
+        r = glyphArray.fromiterable(glyphArray)  # preserves offsets
+        it = (glyphArray[i].shaperClass for i in vBackMap)
+        sc = '+'.join(x for x in it if x) or None
+        lastIndex = None
+        lio = []
+        toDel = []
+        
+        for i in vBackMap:
+            if i == startIndex:
+                r[i] = G(
+                  self[key],
+                  originalOffset = firstGlyph.originalOffset,
+                  shaperClass = sc)
+                
+                lio.append(firstGlyph.originalOffset)
             
-            for i in vBackMap[:len(key)]:
-                if i == startIndex:
-                    r[i] = G(
-                      self[key],
-                      originalOffset = firstGlyph.originalOffset,
-                      shaperClass = sc)
-                    
-                    lio.append(firstGlyph.originalOffset)
+            else:
+                lastIndex = i
+                lio.append(r[i].originalOffset)
                 
+                if useEmpties:
+                    r[i] = G(-1, originalOffset=r[i].originalOffset)
                 else:
-                    lastIndex = i
-                    lio.append(r[i].originalOffset)
-                    
-                    if useEmpties:
-                        r[i] = G(-1, originalOffset=r[i].originalOffset)
-                    else:
-                        toDel.append(i)
-            
-            for i in reversed(toDel):
-                del r[i]
-            
-            r[startIndex].ligInputOffsets = tuple(lio)
-            assert lastIndex is not None
-            count = lastIndex - startIndex + 1
-            
-            if not useEmpties:
-                count -= (len(key) - 1)
-            
-            return (r, count)
+                    toDel.append(i)
         
-        return (glyphArray, 0)
-
+        for i in reversed(toDel):
+            del r[i]
+        
+        r[startIndex].ligInputOffsets = tuple(lio)
+        assert lastIndex is not None
+        count = lastIndex - startIndex + 1
+        
+        if not useEmpties:
+            count -= (len(key) - 1)
+        
+        return (r, count)
+    
+    def trie(self, **kwArgs):
+        """
+        Returns a LigatureTrie mapping the keys to their output glyphs, with
+        precedence given by our custom key order (see the __iter__() method).
+        The trie is built when first needed and then cached until the
+        clearCaches() method is called, or the forceRebuild keyword argument is
+        True. Either is needed after the keys or the keyOrder are edited.
+        
+        >>> t = _testingValues[2].trie()
+        >>> t.match([5, 3, 11])
+        ((5, 3), 31, [0, 1])
+        >>> t is _testingValues[2].trie()
+        True
+        >>> t is _testingValues[2].trie(forceRebuild=True)
+        False
+        """
+        
+        t = self.__dict__.get('_trie', None)
+        
+        if (t is None) or kwArgs.get('forceRebuild', False):
+            t = ligature_trie.LigatureTrie((key, self[key]) for key in self)
+            self.__dict__['_trie'] = t
+        
+        return t
+    
     def writeFontWorkerSource(self, s, **kwArgs):
         """
         Writes contents of lookup to provided stream 's'. Uses
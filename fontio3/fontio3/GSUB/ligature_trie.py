@@ -0,0 +1,187 @@
+#
+# ligature_trie.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for tries mapping ligature component sequences to their outputs, so a
+glyph run can be matched against all the ligatures in a subtable in a single
+walk.
+"""
+
+# -----------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+if 0:
+    def __________________(): pass
+
+class LigatureTrie(object):
+    """
+    Objects mapping input glyph sequences to outputs, arranged as a trie. Each
+    node is a dict mapping a glyph index to the next node; a node that ends a
+    sequence also has an entry keyed by None, whose value is a triple: the
+    precedence rank (lower ranks win), the input sequence, and its output.
+    There are two attributes:
+        
+        count       The number of sequences added so far. This is also the
+                    rank the next added sequence will get.
+        
+        root        The root node.
+    
+    >>> t = LigatureTrie([((5, 6, 7), 'a'), ((5, 6), 'b'), ((8, 9), 'c')])
+    >>> sorted(t.firstGlyphs())
+    [5, 8]
+    >>> t.match([5, 6, 7, 8])
+    ((5, 6, 7), 'a', [0, 1, 2])
+    >>> t.match([5, 6, 8])
+    ((5, 6), 'b', [0, 1])
+    >>> print(t.match([5, 7]))
+    None
+    
+    Ignorable glyphs are skipped while walking:
+    
+    >>> t.match([4, 8, 3, 9], 1, igs=[False, False, True, False])
+    ((8, 9), 'c', [1, 3])
+    """
+    
+    #
+    # Methods
+    #
+    
+    def __init__(self, it=(), **kwArgs):
+        """
+        Initializes the trie with the (sequence, output) pairs from the
+        specified iterable, in decreasing order of precedence.
+        """
+        
+        self.root = {}
+        self.count = 0
+        
+        for seq, value in it:
+            self.add(seq, value)
+    
+    def add(self, seq, value):
+        """
+        Adds the specified sequence and its output to the trie. The sequence
+        gets a lower precedence than all the sequences already present; if it
+        is itself already present, this method does nothing.
+        
+        >>> t = LigatureTrie([((5, 6), 'a')])
+        >>> t.add((5, 6), 'b')
+        >>> t.add((5,), 'c')
+        >>> t.match([5, 6]), t.count
+        (((5, 6), 'a', [0, 1]), 2)
+        """
+        
+        node = self.root
+        
+        for g in seq:
+            node = node.setdefault(g, {})
+        
+        if None not in node:
+            node[None] = (self.count, tuple(seq), value)
+            self.count += 1
+    
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs that start at least one sequence.
+        
+        >>> sorted(LigatureTrie([((5, 6), 'a'), ((2, 9), 'b')]).firstGlyphs())
+        [2, 5]
+        """
+        
+        return set(self.root)
+    
+    def match(self, glyphs, startIndex=0, igs=None):
+        """
+        Walks the trie over the glyphs starting at startIndex, skipping any
+        whose igs entry is True. Returns None if no sequence matches, or a
+        triple: the matching sequence with the best precedence, its output, and
+        a list of the indices into glyphs of the matched (non-ignorable)
+        glyphs.
+        
+        Note that the match returned is the one with the best precedence, not
+        necessarily the longest one:
+        
+        >>> t = LigatureTrie([((5, 6), 'short'), ((5, 6, 7), 'long')])
+        >>> t.match([5, 6, 7])
+        ((5, 6), 'short', [0, 1])
+        """
+        
+        node = self.root
+        best = None
+        path = []
+        
+        for i in range(startIndex, len(glyphs)):
+            if igs is not None and igs[i]:
+                continue
+            
+            node = node.get(glyphs[i])
+            
+            if node is None:
+                break
+            
+            path.append(i)
+            t = node.get(None)
+            
+            if t is not None and (best is None or t[0] < best[0]):
+                best = t
+                bestLength = len(path)
+            
+            if len(node) == (t is not None):
+                break
+        
+        if best is None:
+            return None
+        
+        return (best[1], best[2], path[:bestLength])
+    
+    def walk(self):
+        """
+        Returns a generator over (sequence, node) pairs for every node in the
+        trie except the root, in depth-first order. Children are visited in the
+        order their glyphs were first added.
+        
+        >>> t = LigatureTrie([((5, 6), 'a'), ((5, 7), 'b'), ((8,), 'c')])
+        >>> for seq, node in t.walk(): print(seq, node.get(None))
+        (5,) None
+        (5, 6) (0, (5, 6), 'a')
+        (5, 7) (1, (5, 7), 'b')
+        (8,) (2, (8,), 'c')
+        """
+        
+        stack = [((), self.root)]
+        
+        while stack:
+            seq, node = stack.pop()
+            
+            kids = [
+              (seq + (g,), child)
+              for g, child in node.items()
+              if g is not None]
+            
+            stack.extend(reversed(kids))
+            
+            if seq:
+                yield (seq, node)
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
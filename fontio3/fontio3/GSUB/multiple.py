@@ -356,6 +356,17 @@ class Multiple(dict, metaclass=mapmeta.FontDataMetaclass):
         memo[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs that have a replacement sequence in this
+        subtable. The Lookup uses this to skip the subtable for other glyphs.
+        
+        >>> sorted(_testingValues[2].firstGlyphs())
+        [25, 26, 27]
+        """
+        
+        return set(self)
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
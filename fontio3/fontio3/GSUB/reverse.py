@@ -195,6 +195,23 @@ class Reverse(dict, metaclass=mapmeta.FontDataMetaclass):
         memo[id(self)] = r
         return r
 
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs in the input coverage of all the keys,
+        since only these are substituted. The Lookup uses this to skip the
+        subtable for other glyphs.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [50, 51, 53, 56, 57]
+        """
+        
+        r = set()
+        
+        for key in self:
+            r.update(key[1])
+        
+        return r
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
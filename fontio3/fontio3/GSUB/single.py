@@ -200,6 +200,17 @@ class Single(dict, metaclass=mapmeta.FontDataMetaclass):
         memo[id(self)] = r
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs this subtable can change, which are just
+        its keys. The Lookup uses this to skip the subtable for other glyphs.
+        
+        >>> sorted(_testingValues[2].firstGlyphs())
+        [4, 5, 6]
+        """
+        
+        return set(self)
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
@@ -14,6 +14,7 @@ import itertools
 # Other imports
 from fontio3.fontdata import simplemeta
 from fontio3.HVAR import deltasetindexmap, livingdeltas_dict
+from fontio3.opentype import compiled_ivs
 from fontio3.opentype import version as otversion
 from fontio3.opentype import living_variations
 
@@ -105,6 +106,39 @@ class HVAR(object, metaclass=simplemeta.FontDataMetaclass):
     # Methods
     #
 
+    def advanceDelta(self, glyphIndex, location):
+        """
+        Returns the advance width delta for the specified glyph at the
+        specified location, which may be a dict mapping axis tags to
+        normalized coordinates, a LivingAxialCoordinate, or a RegionScalars
+        object (see Editor.regionScalars()). The advances are compiled the
+        first time this is called; see the compiled_ivs module in
+        fontio3.opentype for details.
+
+        >>> obj = _testingValues[1]
+        >>> obj.advanceDelta(0, {'wght': 0.0, 'wdth': 0.5})
+        -90.0
+        >>> obj.advanceDelta(5, {'wght': 0.0, 'wdth': 0.5})
+        0
+        """
+
+        c = compiled_ivs.compiledFor(self, 'advances')
+        return c.delta(glyphIndex, location)
+
+    def advanceDeltas(self, glyphArray, location):
+        """
+        Returns a list with the advance width delta for each glyph in the
+        specified glyph array at the specified location. See advanceDelta()
+        for the kinds of location that may be used.
+
+        >>> obj = _testingValues[1]
+        >>> obj.advanceDeltas([1, 0, 1, 7], {'wght': 0.5, 'wdth': 0.25})
+        [40.0, -180.0, 40.0, 0]
+        """
+
+        c = compiled_ivs.compiledFor(self, 'advances')
+        return c.deltas(glyphArray, location)
+
     def buildBinary(self, w, **kwArgs):
         """
         Adds the binary data for the HVAR object to the specified LinkedWriter.
@@ -205,6 +239,22 @@ class HVAR(object, metaclass=simplemeta.FontDataMetaclass):
             rsbDSMap.buildBinary(w, **kwArgs)
 
 
+    def clearCaches(self):
+        """
+        Discards the compiled deltas cached in the HVAR object. This is
+        called by the Editor's changed() method, and should be called
+        directly after changing the deltas of HVAR objects in place that are
+        not in an Editor.
+
+        >>> obj = _testingValues[1]
+        >>> c = compiled_ivs.compiledFor(obj, 'advances')
+        >>> obj.clearCaches()
+        >>> compiled_ivs.compiledFor(obj, 'advances') is c
+        False
+        """
+
+        compiled_ivs.clearCaches(self)
+
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
         """
@@ -11,6 +11,7 @@ Support for the MVAR table.
 # Other imports
 from fontio3.fontdata import simplemeta
 from fontio3.MVAR import valuemap
+from fontio3.opentype import compiled_ivs
 from fontio3.opentype import version as otversion
 from fontio3.opentype import living_variations
 
@@ -215,6 +216,16 @@ class MVAR(object, metaclass=simplemeta.FontDataMetaclass):
             w.add("H", 0) # NULL offsetToIVS
 
 
+    def clearCaches(self):
+        """
+        Discards the compiled deltas cached in the MVAR object. This is called
+        by the Editor's changed() method, and should be called directly after
+        changing the valueMap of MVAR objects in place that are not in an
+        Editor.
+        """
+
+        compiled_ivs.clearCaches(self)
+
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
         """
@@ -431,6 +442,27 @@ class MVAR(object, metaclass=simplemeta.FontDataMetaclass):
 
         return r
 
+    def valueAt(self, tag, location):
+        """
+        Returns the delta for the specified value tag at the specified
+        location, which may be a dict mapping axis tags to normalized
+        coordinates, a LivingAxialCoordinate, or a RegionScalars object (see
+        Editor.regionScalars()). Tags not in the valueMap get zero. The deltas
+        are compiled the first time this is called; see the compiled_ivs
+        module in fontio3.opentype for details.
+
+        >>> lr = LivingRegion.fromdict({'wght': (0.0, 1.0, 1.0)})
+        >>> ld = LivingDeltas({LivingDeltasMember((lr, 60))})
+        >>> obj = MVAR(valueMap=valuemap.ValueMap({'xhgt': ld}))
+        >>> obj.valueAt('xhgt', {'wght': 0.5})
+        30.0
+        >>> obj.valueAt('cpht', {'wght': 0.5})
+        0
+        """
+
+        c = compiled_ivs.compiledFor(self, 'valueMap')
+        return c.delta(tag, location)
+
 # -----------------------------------------------------------------------------
 
 #
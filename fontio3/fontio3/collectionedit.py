@@ -9,13 +9,12 @@ Support for collections of unrelated fonts.
 """
 
 # System imports
-import functools
 import logging
 
 # Other imports
 from fontio3 import fontedit
 from fontio3.fontdata import deferreddictmeta, seqmeta
-from fontio3.utilities import filewalkerbit
+from fontio3.utilities import filewalkerbit, sharedtables, writer
 
 # -----------------------------------------------------------------------------
 
@@ -114,50 +113,6 @@ class CollectionEditor(list, metaclass=seqmeta.FontDataMetaclass):
         
         return stakes
     
-    def _makeUniques(self, changedKeys):
-        uniques = {}  # tag -> {avatar1: set(equals), avatar2: set(equals)...}
-        allTags = functools.reduce(set.union, (set(obj) for obj in self))
-        
-        for tag in allTags:
-            uniques[tag] = d = {}
-            
-            for i, obj in enumerate(self):
-                if tag not in obj:
-                    continue
-                
-                objIsRaw = (
-                  (tag not in changedKeys[i]) or
-                  isinstance(obj[tag], (str, bytes)))
-                
-                for avatarIndex, otherEquals in d.items():
-                    avatarIsRaw = (
-                      (tag not in changedKeys[avatarIndex]) or
-                      isinstance(self[avatarIndex][tag], (str, bytes)))
-                    
-                    if avatarIsRaw and objIsRaw:
-                        av = self[avatarIndex]
-                        
-                        if obj.getRawTable(tag) == av.getRawTable(tag):
-                            otherEquals.add(i)
-                            break
-                    
-                    else:
-                        if avatarIsRaw:
-                            changedKeys[avatarIndex].add(tag)
-                        
-                        elif objIsRaw:
-                            changedKeys[i].add(tag)
-                            objIsRaw = False
-                            
-                        if obj[tag] == self[avatarIndex][tag]:
-                            otherEquals.add(i)
-                            break
-                
-                else:
-                    d[i] = set()
-        
-        return uniques
-    
     def buildBinary(self, w, **kwArgs):
         """
         Adds the binary data for the CollectionEditor to the specified writer.
@@ -187,7 +142,7 @@ class CollectionEditor(list, metaclass=seqmeta.FontDataMetaclass):
             w.add("3L", 0, 0, 0)  # ulDsigTag, ulDsigLength, ulDsigOffset for v2
         
         changedKeys = self._makeChangedKeys()
-        uniques = self._makeUniques(changedKeys)
+        uniques = sharedtables.makeUniques(self, changedKeys)
         stakes = self._makeStakes(w)
         headerChecksumRanges = []
         
@@ -239,21 +194,32 @@ class CollectionEditor(list, metaclass=seqmeta.FontDataMetaclass):
     def frompath(cls, path, **kwArgs):
         """
         Creates and returns a new CollectionEditor for the TTC specified by
-        path.
+        path. The useMmap and zeroCopy keyword arguments are supported as in
+        Editor.frompath().
         """
         
-        r = cls.fromwalker(filewalkerbit.FileWalkerBit(path), **kwArgs)
+        w = filewalkerbit.walkerForPath(
+          path,
+          useMmap = kwArgs.pop('useMmap', False),
+          zeroCopy = kwArgs.pop('zeroCopy', False))
+        
+        r = cls.fromwalker(w, **kwArgs)
         r.cameFromTTC = True
         return r
     
     @classmethod
     def fromvalidatedpath(cls, path, **kwArgs):
         """
+        Like frompath(), but with validation. The useMmap and zeroCopy keyword
+        arguments are supported as in Editor.frompath().
         """
         
-        r = cls.fromvalidatedwalker(
-          filewalkerbit.FileWalkerBit(path),
-          **kwArgs)
+        w = filewalkerbit.walkerForPath(
+          path,
+          useMmap = kwArgs.pop('useMmap', False),
+          zeroCopy = kwArgs.pop('zeroCopy', False))
+        
+        r = cls.fromvalidatedwalker(w, **kwArgs)
         
         if r:
             r.cameFromTTC = True
@@ -474,11 +440,17 @@ class CollectionEditor(list, metaclass=seqmeta.FontDataMetaclass):
 
     def writeFont(self, path, **kwArgs):
         """
+        Writes the binary data for the CollectionEditor to the specified path.
+        Every table is built before anything is written; the resolved
+        pieces are then written one at a time, which only avoids joining
+        them into a second full copy of the font. The data go to a
+        temporary file that then replaces path, so a failed build never
+        leaves a truncated font behind.
         """
         
-        f = open(path, "wb")
-        f.write(self.binaryString(**kwArgs))
-        f.close()
+        w = writer.LinkedWriter()
+        self.buildBinary(w, **kwArgs)
+        w.writeToFile(path)
 
 # -----------------------------------------------------------------------------
 
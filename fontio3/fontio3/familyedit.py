@@ -9,13 +9,16 @@ Support for families of fonts.
 """
 
 # System imports
-import functools
 import logging
 
 # Other imports
 from fontio3 import fontedit
 from fontio3.fontdata import deferreddictmeta, seqmeta
-from fontio3.utilities import filewalkerbit, ScalerError
+from fontio3.utilities import (
+  filewalkerbit,
+  ScalerError,
+  sharedtables,
+  writer)
 
 # -----------------------------------------------------------------------------
 
@@ -416,50 +419,6 @@ class FamilyEditor(list, metaclass=seqmeta.FontDataMetaclass):
         
         return stakes
     
-    def _makeUniques(self, changedKeys):
-        uniques = {}  # tag -> {avatar1: set(equals), avatar2: set(equals)...}
-        allTags = functools.reduce(set.union, (set(obj) for obj in self))
-        
-        for tag in allTags:
-            uniques[tag] = d = {}
-            
-            for i, obj in enumerate(self):
-                if tag not in obj:
-                    continue
-                
-                objIsRaw = (
-                  (tag not in changedKeys[i]) or
-                  isinstance(obj[tag], (str, bytes)))
-                
-                for avatarIndex, otherEquals in d.items():
-                    avatarIsRaw = (
-                      (tag not in changedKeys[avatarIndex]) or
-                      isinstance(self[avatarIndex][tag], (str, bytes)))
-                    
-                    if avatarIsRaw and objIsRaw:
-                        av = self[avatarIndex]
-                        
-                        if obj.getRawTable(tag) == av.getRawTable(tag):
-                            otherEquals.add(i)
-                            break
-                    
-                    else:
-                        if avatarIsRaw:
-                            changedKeys[avatarIndex].add(tag)
-                        
-                        elif objIsRaw:
-                            changedKeys[i].add(tag)
-                            objIsRaw = False
-                            
-                        if obj[tag] == self[avatarIndex][tag]:
-                            otherEquals.add(i)
-                            break
-                
-                else:
-                    d[i] = set()
-        
-        return uniques
-    
     def buildBinary(self, w, **kwArgs):
         """
         Adds the binary data for the FamilyEditor to the specified writer.
@@ -489,7 +448,7 @@ class FamilyEditor(list, metaclass=seqmeta.FontDataMetaclass):
             w.add("3L", 0, 0, 0)  # ulDsigTag, ulDsigLength, ulDsigOffset for v2
         
         changedKeys = self._makeChangedKeys()
-        uniques = self._makeUniques(changedKeys)
+        uniques = sharedtables.makeUniques(self, changedKeys)
         stakes = self._makeStakes(w)
         headerChecksumRanges = []
         
@@ -541,20 +500,32 @@ class FamilyEditor(list, metaclass=seqmeta.FontDataMetaclass):
     def frompath(cls, path, **kwArgs):
         """
         Creates and returns a new FamilyEditor for the TTC specified by path.
+        The useMmap and zeroCopy keyword arguments are supported as in
+        Editor.frompath().
         """
         
-        r = cls.fromwalker(filewalkerbit.FileWalkerBit(path), **kwArgs)
+        w = filewalkerbit.walkerForPath(
+          path,
+          useMmap = kwArgs.pop('useMmap', False),
+          zeroCopy = kwArgs.pop('zeroCopy', False))
+        
+        r = cls.fromwalker(w, **kwArgs)
         r.cameFromTTC = True
         return r
     
     @classmethod
     def fromvalidatedpath(cls, path, **kwArgs):
         """
+        Like frompath(), but with validation. The useMmap and zeroCopy keyword
+        arguments are supported as in Editor.frompath().
         """
         
-        r = cls.fromvalidatedwalker(
-          filewalkerbit.FileWalkerBit(path),
-          **kwArgs)
+        w = filewalkerbit.walkerForPath(
+          path,
+          useMmap = kwArgs.pop('useMmap', False),
+          zeroCopy = kwArgs.pop('zeroCopy', False))
+        
+        r = cls.fromvalidatedwalker(w, **kwArgs)
         
         if r:
             r.cameFromTTC = True
@@ -773,11 +744,17 @@ class FamilyEditor(list, metaclass=seqmeta.FontDataMetaclass):
 
     def writeFont(self, path, **kwArgs):
         """
+        Writes the binary data for the FamilyEditor to the specified path.
+        Every table is built before anything is written; the resolved
+        pieces are then written one at a time, which only avoids joining
+        them into a second full copy of the font. The data go to a
+        temporary file that then replaces path, so a failed build never
+        leaves a truncated font behind.
         """
         
-        f = open(path, "wb")
-        f.write(self.binaryString(**kwArgs))
-        f.close()
+        w = writer.LinkedWriter()
+        self.buildBinary(w, **kwArgs)
+        w.writeToFile(path)
 
 # -----------------------------------------------------------------------------
 
@@ -77,6 +77,22 @@ attributes of instances of the class:
         contrast, means no values will be kept in the dict. A positive value
         specifies the actual count that will be kept.
         
+        This limit may be changed for a single object at run time via the
+        ``setCacheLimits()`` method.
+        
+        Default is ``None``.
+    
+    ``dict_keepbytelimit``
+        A value specifying the approximate total size, in bytes, of the live
+        objects that should be kept at once. This works like
+        ``dict_keeplimit`` (and may be used with it), except that least
+        recently used values are purged until the total size of the remaining
+        values is no larger than this limit. Sizes are determined by the
+        ``item_sizefunc``.
+        
+        This limit may be changed for a single object at run time via the
+        ``setCacheLimits()`` method.
+        
         Default is ``None``.
     
     ``dict_maxcontextfunc``
@@ -788,6 +804,14 @@ attributes of instances of the class:
         
         Default is False.
     
+    ``item_sizefunc``
+        A function taking a single argument, a value created by the
+        ``item_createfunc``, and returning its approximate size in bytes. This
+        is only used if a byte limit is in effect (see ``dict_keepbytelimit``).
+        
+        Default is a function that adds up the ``sys.getsizeof()`` values of
+        the object and of everything it contains or refers to.
+    
     ``item_strusesrepr``
         If True then the string representation for values in the mapping will
         be created via ``repr()``, not ``str()``.
@@ -808,6 +832,18 @@ attributes of instances of the class:
         
         Default is False.
     
+    ``item_trackchanges``
+        If True then ``unchangedKeys()`` also reports the keys whose values
+        have been made but still compare equal to the values the
+        ``item_createfunc`` makes from the original data. This lets it tell
+        values that have only been looked at from values that have been
+        changed in place, so that (for instance) a ``buildBinary()`` method
+        can reuse the original binary data for the former. Nothing is kept
+        when values are made; the original values are only made again when
+        ``unchangedKeys()`` is called.
+        
+        Default is False.
+    
     ``item_transformkeysgrouped``
         If True, no ``KeyError`` will be raised if two or more keys transform
         into the same value; instead, all the values associated with the
@@ -1081,6 +1117,7 @@ import functools
 import itertools
 import logging
 import operator
+import sys
 
 # Other imports
 from fontio3 import utilities
@@ -1099,6 +1136,7 @@ validDictSpecKeys = frozenset([
   'dict_asimmutablefunc',
   'dict_compactremovesfalses',
   'dict_compareignoresfalses',
+  'dict_keepbytelimit',
   'dict_keeplimit',
   'dict_maxcontextfunc',
   'dict_mergechecknooverlap',
@@ -1182,9 +1220,11 @@ validDictSpecKeys = frozenset([
   'item_scaledirectkeysnoround',
   'item_scaledirectvalues',
   'item_scaledirectvaluesnoround',
+  'item_sizefunc',
   'item_strusesrepr',
   'item_subloggernamefunc',
   'item_subloggernamefuncneedsobj',
+  'item_trackchanges',
   'item_transformkeysgrouped',
   'item_transformkeysnoround',
   'item_transformkeyvaluepairs',
@@ -1219,6 +1259,47 @@ validDictSpecKeys = frozenset([
   'item_wisdom_key',
   'item_wisdom_value'])
 
+class _CacheState:
+    """
+    Objects of this class keep track of which created values a deferred dict
+    is currently holding in its _dOrig dict, in least recently used order,
+    along with the limits on how many (or how many bytes' worth) may be kept,
+    and counters for cache hits, misses and evictions.
+    """
+    
+    __slots__ = (
+      'byteLimit',
+      'byteTotal',
+      'dOrig',
+      'evictions',
+      'hits',
+      'keepLimit',
+      'misses',
+      'order')
+    
+    def __init__(self, dOrig, keepLimit=None, byteLimit=None):
+        self.dOrig = dOrig
+        self.keepLimit = keepLimit
+        self.byteLimit = byteLimit
+        self.order = collections.OrderedDict()  # key -> approximate size
+        self.byteTotal = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def isLimited(self):
+        return self.keepLimit is not None or self.byteLimit is not None
+    
+    def isOverLimit(self):
+        if self.keepLimit is not None and len(self.order) > self.keepLimit:
+            return True
+        
+        return self.byteLimit is not None and self.byteTotal > self.byteLimit
+    
+    def forget(self, key):
+        if key in self.order:
+            self.byteTotal -= self.order.pop(key)
+
 class _ScaleListShallow(list, metaclass=seqmeta.FontDataMetaclass):
     seqSpec = dict(item_strusesrepr = True)
 
@@ -1376,6 +1457,41 @@ def M_asImmutable(self, **kwArgs):
     
     return r
 
+def M_cacheStatistics(self):
+    """
+    Returns information about how well the cache of created values is doing.
+    
+    :return: A dict with the following keys: ``hits`` (the number of requests
+        satisfied by an already-created value), ``misses`` (the number of
+        values created via the ``item_createfunc``), ``evictions`` (the number
+        of created values discarded because of a limit), ``cachedCount`` and
+        ``cachedBytes`` (the number and approximate total size of the values
+        currently being tracked against a limit), and ``keepLimit`` and
+        ``byteLimit`` (the limits currently in effect).
+    :rtype: dict
+    
+    >>> class Test(object, metaclass=FontDataMetaclass):
+    ...     deferredDictSpec = dict(
+    ...         item_createfunc = (lambda k,e: [k]),
+    ...         dict_keeplimit = 2)
+    >>> t = Test(creationExtras=dict(oneTimeKeyIterator=iter(range(1, 11))))
+    >>> v = t[1], t[2], t[1], t[3], t[1]
+    >>> d = t.cacheStatistics()
+    >>> d['hits'], d['misses'], d['evictions'], d['cachedCount']
+    (2, 3, 1, 2)
+    """
+    
+    cs = _cacheStateFor(self)
+    
+    return dict(
+      hits = cs.hits,
+      misses = cs.misses,
+      evictions = cs.evictions,
+      cachedCount = len(cs.order),
+      cachedBytes = cs.byteTotal,
+      keepLimit = cs.keepLimit,
+      byteLimit = cs.byteLimit)
+
 def M_changed(self, key):
     """
     Notify fontio3 that content has changed.
@@ -1419,8 +1535,7 @@ def M_changed(self, key):
         self._dAdded[key] = self._dOrig[key]
         del self._dOrig[key]
     
-    if self._DEFDSPEC.get('dict_keeplimit', None):
-        self._keysCurrentlyCached.discard(key)
+    _cacheStateFor(self).forget(key)
 
 def M_checkInput(self, valueToCheck, **kwArgs):
     """
@@ -1522,9 +1637,9 @@ def M_clear(self):
     self._dOrig.clear()
     self._dAdded.clear()
     self._creationExtras.clear()
-    
-    if self._DEFDSPEC.get('dict_keeplimit', None):
-        self._keysCurrentlyCached.clear()
+    cs = _cacheStateFor(self)
+    cs.order.clear()
+    cs.byteTotal = 0
 
 def M_coalesced(self, **kwArgs):
     """
@@ -4988,6 +5103,71 @@ def M_scaled(self, scaleFactor, **kwArgs):
     
     return r
 
+def M_setCacheLimits(self, keepLimit=None, byteLimit=None):
+    """
+    Changes the limits on how many created values are kept for this object.
+    
+    :param keepLimit: The maximum number of created values to keep, or
+        ``None`` for no count limit
+    :param byteLimit: The maximum approximate total size, in bytes, of the
+        created values to keep, or ``None`` for no size limit
+    :return: ``None``
+    
+    These override the class's ``dict_keeplimit`` and ``dict_keepbytelimit``
+    (see above). This allows, for example, a ``Glyf`` object for a very large
+    font to be given a memory budget. If values have already been created they
+    become subject to the new limits immediately; if both limits are ``None``
+    all created values are kept.
+    
+    >>> class Test(object, metaclass=FontDataMetaclass):
+    ...     deferredDictSpec = dict(item_createfunc = (lambda k,e: [k] * k))
+    >>> t = Test(creationExtras=dict(oneTimeKeyIterator=iter(range(1, 51))))
+    >>> v = [t[i] for i in range(1, 11)]
+    >>> len(t.unmadeKeys())
+    40
+    >>> t.setCacheLimits(keepLimit=3)
+    >>> sorted(set(range(1, 51)) - t.unmadeKeys())
+    [8, 9, 10]
+    >>> v = t[9], t[20]
+    >>> sorted(set(range(1, 51)) - t.unmadeKeys())
+    [9, 10, 20]
+    
+    >>> t.setCacheLimits(byteLimit=1000)
+    >>> v = [t[i] for i in range(1, 51)]
+    >>> t.cacheStatistics()['cachedBytes'] <= 1000
+    True
+    >>> len(set(range(1, 51)) - t.unmadeKeys()) < 10
+    True
+    """
+    
+    cs = _cacheStateFor(self)
+    wasLimited = cs.isLimited()
+    cs.keepLimit = keepLimit
+    cs.byteLimit = byteLimit
+    
+    if not cs.isLimited():
+        cs.order.clear()
+        cs.byteTotal = 0
+        return
+    
+    if not wasLimited:
+        for key, obj in self._dOrig.items():
+            if obj is not _singletonNCV:
+                cs.order[key] = 0
+    
+    if byteLimit is None:
+        for key in cs.order:
+            cs.order[key] = 0
+    
+    else:
+        sizeFunc = self._DEFDSPEC.get('item_sizefunc', _approximateSize)
+        
+        for key in cs.order:
+            cs.order[key] = sizeFunc(self._dOrig[key])
+    
+    cs.byteTotal = sum(cs.order.values())
+    _evictWhileOverLimit(self, cs)
+
 def M_setdefault(self, key, default=None):
     """
     Returns a value from the object for the specified key. If the key is not
@@ -5355,6 +5535,64 @@ def M_transformed(self, matrixObj, **kwArgs):
     
     return r
 
+def M_unchangedKeys(self, **kwArgs):
+    """
+    Find keys whose values are known to still match the original data.
+    
+    :param kwArgs: Optional values which override the creation extras when
+        the original values are made again (see below)
+    :return: all the keys in ``unmadeKeys()``, along with (if the
+        ``item_trackchanges`` flag is set) the keys whose values have been
+        created but not changed since
+    :rtype: set
+    
+    If the ``item_trackchanges`` flag is set, the original value for each key
+    whose value has been made is made again by the ``item_createfunc``, and
+    compared with the current value. This means changing a value in place is
+    detected here even if ``changed()`` was not called for it. Any ``kwArgs``
+    replace the entries with the same names in a copy of the creation extras
+    used for this (for instance, to turn off validation).
+    
+    >>> class Test(object, metaclass=FontDataMetaclass):
+    ...     deferredDictSpec = dict(
+    ...         item_createfunc = (lambda k, e: [k]),
+    ...         item_trackchanges = True)
+    >>> t = Test(creationExtras=dict(oneTimeKeyIterator=iter(['a', 'f', 'z'])))
+    >>> t['a'], t['f']
+    (['a'], ['f'])
+    >>> t['f'].append('x')
+    >>> sorted(t.unchangedKeys()), sorted(t.unmadeKeys())
+    (['a', 'z'], ['z'])
+    >>> t['z'] = ['new']
+    >>> sorted(t.unchangedKeys())
+    ['a']
+    """
+    
+    DDS = self._DEFDSPEC
+    
+    if not DDS.get('item_trackchanges', False):
+        return self.unmadeKeys()
+    
+    f = DDS['item_createfunc']
+    extras = self._creationExtras.copy()
+    extras.update(kwArgs)
+    r = set()
+    
+    for k, v in self._dOrig.items():
+        if v is _singletonNCV:
+            r.add(k)
+            continue
+        
+        if DDS.get('item_createfuncneedsself', False):
+            orig = f(k, self, extras)
+        else:
+            orig = f(k, extras)
+        
+        if v == orig:
+            r.add(k)
+    
+    return r
+
 def M_unmadeKeys(self):
     """
     Find keys not yet "brought to life".
@@ -5830,9 +6068,7 @@ def SM_delitem(self, key):
     
     elif key in self._dOrig:
         del self._dOrig[key]
-        
-        if self._DEFDSPEC.get('dict_keeplimit', None):
-            self._keysCurrentlyCached.discard(key)
+        _cacheStateFor(self).forget(key)
     
     else:
         raise KeyError(key)
@@ -5968,7 +6204,8 @@ def SM_getitem(self, key):
     
     The value is created, if necessary, via a call to the ``item_createfunc``.
     The item thus created may be cached or not, depending on the
-    ``dict_keeplimit``.
+    ``dict_keeplimit`` and ``dict_keepbytelimit``. When a limit is in effect,
+    the least recently used values are the ones discarded.
     
     >>> class Test(object, metaclass=FontDataMetaclass):
     ...     deferredDictSpec = dict(item_createfunc = (lambda k, e: k*5))
@@ -6005,28 +6242,38 @@ def SM_getitem(self, key):
     
     if key in self._dOrig:
         obj = self._dOrig[key]
+        cs = _cacheStateFor(self)
         
-        if obj is _singletonNCV:
-            DDS = self._DEFDSPEC
-            f = DDS['item_createfunc']
-            kl = DDS.get('dict_keeplimit', None)
+        if obj is not _singletonNCV:
+            cs.hits += 1
             
-            if DDS.get('item_createfuncneedsself', False):
-                obj = f(key, self, self._creationExtras)
-            else:
-                obj = f(key, self._creationExtras)
+            if key in cs.order:
+                cs.order.move_to_end(key)
             
-            if kl:
-                kcc = self._keysCurrentlyCached
-                
-                if kl == len(kcc):
-                    self._dOrig[kcc.pop()] = _singletonNCV
-                
-                self._dOrig[key] = obj
-                kcc.add(key)
+            return obj
+        
+        DDS = self._DEFDSPEC
+        f = DDS['item_createfunc']
+        cs.misses += 1
+        
+        if DDS.get('item_createfuncneedsself', False):
+            obj = f(key, self, self._creationExtras)
+        else:
+            obj = f(key, self._creationExtras)
+        
+        if not cs.isLimited():
+            self._dOrig[key] = obj
+        
+        elif cs.keepLimit != 0:
+            if cs.byteLimit is None:
+                size = 0
+            else:
+                size = DDS.get('item_sizefunc', _approximateSize)(obj)
             
-            elif kl is None:
-                self._dOrig[key] = obj
+            self._dOrig[key] = obj
+            cs.order[key] = size
+            cs.byteTotal += size
+            _evictWhileOverLimit(self, cs)
         
         return obj
     
@@ -6118,8 +6365,10 @@ def SM_init(self, *args, **kwArgs):
     d['_dOrig'] = dict.fromkeys(it, _singletonNCV)
     d['_namer'] = None
     
-    if self._DEFDSPEC.get('dict_keeplimit', None):
-        d['_keysCurrentlyCached'] = set()
+    d['_cacheState'] = _CacheState(
+      d['_dOrig'],
+      self._DEFDSPEC.get('dict_keeplimit', None),
+      self._DEFDSPEC.get('dict_keepbytelimit', None))
     
     AS = self._ATTRSPEC
     f = operator.itemgetter('attr_initfunc')
@@ -6505,6 +6754,7 @@ _methodDict = {
     '_pprint_namer': PM_pprint_namer,
     '_pprint_nonamer': PM_pprint_nonamer,
     'asImmutable': M_asImmutable,
+    'cacheStatistics': M_cacheStatistics,
     'changed': M_changed,
     'checkInput': M_checkInput,
     'clear': M_clear,
@@ -6537,9 +6787,11 @@ _methodDict = {
     'reallyHas': M_reallyHas,
     'recalculated': M_recalculated,
     'scaled': M_scaled,
+    'setCacheLimits': M_setCacheLimits,
     'setdefault': M_setdefault,
     'storageRenumbered': M_storageRenumbered,
     'transformed': M_transformed,
+    'unchangedKeys': M_unchangedKeys,
     'unmadeKeys': M_unmadeKeys,
     'update': M_update,
     'values': M_values
@@ -6565,9 +6817,90 @@ def _addMethods(cd, bases):
         else:
             cd[mKey] = m
 
+def _approximateSize(obj):
+    """
+    Returns the approximate number of bytes used by obj, including the objects
+    it contains or refers to. Each distinct object is counted only once.
+    
+    >>> _approximateSize([]) < _approximateSize([[1, 2], "abc"])
+    True
+    >>> x = list(range(100))
+    >>> _approximateSize([x]) == _approximateSize([x, x]) - 8
+    True
+    """
+    
+    seen = set()
+    stack = [obj]
+    total = 0
+    
+    while stack:
+        x = stack.pop()
+        
+        if id(x) in seen or isinstance(x, type):
+            continue
+        
+        seen.add(id(x))
+        total += sys.getsizeof(x)
+        
+        if isinstance(x, (str, bytes, bytearray, int, float)):
+            continue
+        
+        if isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            stack.extend(x)
+        
+        d = getattr(x, '__dict__', None)
+        
+        if d is not None:
+            stack.append(d)
+    
+    return total
+
 def _badCreateFunc(k, e):
     raise KeyError(k)
 
+def _cacheStateFor(self):
+    """
+    Returns the _CacheState for self, making a new one if self's _dOrig dict
+    is no longer the one the existing _CacheState was tracking (as happens in
+    deep copies, whose _dOrig starts out empty).
+    """
+    
+    d = self.__dict__
+    cs = d.get('_cacheState', None)
+    
+    if cs is None or cs.dOrig is not d['_dOrig']:
+        DDS = self._DEFDSPEC
+        
+        if cs is None:
+            kl = DDS.get('dict_keeplimit', None)
+            bl = DDS.get('dict_keepbytelimit', None)
+        else:
+            kl, bl = cs.keepLimit, cs.byteLimit
+        
+        cs = d['_cacheState'] = _CacheState(d['_dOrig'], kl, bl)
+    
+    return cs
+
+def _evictWhileOverLimit(self, cs):
+    """
+    Purges least recently used values from self's _dOrig until the limits in
+    the specified _CacheState are met.
+    """
+    
+    dOrig = self._dOrig
+    
+    while cs.order and cs.isOverLimit():
+        key, size = cs.order.popitem(last=False)
+        cs.byteTotal -= size
+        cs.evictions += 1
+        
+        if key in dOrig:
+            dOrig[key] = _singletonNCV
+
 def _validateDeferredDictSpec(d):
     """
     Make sure only known keys are included in the deferredDictSpec, and that a
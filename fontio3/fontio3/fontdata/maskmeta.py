@@ -1224,10 +1224,10 @@ def M_buildBinary(self, w, **kwArgs):
                 value = self.__dict__[key]
             
             if d.get('mask_isbool', False):
-                w.addBits(('\x80' if value else '\x00'), 1)
+                w.addBits((b'\x80' if value else b'\x00'), 1)
             
             elif d.get('mask_isantibool', False):
-                w.addBits(('\x00' if value else '\x80'), 1)
+                w.addBits((b'\x00' if value else b'\x80'), 1)
             
             elif d.get('mask_isenum', False):
                 value = cd['_MASKINV'][key][value]
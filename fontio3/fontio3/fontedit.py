@@ -81,6 +81,7 @@ from fontio3.MTsf import MTsf
 from fontio3.MVAR import MVAR
 from fontio3.name import name
 from fontio3.opbd import opbd
+from fontio3.opentype import shapingplan
 from fontio3.opentype.living_variations import IVS
 from fontio3.OS_2 import OS_2
 from fontio3.PCLT import PCLT
@@ -579,6 +580,11 @@ _repertoire_bare_min = frozenset([
   b'maxp',
   b'name',
   b'post'])
+
+# This is the number of locations for which Editor.regionScalars() keeps its
+# RegionScalars objects. The oldest is discarded to make room for a new one.
+
+_regionScalarsKeepLimit = 16
   
 # -----------------------------------------------------------------------------
 
@@ -952,8 +958,10 @@ def _validate(obj, **kwArgs):
             r = table.isValid(logger=subLogger, **kwArgs) and r
     
     if kwArgs.get('doRasterizationTests', True):
+        # the hintProcessCount kwArg lets the per-glyph hint runs be spread
+        # over worker processes (see HintsValidator.validate())
         v = validate.HintsValidator(obj, logger=logger)
-        r = v.validate() and r
+        r = v.validate(processCount=kwArgs.get('hintProcessCount', 1)) and r
 
     for cachefile in ['hdmxpicklefile', 'vdmxpicklefile', 'ltshpicklefile']:
         if cachefile in obj.__dict__:
@@ -1802,6 +1810,7 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
         else:
             stakeValue = w.stakeCurrent()
         
+        fontStart = w.byteLength
         self._updateDependentObjects(**kwArgs)
         
         if kwArgs.get('forApple', False):
@@ -1996,16 +2005,29 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
             lengths[tag] = w.byteLength - startByteLength
             w.alignToByteMultiple(4)
         
-        for tag, (start, stop) in undoneChecksums.items():
-            checksums[tag] = w.checkSum(start, stop)
+        # Gather the checksums for all the rebuilt tables, along with the
+        # checksum for the whole writer, in a single resolution pass. At this
+        # point the directory entries for the rebuilt tables still have zero
+        # checksums, so if those entries are longword-aligned the final total
+        # is just the sum of the partial total and the new table checksums.
+        ranges = dict(undoneChecksums)
+        ranges[None] = (None, None)
+        sums = w.checkSums(ranges)
+        partialTotal = sums.pop(None)
+        checksums.update(sums)
         
         # Now do final 'head' checksum adjustment
         w.deleteIndexMap("checksums")
         w.addIndexMap("checksums", checksums)
         w.deleteIndexMap("lengths")
         w.addIndexMap("lengths", lengths)
+        
         # we checksum with zero in the 'head' checkSumAdjustment
-        totalChecksum = w.checkSum()
+        if fontStart % 4:
+            totalChecksum = w.checkSum()
+        else:
+            totalChecksum = partialTotal + sum(sums.values())
+        
         adjValue = (0xB1B0AFBA - totalChecksum) % 0x100000000
         w.deleteIndexMap("headAdj")
         w.addIndexMap("headAdj", {'head': adjValue})
@@ -2206,6 +2228,35 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
         adjValue = (0xB1B0AFBA - totalChecksum) % 0x100000000
         w.addIndexMap(("headAdj", familyIndex), {'head': adjValue})
     
+    def changed(self, key):
+        """
+        Notifies the Editor that the table for the specified key has been
+        changed in place. In addition to the usual deferred-dict handling,
+        any caches the table keeps (such as the GDEF table's ignorable glyph
+        masks) are discarded, as are the Editor's cached shaping plans if the
+        table is a GSUB, GPOS or GDEF.
+        
+        >>> from fontio3.opentype import shapingplan
+        >>> e = Editor()
+        >>> e.GSUB = shapingplan._testingGSUB
+        >>> p = e.shapingPlan('latn')
+        >>> e.changed(b'GSUB')
+        >>> e.shapingPlan('latn') is p
+        False
+        """
+        
+        if isinstance(key, str):
+            key = key.encode('ascii')
+        
+        deferreddictmeta.M_changed(self, key)
+        obj = self[key]
+        
+        if hasattr(obj, 'clearCaches'):
+            obj.clearCaches()
+        
+        if key in {b'GDEF', b'GPOS', b'GSUB'}:
+            self.__dict__.pop('_shapingPlans', None)
+    
     @classmethod
     def frommissingglyph(cls, missingGlyphObj, mtxObj, **kwArgs):
         """
@@ -2304,22 +2355,40 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
     @classmethod
     def frompath(cls, path, **kwArgs):
         """
+        Creates and returns a new Editor for the font specified by path. The
+        following keyword arguments are supported, in addition to those used
+        by fromwalker():
+        
+            useMmap         If True, the file is memory-mapped and all table
+                            walkers share that mapping, instead of reading the
+                            file via seek and read calls. Default is False.
+            
+            zeroCopy        If True (and useMmap is also True), raw table data
+                            from getRawTable() and similar calls are returned
+                            as memoryviews into the mapping, rather than as
+                            new bytestrings. Default is False.
         """
         
-        return cls.fromwalker(
-          filewalkerbit.FileWalkerBit(path),
-          originalPath = path,
-          **kwArgs)
+        w = filewalkerbit.walkerForPath(
+          path,
+          useMmap = kwArgs.pop('useMmap', False),
+          zeroCopy = kwArgs.pop('zeroCopy', False))
+        
+        return cls.fromwalker(w, originalPath=path, **kwArgs)
     
     @classmethod
     def fromvalidatedpath(cls, path, **kwArgs):
         """
+        Like frompath(), but with validation. The useMmap and zeroCopy keyword
+        arguments are supported as in frompath().
         """
         
-        return cls.fromvalidatedwalker(
-          filewalkerbit.FileWalkerBit(path),
-          originalPath = path,
-          **kwArgs)
+        w = filewalkerbit.walkerForPath(
+          path,
+          useMmap = kwArgs.pop('useMmap', False),
+          zeroCopy = kwArgs.pop('zeroCopy', False))
+        
+        return cls.fromvalidatedwalker(w, originalPath=path, **kwArgs)
     
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
@@ -2571,6 +2640,71 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
 
         return r
     
+    def instanced(self, location, **kwArgs):
+        """
+        Returns a new Editor with a static instance of this variable font at
+        the specified location, a dict mapping axis tags to user coordinates.
+        Axes not in the dict are left at their default values. The glyphs,
+        metrics, font-wide values and CVT values are varied as needed, and the
+        variation tables are removed.
+        
+        The following keyword arguments are supported:
+        
+            processes       Default 1. If more than 1, and this Editor was
+                            opened from a path whose 'glyf', 'gvar' and 'loca'
+                            tables have not been changed, the glyphs are done
+                            in a pool of this many processes.
+        
+        See the fvar.instancer module for details.
+        """
+        
+        from fontio3.fvar import instancer
+        
+        return instancer.instanced(self, location, **kwArgs)
+    
+    def instancedAll(self, **kwArgs):
+        """
+        Returns a generator over (subfamilyNameID, Editor) pairs, one for each
+        named instance in the 'fvar' table, in name ID order. The keyword
+        arguments are the same as for instanced(). The instances all share the
+        data decoded from this Editor, so each glyph's variations are only
+        decoded once.
+        """
+        
+        from fontio3.fvar import instancer
+        
+        return instancer.instancedAll(self, **kwArgs)
+    
+    def regionScalars(self, location):
+        """
+        Returns a RegionScalars object (see the fvar.regionscalars module) for
+        the specified normalized location, a dict mapping axis tags to
+        normalized coordinates. The same object is returned each time the
+        same location is asked for, so the scalar for each region or tuple of
+        variations is only computed once at that location, however many
+        tables use it. A small number of recent locations are kept.
+        
+        >>> e = Editor()
+        >>> rs = e.regionScalars({'wght': 0.5})
+        >>> e.regionScalars({'wght': 0.5}) is rs
+        True
+        >>> e.regionScalars({'wght': 0.25}) is rs
+        False
+        """
+        
+        from fontio3.fvar import regionscalars
+        
+        key = frozenset(location.items())
+        d = self.__dict__.setdefault('_regionScalars', {})
+        
+        if key not in d:
+            if len(d) >= _regionScalarsKeepLimit:
+                del d[next(iter(d))]
+            
+            d[key] = regionscalars.RegionScalars(location)
+        
+        return d[key]
+    
     def setRawTable(self, key, value, **kwArgs):
         """
         Sets the value (which must be a bytestring) for the specified key. The
@@ -2628,13 +2762,109 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
             if key in self._dOrig:
                 del self._dOrig[key]
     
+    def shape(self, glyphs, script, **kwArgs):
+        """
+        Runs the GSUB and then the GPOS lookups for the specified script (and
+        optional language and features) over the specified sequence of glyph
+        indices. Returns a pair: the resulting GlyphList, and a list of the
+        same length containing the accumulated GPOS Effect objects.
+        
+        The keyword arguments are those for shapingPlan(); any others are
+        passed through to the Lookup.run() calls (for instance, useEmpties).
+        The plan for each (script, language, features) combination is built
+        once and cached in the Editor, so shaping many strings with the same
+        settings only pays for the lookups themselves.
+        
+        >>> from fontio3.opentype import shapingplan
+        >>> e = Editor()
+        >>> e.GSUB = shapingplan._testingGSUB
+        >>> glyphs, effects = e.shape([4, 11, 29, 5, 9, 2], 'latn')
+        >>> glyphs.asSimpleTuple()
+        (97, -1, -1, 32, -1, 2)
+        >>> len(effects)
+        6
+        >>> e.shape([4, 11, 29], 'latn', features=[b'smcp'])[0].asSimpleTuple()
+        (4, 11, 29)
+        """
+        
+        plan = self.shapingPlan(
+          script,
+          language = kwArgs.pop('language', None),
+          features = kwArgs.pop('features', None),
+          forceNewPlan = kwArgs.pop('forceNewPlan', False))
+        
+        kwArgs['editor'] = self
+        return plan.run(glyphs, **kwArgs)
+    
+    def shapingPlan(self, script, **kwArgs):
+        """
+        Returns a ShapingPlan for the specified script, reusing a cached one
+        if this Editor's current GSUB and GPOS are the ones it was built from.
+        The following keyword arguments are supported:
+        
+            features        An iterable of four-byte feature tags to apply. If
+                            not specified (or None), the default features
+                            defined in the shapingplan module are used.
+            
+            forceNewPlan    A Boolean (default False) which, if True, causes
+                            the plan to be rebuilt even if a cached one is
+                            available. Calling changed() for the GSUB, GPOS
+                            or GDEF also discards the cached plans.
+            
+            language        The language tag. If not specified (or None), the
+                            script's default LangSys is used.
+        """
+        
+        if not isinstance(script, bytes):
+            script = script.encode('ascii')
+        
+        language = kwArgs.get('language', None)
+        
+        if isinstance(language, str):
+            language = language.encode('ascii')
+        
+        features = kwArgs.get('features', None)
+        
+        if features is not None:
+            features = frozenset(features)
+        
+        d = self.__dict__
+        
+        if '_shapingPlans' not in d:
+            d['_shapingPlans'] = {}
+        
+        key = (script, language, features)
+        gsub = (self.GSUB if self.reallyHas(b'GSUB') else None)
+        gpos = (self.GPOS if self.reallyHas(b'GPOS') else None)
+        plan = d['_shapingPlans'].get(key, None)
+        
+        if (
+          (plan is None) or
+          kwArgs.get('forceNewPlan', False) or
+          (not plan.isCurrent(gsub, gpos))):
+            
+            plan = d['_shapingPlans'][key] = shapingplan.ShapingPlan(
+              gsub,
+              gpos,
+              script,
+              language = language,
+              features = features)
+        
+        return plan
+    
     def writeFont(self, path, **kwArgs):
         """
+        Writes the binary data for the Editor to the specified path.
+        Every table is built before anything is written; the resolved
+        pieces are then written one at a time, which only avoids joining
+        them into a second full copy of the font. The data go to a
+        temporary file that then replaces path, so a failed build never
+        leaves a truncated font behind.
         """
         
-        f = open(path, "wb")
-        f.write(self.binaryString(**kwArgs))
-        f.close()
+        w = writer.LinkedWriter()
+        self.buildBinary(w, **kwArgs)
+        w.writeToFile(path)
 
     def writeEOTFont(self, path, **kwArgs):
         """
@@ -2728,9 +2958,10 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
         'metadata' or 'privatedata' kwArgs.
         """
         
-        sbb = self.binaryString(**kwArgs)
-        sfntSize = len(sbb)
-        sb = io.BytesIO(sbb)
+        # The sfnt data are only ever sliced, so use a memoryview rather than
+        # copying them again into a BytesIO.
+        sb = memoryview(self.binaryString(**kwArgs))
+        sfntSize = len(sb)
         
         metadata = kwArgs.get('metadata', "")
         # metadata MUST be well-formed XML; if it's not, we don't include it.
@@ -2744,10 +2975,10 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
         wb = writer.LinkedWriter()
         tStart = wb.stakeCurrent()
         wb.addString(b'wOFF')                                # WOFF signature
-        wb.addString(sb.read(4))                             # flavor
+        wb.addString(sb[0:4].tobytes())                      # flavor
         tEnd = wb.getNewStake()                              
         wb.addUnresolvedOffset("L", tStart, tEnd)            # WOFF length
-        numTables = struct.unpack(">H", sb.read(2))[0]
+        numTables = struct.unpack_from(">H", sb, 4)[0]
         wb.add("H", numTables)                               # numTables
         wb.add("H", 0)                                       # reserved (0)
         wb.add("L", sfntSize)                                # totalSfntSize
@@ -2770,12 +3001,11 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
 
         
         # Table Directory
-        sb.seek(12)
         dTKOL = {}
         tOFstakes = {}
         tLCstakes = {}
         for t in range(numTables):
-            ttag, tcks, toff, tlen = struct.unpack(">LLLL", sb.read(16))
+            ttag, tcks, toff, tlen = struct.unpack_from(">LLLL", sb, 12 + 16 * t)
             dTKOL[t] = (ttag, tcks, toff, tlen)
 
             wb.add("L", ttag)                                    # tag
@@ -2790,10 +3020,10 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
         tOrder = sorted(dTKOL, key=lambda x:dTKOL[x][2])
         for t in tOrder:
             wb.alignToByteMultiple(4)
-            sb.seek(dTKOL[t][2])
-            tblRaw = sb.read(dTKOL[t][3])
+            tOffset, tLength = dTKOL[t][2:4]
+            tblRaw = sb[tOffset:tOffset + tLength]
             tblCmp = zlib.compress(tblRaw, 9)
-            if len(tblCmp) >= len(tblRaw): tblCmp = tblRaw
+            if len(tblCmp) >= len(tblRaw): tblCmp = tblRaw.tobytes()
             wb.setDeferredValue(tLCstakes[t], "L", len(tblCmp))
             wb.stakeCurrentWithValue(tOFstakes[t])
             wb.addString(tblCmp)            
@@ -2812,9 +3042,7 @@ class Editor(object, metaclass=deferreddictmeta.FontDataMetaclass):
 
         wb.stakeCurrentWithValue(tEnd)            
 
-        wf = open(path, "wb")
-        wf.write(wb.binaryString())
-        wf.close()
+        wb.writeToFile(path)
 
 # -----------------------------------------------------------------------------
 
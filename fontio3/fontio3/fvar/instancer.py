@@ -0,0 +1,680 @@
+#
+# instancer.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for making static instances of TrueType variable fonts. An instance
+is a new Editor whose glyphs, metrics, font-wide values and CVT values are
+those of the variable font at a single location in its design space, and
+which has no variation tables.
+
+Locations are dicts mapping axis tags to user coordinates (the values used in
+the 'fvar' table, like 700 for a bold weight). Axes not in the dict are left
+at their default values.
+
+The glyphs may be done in separate processes, each of which opens the font
+from its original path and does a contiguous range of glyphs. Since decoded
+'gvar' data are cached in the source Editor, making several instances from
+the same source (as instancedAll() does for the named instances) decodes each
+glyph's variations only once.
+"""
+
+# System imports
+import concurrent.futures
+
+# Other imports
+from fontio3.fontmath import matrix
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# These are the tables that only make sense in a variable font, and which are
+# removed from an instance.
+
+variationTags = (
+  b'HVAR',
+  b'MVAR',
+  b'STAT',
+  b'VVAR',
+  b'avar',
+  b'cvar',
+  b'fvar',
+  b'gvar')
+
+# This maps the MVAR value tags that are applied to an instance to the table
+# and attribute they change. The gasp tags are not applied, since they would
+# change the gasp table's keys.
+
+_mvarTargets = {
+  'cpht': (b'OS/2', 'sCapHeight'),
+  'hasc': (b'OS/2', 'sTypoAscender'),
+  'hcla': (b'OS/2', 'usWinAscent'),
+  'hcld': (b'OS/2', 'usWinDescent'),
+  'hcof': (b'hhea', 'caretOffset'),
+  'hcrn': (b'hhea', 'caretSlopeRun'),
+  'hcrs': (b'hhea', 'caretSlopeRise'),
+  'hdsc': (b'OS/2', 'sTypoDescender'),
+  'hlgp': (b'OS/2', 'sTypoLineGap'),
+  'sbxo': (b'OS/2', 'ySubscriptXOffset'),
+  'sbxs': (b'OS/2', 'ySubscriptXSize'),
+  'sbyo': (b'OS/2', 'ySubscriptYOffset'),
+  'sbys': (b'OS/2', 'ySubscriptYSize'),
+  'spxo': (b'OS/2', 'ySuperscriptXOffset'),
+  'spxs': (b'OS/2', 'ySuperscriptXSize'),
+  'spyo': (b'OS/2', 'ySuperscriptYOffset'),
+  'spys': (b'OS/2', 'ySuperscriptYSize'),
+  'stro': (b'OS/2', 'yStrikeoutPosition'),
+  'strs': (b'OS/2', 'yStrikeoutSize'),
+  'undo': (b'post', 'underlinePosition'),
+  'unds': (b'post', 'underlineThickness'),
+  'vasc': (b'vhea', 'ascent'),
+  'vcof': (b'vhea', 'caretOffset'),
+  'vcrn': (b'vhea', 'caretSlopeRun'),
+  'vcrs': (b'vhea', 'caretSlopeRise'),
+  'vdsc': (b'vhea', 'descent'),
+  'vlgp': (b'vhea', 'lineGap')}
+
+# These are the OS/2 usWidthClass values, indexed by class minus one, as
+# percentages of normal width.
+
+_widthPercents = (50, 62.5, 75, 87.5, 100, 112.5, 125, 150, 200)
+
+# This is a pair (path, Editor) with the font used by a worker process. It is
+# opened once per process, by _workerShard().
+
+_workerEditor = None
+
+# -----------------------------------------------------------------------------
+
+#
+# Private functions
+#
+
+def _applyCvar(r, scalars):
+    """
+    Replaces the 'cvt ' table in Editor r with one that has the 'cvar' deltas
+    applied.
+    """
+    
+    cvarObj = r.cvar
+    cvtObj = r[b'cvt ']
+    coord = scalars.coordinate(cvarObj.axisOrder)
+    totals = {}
+    
+    for cvtIndex, ddObj in cvarObj.items():
+        for peak, delta in ddObj.items():
+            factor = scalars.tupleScalar(tuple(peak), None, coord)
+            
+            if factor:
+                totals[cvtIndex] = totals.get(cvtIndex, 0) + factor * delta
+    
+    if totals:
+        newCvt = cvtObj.__copy__()
+        
+        for cvtIndex, total in totals.items():
+            if cvtIndex < len(newCvt):
+                newCvt[cvtIndex] = int(round(newCvt[cvtIndex] + total))
+        
+        r[b'cvt '] = newCvt
+
+def _applyMVAR(r, scalars):
+    """
+    Replaces the tables in Editor r changed by the 'MVAR' deltas with copies
+    that have those deltas applied.
+    """
+    
+    newTables = {}
+    
+    for valueTag in sorted(r.MVAR.valueMap):
+        if valueTag not in _mvarTargets:
+            continue
+        
+        tag, attr = _mvarTargets[valueTag]
+        
+        if not r.reallyHas(tag):
+            continue
+        
+        delta = int(round(r.MVAR.valueAt(valueTag, scalars)))
+        
+        if not delta:
+            continue
+        
+        if tag not in newTables:
+            newTables[tag] = r[tag].__copy__()
+            
+            if tag == b'post':
+                newTables[tag].header = newTables[tag].header.__copy__()
+        
+        obj = newTables[tag]
+        
+        if tag == b'post':
+            obj = obj.header
+        
+        setattr(obj, attr, getattr(obj, attr) + delta)
+    
+    for tag, obj in newTables.items():
+        r[tag] = obj
+
+def _avarMapped(axisDict, n):
+    """
+    Returns the normalized coordinate n mapped through the specified 'avar'
+    AxisDict, using linear interpolation between its entries.
+    
+    >>> from fontio3.avar import axisdict
+    >>> ad = axisdict.AxisDict({-1.0: -1.0, 0.0: 0.0, 0.5: 0.75, 1.0: 1.0})
+    >>> _avarMapped(ad, 0.25), _avarMapped(ad, 0.75), _avarMapped(ad, -0.5)
+    (0.375, 0.875, -0.5)
+    >>> _avarMapped(axisdict.AxisDict(), 0.3)
+    0.3
+    """
+    
+    if not axisDict:
+        return n
+    
+    keys = sorted(axisDict)
+    
+    if n <= keys[0]:
+        return axisDict[keys[0]]
+    
+    for lo, hi in zip(keys, keys[1:]):
+        if n <= hi:
+            vLo, vHi = axisDict[lo], axisDict[hi]
+            return vLo + (vHi - vLo) * (n - lo) / (hi - lo)
+    
+    return axisDict[keys[-1]]
+
+def _instanceComposite(glyphObj, pd, coords, scalars):
+    """
+    Returns a pair (glyphObj, final4) for the specified composite glyph at the
+    specified coordinates. The component offsets are moved by their deltas;
+    the components themselves are kept, so the instance is still a composite.
+    """
+    
+    pdMod = pd.deltasForCoord_composite(coords, scalars=scalars)
+    n = len(glyphObj.components)
+    newComponents = []
+    
+    for i, c in enumerate(glyphObj.components):
+        dx, dy = pdMod.get(i, (0, 0))
+        
+        # Component offsets given by anchor points do not vary.
+        
+        if (dx or dy) and (c.compoundAnchor is None):
+            c = c.__copy__()
+            m = matrix.Matrix.forShift(dx, dy)
+            c.transformationMatrix = c.transformationMatrix.multiplied(m)
+        
+        newComponents.append(c)
+    
+    r = glyphObj.__copy__()
+    r.components = type(glyphObj.components)(newComponents)
+    final4 = tuple(tuple(pdMod.get(n + i, (0, 0))) for i in range(4))
+    return r, final4
+
+def _instanceGlyphs(e, normLoc, glyphIndices):
+    """
+    Returns a dict mapping each of the specified glyph indices to a pair
+    (glyphObj, final4) for the glyph at the specified normalized location.
+    Only glyphs with variations are included. Simple glyphs keep their hints;
+    composite glyphs still need their bounds recalculated once all the glyphs
+    are done.
+    """
+    
+    glyfObj = e.glyf
+    glyphData = e.gvar.glyphData
+    scalars = e.regionScalars(normLoc)
+    coords = scalars.coordinate(e.gvar.axisOrder)
+    r = {}
+    
+    for glyphIndex in glyphIndices:
+        pd = glyphData.get(glyphIndex, None)
+        
+        if not pd:
+            continue
+        
+        glyphObj = glyfObj[glyphIndex]
+        
+        if glyphObj.isComposite:
+            r[glyphIndex] = _instanceComposite(glyphObj, pd, coords, scalars)
+        
+        else:
+            newObj, final4 = glyfObj.getVariation(
+              glyphIndex,
+              coords,
+              editor = e,
+              scalars = scalars)
+            
+            
+            if newObj is not glyphObj:
+                newObj.hintBytes = glyphObj.hintBytes
+            
+            r[glyphIndex] = (newObj, tuple(tuple(t) for t in final4))
+    
+    return r
+
+def _instanceGlyphs_pool(e, normLoc, processes):
+    """
+    Does the same thing as _instanceGlyphs() for all the glyphs, but splits
+    the work into contiguous ranges of glyphs done by a pool of the specified
+    number of processes.
+    """
+    
+    path = e._creationExtras['originalPath']
+    glyphCount = e.maxp.numGlyphs
+    shardCount = 4 * processes
+    shards = [
+      range(i * glyphCount // shardCount, (i + 1) * glyphCount // shardCount)
+      for i in range(shardCount)]
+    
+    r = {}
+    
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        it = pool.map(_workerShard, [(path, normLoc, s) for s in shards])
+        
+        for d in it:
+            r.update(d)
+    
+    return r
+
+def _metricsEntry(entry, bounds0, bounds1, d1, d2, advanceDelta, isVertical):
+    """
+    Returns a new hmtx or vmtx entry for a glyph whose bounds changed from
+    bounds0 to bounds1, given the deltas d1 and d2 for the phantom points at
+    the origin and advance ends (for vertical metrics, the top and bottom).
+    If advanceDelta is not None it comes from an HVAR or VVAR table, and is
+    used instead of the phantom points for the advance.
+    
+    >>> from fontio3 import hmtx
+    >>> from fontio3.glyf import ttbounds
+    >>> B = ttbounds.TTBounds
+    >>> entry = hmtx.MtxEntry(500, 50)
+    >>> b0 = B(xMin=50, yMin=0, xMax=450, yMax=700)
+    >>> b1 = B(xMin=40, yMin=0, xMax=470, yMax=700)
+    >>> print(_metricsEntry(entry, b0, b1, (-5, 0), (25, 0), None, False))
+    Advance width = 530, Left sidebearing = 45
+    >>> print(_metricsEntry(entry, b0, b1, (0, 0), (0, 0), 12.4, False))
+    Advance width = 512, Left sidebearing = 40
+    >>> entry = hmtx.MtxEntry(1000, 100)
+    >>> b1 = B(xMin=50, yMin=0, xMax=450, yMax=750)
+    >>> print(_metricsEntry(entry, b0, b1, (0, 30), (0, -20), None, True))
+    Advance width = 1050, Left sidebearing = 80
+    """
+    
+    if isVertical:
+        advance = entry.advance + d1[1] - d2[1]
+        
+        if bounds1:
+            origin = bounds0.yMax + entry.sidebearing + d1[1]
+            sidebearing = origin - bounds1.yMax
+        else:
+            sidebearing = entry.sidebearing
+    
+    else:
+        advance = entry.advance + d2[0] - d1[0]
+        
+        if bounds1:
+            origin = bounds0.xMin - entry.sidebearing + d1[0]
+            sidebearing = bounds1.xMin - origin
+        else:
+            sidebearing = entry.sidebearing
+    
+    if advanceDelta is not None:
+        advance = entry.advance + int(round(advanceDelta))
+    
+    return type(entry)(max(0, advance), sidebearing)
+
+def _replaceGlyphs(r, e, d, scalars):
+    """
+    Puts the instanced glyphs from dict d (as returned by _instanceGlyphs())
+    into Editor r, along with the new metrics and head bounds.
+    """
+    
+    glyfObj = e.glyf
+    newGlyf = glyfObj.__copy__()
+    newGlyf._dOrig = newGlyf._dOrig.copy()
+    newGlyf._dAdded = newGlyf._dAdded.copy()
+    
+    for glyphIndex, (glyphObj, final4) in d.items():
+        newGlyf[glyphIndex] = glyphObj
+    
+    r.glyf = newGlyf
+    
+    for glyphIndex, (glyphObj, final4) in d.items():
+        if glyphObj.isComposite:
+            newGlyf[glyphIndex] = glyphObj.recalculated(editor=r)
+    
+    for mtxTag, varTag, isVertical in (
+      (b'hmtx', b'HVAR', False),
+      (b'vmtx', b'VVAR', True)):
+        
+        if not e.reallyHas(mtxTag):
+            continue
+        
+        mtxObj = e[mtxTag]
+        newMtx = mtxObj.__copy__()
+        varObj = (e[varTag] if e.reallyHas(varTag) else None)
+        
+        for glyphIndex, (glyphObj, final4) in d.items():
+            if glyphIndex not in mtxObj:
+                continue
+            
+            if varObj is None:
+                advanceDelta = None
+            else:
+                advanceDelta = varObj.advanceDelta(glyphIndex, scalars)
+            
+            p1, p2 = (final4[2:] if isVertical else final4[:2])
+            
+            newMtx[glyphIndex] = _metricsEntry(
+              mtxObj[glyphIndex],
+              glyfObj[glyphIndex].bounds,
+              newGlyf[glyphIndex].bounds,
+              p1,
+              p2,
+              advanceDelta,
+              isVertical)
+        
+        if varObj is not None:
+            for glyphIndex in varObj.advances:
+                if (glyphIndex not in d) and (glyphIndex in mtxObj):
+                    newMtx[glyphIndex] = _metricsEntry(
+                      mtxObj[glyphIndex],
+                      None,
+                      None,
+                      (0, 0),
+                      (0, 0),
+                      varObj.advanceDelta(glyphIndex, scalars),
+                      isVertical)
+        
+        r[mtxTag] = newMtx
+    
+    if e.reallyHas(b'head'):
+        allBounds = [g.bounds for g in newGlyf.values() if g and g.bounds]
+        
+        if allBounds:
+            headObj = e.head.__copy__()
+            headObj.xMin = min(b.xMin for b in allBounds)
+            headObj.yMin = min(b.yMin for b in allBounds)
+            headObj.xMax = max(b.xMax for b in allBounds)
+            headObj.yMax = max(b.yMax for b in allBounds)
+            r.head = headObj
+
+def _setClasses(r, e, location):
+    """
+    Sets the OS/2 weight and width classes in Editor r from the 'wght' and
+    'wdth' axes of the specified location, if they are axes in the font.
+    """
+    
+    fvarObj = e.fvar
+    os2 = r[b'OS/2'].__copy__()
+    changed = False
+    
+    if 'wght' in fvarObj:
+        v = location.get('wght', fvarObj['wght'].defaultValue)
+        os2.usWeightClass = min(1000, max(1, int(round(v))))
+        changed = True
+    
+    if 'wdth' in fvarObj:
+        v = location.get('wdth', fvarObj['wdth'].defaultValue)
+        diffs = [abs(v - pct) for pct in _widthPercents]
+        os2.usWidthClass = diffs.index(min(diffs)) + 1
+        changed = True
+    
+    if changed and (os2 != r[b'OS/2']):
+        r[b'OS/2'] = os2
+
+def _workerShard(t):
+    """
+    Does one range of glyphs in a worker process. The argument is a tuple
+    (path, normLoc, glyphIndices). The font at the path is opened the first
+    time the process needs it, and then kept for later ranges.
+    """
+    
+    global _workerEditor
+    path, normLoc, glyphIndices = t
+    
+    if (_workerEditor is None) or (_workerEditor[0] != path):
+        from fontio3 import fontedit
+        
+        _workerEditor = (path, fontedit.Editor.frompath(path))
+    
+    return _instanceGlyphs(_workerEditor[1], normLoc, glyphIndices)
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def instanced(e, location, **kwArgs):
+    """
+    Returns a new Editor with a static instance of the variable font in
+    Editor e at the specified location, which is a dict mapping axis tags to
+    user coordinates. The following keyword arguments are used:
+        
+        processes       If more than 1, and the Editor was opened from a path
+                        whose 'glyf', 'gvar' and 'loca' tables have not been
+                        changed, the glyphs are done in a pool of this many
+                        processes, each of which opens the font again.
+                        Otherwise (and by default) they are done here.
+    
+    The new Editor shares the tables that do not vary with e. The variation
+    tables (see variationTags) are removed. Glyph outlines and component
+    offsets come from 'gvar', and advances and sidebearings from the phantom
+    points (or from 'HVAR' and 'VVAR', if present). The 'MVAR' deltas are
+    applied to the OS/2, 'hhea', 'vhea' and 'post' values, and the 'cvar'
+    deltas to the 'cvt ' table. The OS/2 weight and width classes are set from
+    the 'wght' and 'wdth' axes.
+    
+    Variations in OpenType layout tables are not applied.
+    
+    >>> e = _makeTestEditor()
+    >>> r = instanced(e, {'wght': 900})
+    >>> sorted(r) == sorted(set(e) - {b'fvar', b'gvar'})
+    True
+    >>> [(p.x, p.y) for p in e.glyf[0].contours[0]][:2]
+    [(200, 0), (200, 1000)]
+    >>> [(p.x, p.y) for p in r.glyf[0].contours[0]][:2]
+    [(150, 0), (150, 1000)]
+    >>> print(r.hmtx[0])
+    Advance width = 1100, Left sidebearing = 150
+    >>> r.glyf[0].bounds.xMin, r.head.xMin, r[b'OS/2'].usWeightClass
+    (150, 150, 900)
+    
+    The default location gives the same glyphs as the variable font:
+    
+    >>> r = instanced(e, {})
+    >>> r.glyf[0] == e.glyf[0], r.hmtx[0] == e.hmtx[0]
+    (True, True)
+    
+    >>> instanced(e, {'wdth': 100})
+    Traceback (most recent call last):
+      ...
+    ValueError: Unknown axis tag: 'wdth'
+    """
+    
+    normLoc = normalizedLocation(e, location)
+    scalars = e.regionScalars(normLoc)
+    r = e.__copy__()
+    r._dOrig = r._dOrig.copy()
+    r._dAdded = r._dAdded.copy()
+    r.__dict__.pop('_namer', None)
+    r.__dict__.pop('_regionScalars', None)
+    
+    if e.reallyHas(b'gvar') and e.reallyHas(b'glyf'):
+        processes = kwArgs.get('processes', 1)
+        ce = getattr(e, '_creationExtras', {})
+        
+        if (
+          processes > 1 and
+          ce.get('originalPath', None) and
+          not ({b'glyf', b'gvar', b'loca'} & set(e._dAdded))):
+            
+            d = _instanceGlyphs_pool(e, normLoc, processes)
+        
+        else:
+            d = _instanceGlyphs(e, normLoc, list(e.glyf))
+        
+        _replaceGlyphs(r, e, d, scalars)
+    
+    if e.reallyHas(b'MVAR'):
+        _applyMVAR(r, scalars)
+    
+    if e.reallyHas(b'cvar') and e.reallyHas(b'cvt '):
+        _applyCvar(r, scalars)
+    
+    if e.reallyHas(b'OS/2'):
+        _setClasses(r, e, location)
+    
+    for tag in variationTags:
+        if tag in r:
+            del r[tag]
+    
+    return r
+
+def instancedAll(e, **kwArgs):
+    """
+    Returns a generator over (subfamilyNameID, Editor) pairs, one for each of
+    the named instances in the 'fvar' table of Editor e, in order by name ID.
+    The keyword arguments are passed to instanced(). All the instances share
+    the same decoded source data.
+    
+    >>> e = _makeTestEditor()
+    >>> for nameID, r in instancedAll(e):
+    ...   print(nameID, r.hmtx[0].advance)
+    258 1100
+    259 1050
+    """
+    
+    for nameID, instanceInfo in sorted(e.fvar.instances.items()):
+        yield nameID, instanced(e, dict(instanceInfo), **kwArgs)
+
+def normalizedLocation(e, location):
+    """
+    Returns a dict mapping each axis tag in the 'fvar' table of Editor e to
+    the normalized coordinate for the specified location, which maps axis
+    tags to user coordinates. User coordinates outside an axis's range are
+    clamped to it, and the 'avar' mapping is applied if there is one. The
+    results are rounded to the 2.14 values used in the font.
+    
+    >>> e = _makeTestEditor()
+    >>> normalizedLocation(e, {'wght': 650})
+    {'wght': 0.5}
+    >>> normalizedLocation(e, {'wght': 100}), normalizedLocation(e, {})
+    ({'wght': -1.0}, {'wght': 0.0})
+    >>> normalizedLocation(e, {'wght': 2000})
+    {'wght': 1.0}
+    """
+    
+    fvarObj = e.fvar
+    avarObj = (e.avar if e.reallyHas(b'avar') else {})
+    unknown = set(location) - set(fvarObj)
+    
+    if unknown:
+        raise ValueError("Unknown axis tag: '%s'" % (sorted(unknown)[0],))
+    
+    r = {}
+    
+    for tag, axisInfo in fvarObj.items():
+        lo = float(axisInfo.minValue)
+        default = float(axisInfo.defaultValue)
+        hi = float(axisInfo.maxValue)
+        v = min(hi, max(lo, float(location.get(tag, default))))
+        
+        if v < default:
+            n = (v - default) / (default - lo)
+        elif v > default:
+            n = (v - default) / (hi - default)
+        else:
+            n = 0.0
+        
+        n = round(n * 16384) / 16384
+        
+        if tag in avarObj:
+            n = round(_avarMapped(avarObj[tag], n) * 16384) / 16384
+        
+        r[tag] = n
+    
+    return r
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+if __debug__:
+    def _makeTestEditor():
+        from fontio3 import fontedit, hmtx
+        from fontio3.fvar import (
+          axial_coordinate, axis_info, fvar, instance_info, instances)
+        from fontio3.glyf import (
+          ttcontour, ttcontours, ttpoint, ttsimpleglyph)
+        from fontio3.gvar import (
+          axial_coordinate as gvar_ac,
+          axial_coordinates,
+          deltas,
+          deltas_dict,
+          glyph_dict,
+          gvar,
+          point_dict)
+        
+        P = ttpoint.TTPoint
+        FAC = axial_coordinate.AxialCoordinate
+        
+        box = ttsimpleglyph.TTSimpleGlyph(contours=ttcontours.TTContours([
+          ttcontour.TTContour([
+            P(200, 0),
+            P(200, 1000),
+            P(800, 1000),
+            P(800, 0)])]))
+        
+        e = fontedit.Editor.frommissingglyph(
+          box.recalculated(),
+          hmtx.MtxEntry(1000, 200),
+          unitsPerEm = 1000)
+        
+        e.fvar = fvar.Fvar(
+          {'wght': axis_info.AxisInfo(FAC(100), FAC(400), FAC(900), 0, 256)},
+          axisOrder = ('wght',),
+          instances = instances.Instances({
+            258: instance_info.InstanceInfo({'wght': FAC(900)}),
+            259: instance_info.InstanceInfo({'wght': FAC(650)})}))
+        
+        peak = axial_coordinates.AxialCoordinates(
+          [gvar_ac.AxialCoordinate(1.0)],
+          axisOrder = ('wght',))
+        
+        D = lambda x: deltas_dict.DeltasDict({peak: deltas.Deltas(x, 0)})
+        
+        pd = point_dict.PointDict({
+          0: D(-50),
+          1: D(-50),
+          2: D(50),
+          3: D(50),
+          5: D(100)})
+        
+        e.gvar = gvar.Gvar(
+          axisOrder = ('wght',),
+          glyphData = glyph_dict.GlyphDict({0: pd}))
+        
+        return e
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
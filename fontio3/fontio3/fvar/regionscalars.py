@@ -0,0 +1,217 @@
+#
+# regionscalars.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for caching the scalars by which deltas are multiplied at a single
+normalized location in a variable font's design space.
+
+A font has only a handful of distinct regions (the peaks and edges of 'gvar'
+and 'cvar' tuples, and the LivingRegions of an item variation store), but
+each is used by many glyphs and values. A RegionScalars object computes the
+scalar for each distinct region once, the first time it is needed at its
+location, and then just looks it up. Editor.regionScalars() keeps one of
+these for each location it is asked about.
+
+RegionScalars objects may be used anywhere a LivingAxialCoordinate is used to
+interpolate LivingDeltas (including the coordinateTuple keyword argument used
+when running GPOS Lookups), and may be passed as the scalars keyword argument
+to the 'gvar' methods that evaluate deltas.
+"""
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def tupleScalar(peak, edges, coord):
+    """
+    Returns the scalar for a 'gvar' or 'cvar' tuple with the specified peak
+    coordinates and edges (a sequence of (low, high) pairs, or None if the
+    tuple has no intermediate region) at the specified location.
+    
+    >>> tupleScalar((1.0, 0.0), None, (0.5, 0.7))
+    0.5
+    >>> tupleScalar((1.0, 0.5), None, (0.5, 0.7))
+    0
+    >>> tupleScalar((0.5,), ((0.25, 1.0),), (0.75,))
+    0.5
+    """
+    
+    factor = 1
+    
+    for i, (peakValue, coordValue) in enumerate(zip(peak, coord)):
+        if not peakValue:
+            continue
+        
+        if (
+          (not coordValue) or
+          (coordValue < 0 and peakValue > 0) or
+          (coordValue > 0 and peakValue < 0) or
+          ((edges is None) and (abs(coordValue) > abs(peakValue)))):
+            
+            return 0
+        
+        if edges is None:
+            factor *= (coordValue / peakValue)
+            continue
+        
+        ed1, ed2 = edges[i]
+        
+        if (coordValue < ed1) or (coordValue > ed2):
+            return 0
+        
+        if coordValue < peakValue:
+            if peakValue != ed1:
+                factor *= (coordValue - ed1) / (peakValue - ed1)
+        
+        elif ed2 != peakValue:
+            factor *= (ed2 - coordValue) / (ed2 - peakValue)
+    
+    return factor
+
+# -----------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+if 0:
+    def __________________(): pass
+
+class RegionScalars(object):
+    """
+    Objects caching the scalars for regions and tuples at one normalized
+    location, which is a dict mapping axis tags to normalized coordinates.
+    
+    >>> obj = RegionScalars({'wght': 0.5, 'wdth': -0.25})
+    >>> obj.coordinate(('wdth', 'wght'))
+    (-0.25, 0.5)
+    >>> obj.tupleScalar((1.0,), None, (0.5,))
+    0.5
+    >>> len(obj)
+    1
+    """
+    
+    #
+    # Methods
+    #
+    
+    def __init__(self, location):
+        self.location = dict(location)
+        self._coordinates = {}
+        self._lac = None
+        self._scalars = {}
+    
+    def __len__(self):
+        return len(self._scalars)
+    
+    def __repr__(self):
+        return "RegionScalars(%r)" % (self.location,)
+    
+    def asLAC(self):
+        """
+        Returns a LivingAxialCoordinate for the location.
+        
+        >>> print(RegionScalars({'wght': 0.5}).asLAC())
+        'wght': 0.5
+        """
+        
+        if self._lac is None:
+            from fontio3.opentype import living_variations
+            
+            LAC = living_variations.LivingAxialCoordinate
+            self._lac = LAC.fromdict(self.location)
+        
+        return self._lac
+    
+    def coordinate(self, axisOrder):
+        """
+        Returns a tuple with the location's coordinates in the specified axis
+        order. Axes not in the location have the coordinate zero.
+        
+        >>> RegionScalars({'wght': 0.5}).coordinate(('wdth', 'wght'))
+        (0.0, 0.5)
+        """
+        
+        axisOrder = tuple(axisOrder)
+        r = self._coordinates.get(axisOrder, None)
+        
+        if r is None:
+            loc = self.location
+            r = tuple(float(loc.get(tag, 0.0)) for tag in axisOrder)
+            self._coordinates[axisOrder] = r
+        
+        return r
+    
+    def regionScalar(self, regionObj):
+        """
+        Returns the scalar for the specified LivingRegion at the location.
+        
+        >>> from fontio3.opentype import living_variations
+        >>> LR = living_variations.LivingRegion
+        >>> region = LR.fromdict({'wght': (0.0, 1.0, 1.0)})
+        >>> obj = RegionScalars({'wght': 0.25})
+        >>> obj.regionScalar(region)
+        0.25
+        >>> obj.regionScalar(LR.fromdict({'wght': (0.0, 1.0, 1.0)}))
+        0.25
+        >>> len(obj)
+        1
+        """
+        
+        d = self._scalars
+        r = d.get(regionObj, None)
+        
+        if r is None:
+            r = d[regionObj] = regionObj.factorFromLAC(self.asLAC())
+        
+        return r
+    
+    def tupleScalar(self, peak, edges, coord):
+        """
+        Returns the same value as the module's tupleScalar() function, which
+        see. The coord should be the location's coordinate() in the axis order
+        used by peak and edges, and both should be tuples.
+        
+        >>> obj = RegionScalars({'wght': 0.75})
+        >>> coord = obj.coordinate(('wght',))
+        >>> obj.tupleScalar((0.5,), ((0.25, 1.0),), coord)
+        0.5
+        >>> obj.tupleScalar((1.0,), None, coord)
+        0.75
+        >>> len(obj)
+        2
+        """
+        
+        key = (peak, edges, coord)
+        d = self._scalars
+        r = d.get(key, None)
+        
+        if r is None:
+            r = d[key] = tupleScalar(peak, edges, coord)
+        
+        return r
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
@@ -156,6 +156,7 @@ class Glyf(object, metaclass=deferreddictmeta.FontDataMetaclass):
         item_followsprotocol = True,
         item_renumberdirectkeys = True,
         item_subloggernamefunc = (lambda i: "glyph %d" % (i,)),
+        item_trackchanges = True,
         item_usenamerforstr = True)
     
     #
@@ -203,6 +204,12 @@ class Glyf(object, metaclass=deferreddictmeta.FontDataMetaclass):
                 
                 continue
             
+            # PointDict.deltasForCoord_lists() has already interpolated the
+            # untouched points, so this is usually the case.
+            
+            if len(pointsInContour) == len(c):
+                continue
+            
             sortedInContour = sorted(pointsInContour)
             
             vDeltas = [
@@ -253,14 +260,20 @@ class Glyf(object, metaclass=deferreddictmeta.FontDataMetaclass):
                 pdMod[p] = deltaFunc(*vDeltas[p-basePoint])
         
         ptIndex = 0
+        newContours = glyphObj.contours.__copy__()
         
-        for c in glyphObj.contours:
+        for contourIndex, c in enumerate(glyphObj.contours):
+            newContour = c.__copy__()
+            
             for indexInContour, p in enumerate(c):
                 dlt = pdMod[ptIndex]
                 dlt = [int(round(dlt[0])), int(round(dlt[1]))]
-                c[indexInContour] = p.moved(*dlt)
+                newContour[indexInContour] = p.moved(*dlt)
                 ptIndex += 1
+            
+            newContours[contourIndex] = newContour
         
+        glyphObj.contours = newContours
         return glyphObj, _doFinal4(pdMod, ptCount)
 
 #     def _getVariation_simple(glyphObj, pdMod, **kwArgs):
@@ -422,38 +435,72 @@ class Glyf(object, metaclass=deferreddictmeta.FontDataMetaclass):
         
         if self:
             self._validateTightness()
-            umk = self.unmadeKeys()
+            
+            # Glyphs that were never made, or were made but not changed since,
+            # can just use their original binary data. The original glyphs
+            # are only parsed again here, so reading glyphs costs nothing
+            # extra.
+            
+            unchanged = self.unchangedKeys(doValidation=False)
             ceCopy = self.copyCreationExtras()
             cecLoca = ceCopy.get('loca')
             cecBase = ceCopy.get('wGlyf')
             walkOffset = 0
-            locaObj = loca.Loca(itertools.repeat(None, len(self)))
+            count = len(self)
+            locaObj = loca.Loca(itertools.repeat(None, count))
             forApple = kwArgs.get('forApple', False)
             forceLong = kwArgs.get('forceLongAlignment', False)
+            i = 0
             
-            for i in range(len(self)):
-                startOffset = w.byteLength
+            while i < count:
+                if i not in unchanged:
+                    startOffset = w.byteLength
+                    self[i].buildBinary(w, scaledOffsets=forApple)
+                    
+                    if forceLong:
+                        w.alignToByteMultiple(4)
+                    
+                    thisByteLength = w.byteLength - startOffset
+                    locaObj[i] = (walkOffset, thisByteLength)
+                    walkOffset += thisByteLength
+                    i += 1
+                    continue
+                
+                # Gather a run of unchanged glyphs which are also contiguous
+                # in the original data, and copy them all at once. If long
+                # alignment is being forced, each glyph is padded separately.
                 
-                if i in umk:
+                runStart, runLength = cecLoca[i]
+                locaObj[i] = (walkOffset, runLength)
+                walkOffset += runLength
+                i += 1
+                
+                while (not forceLong) and i < count and i in unchanged:
                     offset, byteLength = cecLoca[i]
-                    cecBase.reset()
                     
-                    wRaw = cecBase.subWalker(
-                      offset,
-                      relative = True,
-                      newLimit = byteLength)
+                    if offset != runStart + runLength:
+                        break
                     
-                    w.addString(wRaw.rest())
+                    locaObj[i] = (walkOffset, byteLength)
+                    walkOffset += byteLength
+                    runLength += byteLength
+                    i += 1
                 
-                else:
-                    self[i].buildBinary(w, scaledOffsets=forApple)
+                cecBase.reset()
+                
+                wRaw = cecBase.subWalker(
+                  runStart,
+                  relative = True,
+                  newLimit = runLength)
+                
+                w.addString(wRaw.rest())
                 
                 if forceLong:
+                    startOffset = w.byteLength
                     w.alignToByteMultiple(4)
-                
-                thisByteLength = w.byteLength - startOffset
-                locaObj[i] = (walkOffset, thisByteLength)
-                walkOffset += thisByteLength
+                    padLength = w.byteLength - startOffset
+                    locaObj[i - 1] = (locaObj[i - 1][0], runLength + padLength)
+                    walkOffset += padLength
             
             if 'locaCallback' in kwArgs:
                 kwArgs['locaCallback'](locaObj)
@@ -622,6 +669,10 @@ class Glyf(object, metaclass=deferreddictmeta.FontDataMetaclass):
         
             editor      The Editor object. This is used to get the Fvar and
                         Gvar objects.
+            
+            scalars     An optional RegionScalars object for the location (see
+                        Editor.regionScalars()). If present, the scalar for
+                        each tuple of variations is looked up there.
         """
         
         e = kwArgs['editor']
@@ -639,14 +690,29 @@ class Glyf(object, metaclass=deferreddictmeta.FontDataMetaclass):
         if pd is None:
             return (self[glyphIndex], _doFinal4({}, 0))
         
-        glyphObj = self[glyphIndex].__deepcopy__()
+        glyphObj = self[glyphIndex]
         
         if glyphObj.isComposite:
-            pdMod = pd.deltasForCoord_composite(coords)
+            pdMod = pd.deltasForCoord_composite(
+              coords,
+              scalars = kwArgs.get('scalars', None))
+            
             r = self._getVariation_composite(glyphObj, pdMod, coords=coords, **kwArgs)
         
         else:
-            pdMod = pd.deltasForCoord_simple(coords, glyphObj)
+            # The contours are replaced, not changed in place, by the
+            # _getVariation_simple() method, so a shallow copy is enough.
+            
+            vx, vy = pd.deltasForCoord_lists(
+              coords,
+              glyphObj,
+              scalars = kwArgs.get('scalars', None))
+            
+            pdMod = {
+              p: (int(round(x)), int(round(y)))
+              for p, (x, y) in enumerate(zip(vx, vy))}
+            
+            glyphObj = glyphObj.__copy__()
             r = self._getVariation_simple(glyphObj, pdMod, **kwArgs)
         
         r[0].hintBytes = b''
@@ -16,6 +16,7 @@ import operator
 
 # Other imports
 from fontio3.fontdata import mapmeta
+from fontio3.fvar import regionscalars
 from fontio3.gvar import axial_coordinates, deltas
     
 # -----------------------------------------------------------------------------
@@ -103,7 +104,7 @@ class DeltasDict(dict, metaclass=mapmeta.FontDataMetaclass):
     # Methods
     #
     
-    def interpolateDelta(self, coord):
+    def interpolateDelta(self, coord, **kwArgs):
         """
         Given a normalized (-1..1) coordinate, return a Deltas object that
         represents the needed shifts. This follows the algorithm documented in
@@ -115,7 +116,9 @@ class DeltasDict(dict, metaclass=mapmeta.FontDataMetaclass):
         to account for intermediates (among other effects).
         
         Note also that coord must be normalized; this method has no access to
-        the Fvar object to do normalization.
+        the Fvar object to do normalization. If the scalars keyword argument
+        is a RegionScalars object for the location, the scalar for each key is
+        looked up there instead of being computed.
         
         >>> ao = ('wght', 'wdth')
         >>> AC = axial_coordinate.AxialCoordinate
@@ -136,46 +139,35 @@ class DeltasDict(dict, metaclass=mapmeta.FontDataMetaclass):
         
         >>> print(obj.interpolateDelta((0.5, -0.25)))
         (31, -4)
+        
+        >>> from fontio3.fvar import regionscalars
+        >>> rs = regionscalars.RegionScalars({'wght': 0.5, 'wdth': -0.25})
+        >>> print(obj.interpolateDelta(rs.coordinate(ao), scalars=rs))
+        (31, -4)
         """
         
+        scalars = kwArgs.get('scalars', None)
+        
+        if scalars is None:
+            scalarFunc = regionscalars.tupleScalar
+        else:
+            scalarFunc = scalars.tupleScalar
+            coord = tuple(coord)
+        
         dx = dy = None
         
         for keyCoord, dlt in self.items():
-            factor = 1
             ed = dlt.effectiveDomain
-            it = enumerate(zip(keyCoord, coord))
             
-            for i, (peakValue, coordValue) in it:
-                if not factor:
-                    break
-                
-                if ed is not None:
-                    ed1 = min(ed.edge1[i], ed.edge2[i])
-                    ed2 = max(ed.edge1[i], ed.edge2[i])
-                
-                if not peakValue:
-                    continue
-                
-                if (
-                  (not coordValue) or 
-                  (coordValue < 0 and peakValue > 0) or 
-                  (coordValue > 0 and peakValue < 0) or
-                  ((ed is None) and (abs(coordValue) > abs(peakValue)))):
-                  
-                    factor = 0
-                
-                elif ed is None:
-                    factor *= (coordValue / peakValue)
-                
-                elif (coordValue < ed1) or (coordValue > ed2):
-                    factor = 0
-                
-                elif coordValue < peakValue:
-                    if peakValue != ed1:
-                        factor *= (coordValue - ed1) / (peakValue - ed1)
-                
-                elif ed2 != peakValue:
-                    factor *= (ed2 - coordValue) / (ed2 - peakValue)
+            if ed is None:
+                edges = None
+            
+            else:
+                edges = tuple(
+                  (min(a, b), max(a, b))
+                  for a, b in zip(ed.edge1, ed.edge2))
+            
+            factor = scalarFunc(tuple(keyCoord), edges, coord)
             
             if factor:
                 if dx is None:
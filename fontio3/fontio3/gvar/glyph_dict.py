@@ -9,16 +9,28 @@ Support for PointDict objects associated with particular glyph indices.
 """
 
 # Other imports
-from fontio3.fontdata import mapmeta
+from fontio3.fontdata import deferreddictmeta
 from fontio3.gvar import point_dict
     
 # -----------------------------------------------------------------------------
 
+#
+# Private functions
+#
+
+def _ddFactory(key, d):
+    return d['glyphFunc'](key)
+
+# -----------------------------------------------------------------------------
+
 #
 # Classes
 #
 
-class GlyphDict(dict, metaclass=mapmeta.FontDataMetaclass):
+if 0:
+    def __________________(): pass
+
+class GlyphDict(object, metaclass=deferreddictmeta.FontDataMetaclass):
     """
     These are dicts mapping glyph indices to PointDict objects. Conceptually
     they gather all the variation information for the whole 'glyf' table into
@@ -27,9 +39,27 @@ class GlyphDict(dict, metaclass=mapmeta.FontDataMetaclass):
     Note that this is an organizational helper class; there are no specific
     buildBinary() or fromwalker() methods here. Those tasks are handled by the
     Gvar object itself.
+    
+    When made by Gvar.fromwalker(), the PointDict for a glyph is only decoded
+    the first time it is used. The creationExtras then contain a glyphFunc,
+    which is called with a glyph index and returns the PointDict.
+    
+    >>> calls = []
+    >>> def f(glyphIndex):
+    ...     calls.append(glyphIndex)
+    ...     return point_dict.PointDict()
+    >>> ce = {'oneTimeKeyIterator': iter([3, 8]), 'glyphFunc': f}
+    >>> obj = GlyphDict(creationExtras=ce)
+    >>> sorted(obj), calls
+    ([3, 8], [])
+    >>> obj[8]
+    PointDict({})
+    >>> calls
+    [8]
     """
     
-    mapSpec = dict(
+    deferredDictSpec = dict(
+        item_createfunc = _ddFactory,
         item_followsprotocol = True,
         item_renumberdirectkeys = True,
         item_usenamerforstr = True)
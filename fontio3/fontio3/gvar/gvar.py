@@ -34,6 +34,90 @@ from fontio3.utilities import writer
 # Functions
 #
 
+def _makePointCountFunc(e):
+    """
+    Returns a function taking a glyph index and returning its point count (for
+    a composite glyph, its component count), not including the phantom points.
+    If the Editor still has the raw 'glyf' data, the counts are read directly
+    from the glyph headers, so no glyph objects need to be made.
+    """
+    
+    wGlyf = e.getRawWalker(b'glyf')
+    
+    if (wGlyf is None) or (not e.reallyHas(b'loca')):
+        glyfTable = e.glyf
+        
+        def func(glyphIndex):
+            glyphObj = glyfTable[glyphIndex]
+            
+            if glyphObj.isComposite:
+                return len(glyphObj.components)
+            
+            return glyphObj.pointCount()
+        
+        return func
+    
+    locaObj = e.loca
+    
+    def func(glyphIndex):
+        offset, byteLength = locaObj[glyphIndex]
+        
+        return _rawPointCount(
+          wGlyf.subWalker(offset, relative=True, newLimit=byteLength))
+    
+    return func
+
+def _rawPointCount(w):
+    """
+    Returns the number of points (or, for a composite glyph, the number of
+    components) in the raw glyph data in the specified walker.
+    
+    >>> _rawPointCount(walkerbit.StringWalker(b''))
+    0
+    >>> bs = utilities.fromhex("00 02 0000 0000 0000 0000 0003 0009")
+    >>> _rawPointCount(walkerbit.StringWalker(bs))
+    10
+    >>> bs = utilities.fromhex(
+    ...   "FFFF 0000 0000 0000 0000 "
+    ...   "0021 0005 0000 0000 "
+    ...   "0028 0006 0000 4000 "
+    ...   "0080 0007 0000 4000 0000 0000 4000")
+    >>> _rawPointCount(walkerbit.StringWalker(bs))
+    3
+    """
+    
+    if w.length() < 10:
+        return 0
+    
+    numContours = w.unpack("h")
+    
+    if numContours >= 0:
+        if not numContours:
+            return 0
+        
+        w.skip(8 + 2 * (numContours - 1))
+        return w.unpack("H") + 1
+    
+    w.skip(8)
+    count = 0
+    flags = 0x0020
+    
+    while flags & 0x0020:  # MORE_COMPONENTS
+        flags = w.unpack("H")
+        skip = (6 if flags & 0x0001 else 4)
+        
+        if flags & 0x0008:
+            skip += 2
+        elif flags & 0x0040:
+            skip += 4
+        elif flags & 0x0080:
+            skip += 8
+        
+        w.skip(skip)
+        count += 1
+    
+    return count
+
 def _pprint_axisOrder(p, obj, label, **kwArgs):
     if 'editor' not in kwArgs:
         p.simple(obj, label=label, **kwArgs)
@@ -125,10 +209,10 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
                 w.add("B", mask + len(subGroup) - 1)
                 w.addGroup(fmt, subGroup)
     
-    def _fillGlyph(self, w, glyphIndex, globalCoords, pointCount, **kwArgs):
+    def _fillGlyph(self, w, globalCoords, pointCount):
         """
         Given a walker whose base is the start of the header for a single
-        glyph, add the entry for self.glyphData[glyphIndex].
+        glyph, returns the PointDict for that glyph.
         """
         
         nTuples, dataOffset = w.unpack("2H")
@@ -143,7 +227,7 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
         else:
             sharedPoints = None
         
-        pd = self.glyphData[glyphIndex] = point_dict.PointDict()
+        pd = point_dict.PointDict()
         fw = axial_coordinates.AxialCoordinates.fromwalker
         
         while nTuples:
@@ -187,6 +271,8 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
                   effectiveDomain=effDomain)
             
             nTuples -= 1
+        
+        return pd
     
     def _fillGlyph_unpack(self, w, pointCount, prefilled):
         """
@@ -689,6 +775,40 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
         w.alignToByteMultiple(2)
         w.stakeCurrentWithValue(glyphStakes[-1])
     
+    def clearCaches(self):
+        """
+        Discards the compiled deltas cached in each PointDict made so far (see
+        PointDict.deltasForCoord_lists()). This is called by the Editor's
+        changed(b'gvar') method, and should be called directly after changing
+        the deltas in place of Gvar objects that are not in an Editor.
+        
+        >>> from fontio3.glyf import ttsimpleglyph
+        >>> glyphObj = ttsimpleglyph._testingValues[2]
+        >>> AC = axial_coordinates.AxialCoordinates
+        >>> peak = AC((1.0,), axisOrder=('wght',))
+        >>> pd = point_dict.PointDict({
+        ...   4: deltas_dict.DeltasDict({peak: deltas.Deltas(40, 10)})})
+        >>> ce = {'oneTimeKeyIterator': iter([3, 8]), 'glyphFunc': lambda g: pd}
+        >>> obj = Gvar(
+        ...   axisOrder = ('wght',),
+        ...   glyphData = glyph_dict.GlyphDict(creationExtras=ce))
+        >>> obj.glyphData[8].deltasForCoord_lists((1.0,), glyphObj)[0][4]
+        40.0
+        >>> pd[4][peak] = deltas.Deltas(-300, 0)
+        >>> obj.clearCaches()
+        >>> obj.glyphData[8].deltasForCoord_lists((1.0,), glyphObj)[0][4]
+        -300.0
+        >>> sorted(obj.glyphData.unmadeKeys())
+        [3]
+        """
+        
+        gd = self.glyphData
+        unmade = gd.unmadeKeys()
+        
+        for glyphIndex in gd:
+            if glyphIndex not in unmade:
+                gd[glyphIndex].clearCaches()
+    
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
         """
@@ -869,6 +989,11 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
     @classmethod
     def fromwalker(cls, w, **kwArgs):
         """
+        Creates and returns a Gvar object from the specified walker. Only the
+        header and global coordinates are read here; the variation data for
+        each glyph is decoded the first time that glyph's entry in glyphData
+        is used, and point counts come from the raw 'glyf' glyph headers. The
+        'editor' keyword argument is required.
         """
         
         e = kwArgs['editor']
@@ -903,22 +1028,24 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
             for t in enumerate(offsets):
                 print("  %d: 0x%08X" % t)
         
-        for glyphIndex, (off1, off2) in enumerate(utilities.pairwise(offsets)):
-            w.align(2)
-            
-            if off1 == off2:
-                continue
-            
-            glyphObj = e.glyf[glyphIndex]
-            
-            if glyphObj.isComposite:
-                pointCount = len(glyphObj.components)
-            else:
-                pointCount = glyphObj.pointCount()
+        pointCountFunc = _makePointCountFunc(e)
+        
+        def glyphFunc(glyphIndex):
+            wSub = w.subWalker(offsets[glyphIndex] + dataOff)
             
-            wSub = w.subWalker(off1 + dataOff)
-            r._fillGlyph(wSub, glyphIndex, globalCoords, pointCount, **kwArgs)
+            return r._fillGlyph(
+              wSub,
+              globalCoords,
+              pointCountFunc(glyphIndex))
+        
+        it = (
+          glyphIndex
+          for glyphIndex, (off1, off2) in enumerate(
+            utilities.pairwise(offsets))
+          if off1 != off2)
         
+        ce = dict(oneTimeKeyIterator=it, glyphFunc=glyphFunc)
+        r.glyphData = glyph_dict.GlyphDict(creationExtras=ce)
         return r
 
 # -----------------------------------------------------------------------------
@@ -930,6 +1057,9 @@ class Gvar(object, metaclass=simplemeta.FontDataMetaclass):
 if 0:
     def __________________(): pass
 
+if __debug__:
+    from fontio3.utilities import walkerbit
+
 def _test():
     import doctest
     doctest.testmod()
@@ -10,19 +10,81 @@ given glyph.
 """
 
 # System imports
+import bisect
 import collections
 
 # Other imports
 from fontio3.fontdata import mapmeta
 from fontio3.fontmath import interpolation
+from fontio3.fvar import regionscalars
 from fontio3.gvar import deltas
     
 # -----------------------------------------------------------------------------
 
+#
+# Private functions
+#
+
+def _interpolateContour(outline, basePoint, vx, vy, present):
+    """
+    Fills in the deltas in vx and vy for the points in one contour that are
+    not in the sorted list present, by interpolating or copying the deltas of
+    the nearest present points on either side, as described for untouched
+    points in the 'gvar' specification. The outline is a sequence of (x, y)
+    pairs for the points in the contour, which starts at basePoint.
+    
+    >>> vx, vy = [0, 10, 0, 0, 20], [0, 0, 0, 0, 6]
+    >>> outline = [(0, 0), (100, 0), (150, 0), (200, 0), (300, 100)]
+    >>> _interpolateContour(outline, 0, vx, vy, [1, 4])
+    >>> vx, vy
+    ([10, 10, 12.5, 15.0, 20], [0.0, 0, 0.0, 0.0, 6])
+    """
+    
+    for p in range(basePoint, basePoint + len(outline)):
+        i = bisect.bisect_left(present, p)
+        
+        if i < len(present) and present[i] == p:
+            continue
+        
+        pPrev0 = present[i - 1]
+        pNext0 = present[i % len(present)]
+        
+        for xy, v in ((0, vx), (1, vy)):
+            xyCoord = outline[p - basePoint][xy]
+            pPrev, pNext = pPrev0, pNext0
+            xyPrev = outline[pPrev - basePoint][xy]
+            xyNext = outline[pNext - basePoint][xy]
+            
+            if xyPrev > xyNext:
+                xyNext, xyPrev = xyPrev, xyNext
+                pNext, pPrev = pPrev, pNext
+            
+            if xyPrev <= xyCoord <= xyNext:
+                # it lies between; do interpolation
+                if xyNext == xyPrev:
+                    v[p] = (v[pPrev] + v[pNext]) / 2
+                
+                else:
+                    portion = (xyCoord - xyPrev) / (xyNext - xyPrev)
+                    v[p] = v[pPrev] + portion * (v[pNext] - v[pPrev])
+            
+            elif abs(xyPrev - xyCoord) < abs(xyNext - xyCoord):
+                # it lies outside; shift by xyPrev's shift
+                v[p] = v[pPrev]
+            
+            else:
+                # it lies outside; shift by xyNext's shift
+                v[p] = v[pNext]
+
+# -----------------------------------------------------------------------------
+
 #
 # Classes
 #
 
+if 0:
+    def __________________(): pass
+
 class PointDict(dict, metaclass=mapmeta.FontDataMetaclass):
     """
     Dicts mapping point indices to DeltasDict objects. These have all the
@@ -42,151 +104,198 @@ class PointDict(dict, metaclass=mapmeta.FontDataMetaclass):
     # Methods
     #
     
-    def deltasForCoord_composite(self, coord):
+    def clearCaches(self):
+        """
+        Discards the compiled deltas cached by deltasForCoord_lists(). These
+        are remade automatically if the glyph's outline changes, but not if
+        the deltas themselves are edited, so this needs to be called after
+        such edits. The Gvar clearCaches() method calls it for every glyph, as
+        does the Editor's changed(b'gvar') method.
+        
+        >>> from fontio3.glyf import ttsimpleglyph
+        >>> from fontio3.gvar import axial_coordinates, deltas_dict
+        >>> glyphObj = ttsimpleglyph._testingValues[2]
+        >>> AC = axial_coordinates.AxialCoordinates
+        >>> peak = AC((1.0,), axisOrder=('wght',))
+        >>> obj = PointDict({
+        ...   4: deltas_dict.DeltasDict({peak: deltas.Deltas(40, 10)})})
+        >>> vx, vy = obj.deltasForCoord_lists((1.0,), glyphObj)
+        >>> vx[4], vy[4]
+        (40.0, 10.0)
+        >>> obj[4][peak] = deltas.Deltas(-300, 0)
+        >>> obj.clearCaches()
+        >>> vx, vy = obj.deltasForCoord_lists((1.0,), glyphObj)
+        >>> vx[4], vy[4]
+        (-300.0, 0.0)
+        """
+        
+        self.__dict__.pop('_compiled', None)
+    
+    def deltasForCoord_composite(self, coord, **kwArgs):
         """
         Returns a dict mapping point indices to Deltas, with no actual
         interpolation (since the "points" in this case are actually indices
-        into the component array).
+        into the component array). The scalars keyword argument is passed to
+        DeltasDict.interpolateDelta().
         """
         
         r = {}
         
         for pointIndex, ddObj in self.items():
-            dlt = ddObj.interpolateDelta(coord)
+            dlt = ddObj.interpolateDelta(coord, **kwArgs)
             
             if dlt is not None:
                 r[pointIndex] = dlt
         
         return r
     
-    def deltasForCoord_simple(self, coord, glyphObj):
+    def _compiledTuples(self, glyphObj):
         """
+        Returns a list of (peak, edges, vx, vy) tuples, one for each tuple of
+        variations in self, where vx and vy are lists of the x and y deltas for
+        every point in glyphObj (including the 4 phantom points), with the
+        untouched points already interpolated. Since interpolation is linear,
+        these only need to be scaled and summed for any location.
+        
+        The list is cached in self until clearCaches() is called, and is also
+        remade if the glyph's outline changes.
         """
         
-        allPts = [p for c in glyphObj.contours for p in c]
-        r = {p: [0, 0] for p in range(len(allPts)+4)}
-        d = self.makeInvertDict()  # {coord: {pt: dlt, pt: dlt...}, ...}
+        outlines = tuple(
+          tuple((p.x, p.y) for p in c)
+          for c in glyphObj.contours)
+        
+        d = self.__dict__
+        
+        if '_compiled' in d and d['_compiled'][0] == outlines:
+            return d['_compiled'][1]
         
-        for keyCoord, keySubDict in d.items():
-            kDeltas = {}
+        pointCount = sum(len(c) for c in outlines) + 4
+        r = []
+        
+        for keyCoord, keySubDict in self.makeInvertDict().items():
+            # Only one intermediate region per tuple is possible in the
+            # binary, so as in Gvar.buildBinary() the first one found is used.
             
-            # This loop can go over all points at once
+            edges = None
             
-            for p, dlt in keySubDict.items():
-                factor = 1
-                ed = dlt.effectiveDomain
-                it = enumerate(zip(keyCoord, coord))
+            for p in sorted(keySubDict):
+                ed = keySubDict[p].effectiveDomain
                 
-                for i, (peakValue, coordValue) in it:
-                    if not factor:
-                        break
+                if ed is not None:
+                    edges = tuple(
+                      (min(a, b), max(a, b))
+                      for a, b in zip(ed.edge1, ed.edge2))
                     
-                    if ed is not None:
-                        ed1 = min(ed.edge1[i], ed.edge2[i])
-                        ed2 = max(ed.edge1[i], ed.edge2[i])
-                    
-                    if not peakValue:
-                        continue
-                
-                    if (
-                      (not coordValue) or 
-                      (coordValue < 0 and peakValue > 0) or 
-                      (coordValue > 0 and peakValue < 0) or
-                      ((ed is None) and (abs(coordValue) > abs(peakValue)))):
-                  
-                        factor = 0
-                
-                    elif ed is None:
-                        factor *= (coordValue / peakValue)
-                
-                    elif (coordValue < ed1) or (coordValue > ed2):
-                        factor = 0
-                
-                    elif coordValue < peakValue:
-                        if peakValue != ed1:
-                            factor *= (coordValue - ed1) / (peakValue - ed1)
-                
-                    elif ed2 != peakValue:
-                        factor *= (ed2 - coordValue) / (ed2 - peakValue)
-                
-                kDeltas[p] = [factor * dlt.x, factor * dlt.y]
+                    break
             
-            # Now need to interpolate for all keys missing from kDeltas
-            # Note we don't need to interpolate phantoms (single points)
-            #
-            # Note that unlike above, this loop needs to respect contours
+            vx = [0] * pointCount
+            vy = [0] * pointCount
             
-            hadActualDeltas = set(kDeltas)
-            walkPoint = 0
+            for p, dlt in keySubDict.items():
+                if p < pointCount:  # handle Zycon glyph 34 and similar cases
+                    vx[p] = dlt.x
+                    vy[p] = dlt.y
             
-            for c in glyphObj.contours:
-                pointsFull = set(range(walkPoint, walkPoint + len(c)))
-                basePoint = walkPoint
-                walkPoint += len(c)
-                pointsPresent = hadActualDeltas & pointsFull
-                
-                if not pointsPresent:
-                    continue
-                
-                pointsMissing = pointsFull - pointsPresent
-                sortedPresent = sorted(pointsPresent)
-                dPrevNext = {}
+            basePoint = 0
             
-                for p in pointsMissing:
-                    if p < sortedPresent[0]:
-                        pPrev = sortedPresent[-1]
-                    else:
-                        pPrev = max(q for q in pointsPresent if q < p)
+            for outline in outlines:
+                stop = basePoint + len(outline)
+                present = sorted(p for p in keySubDict if basePoint <= p < stop)
                 
-                    if p > sortedPresent[-1]:
-                        pNext = sortedPresent[0]
-                    else:
-                        pNext = min(q for q in pointsPresent if q > p)
+                if present and len(present) < len(outline):
+                    _interpolateContour(outline, basePoint, vx, vy, present)
                 
-                    dPrevNext[p] = (pPrev, pNext)
+                basePoint = stop
             
-                for p in pointsMissing:
-                    if p not in kDeltas:
-                        kDeltas[p] = [0, 0]
-                
-                    for xy in (0, 1):
-                        xyCoord = c[p-basePoint][xy]
-                        pPrev, pNext = dPrevNext[p]
-                        xyPrev = c[pPrev-basePoint][xy]
-                        xyNext = c[pNext-basePoint][xy]
-                    
-                        if xyPrev > xyNext:
-                            xyNext, xyPrev = xyPrev, xyNext
-                            pNext, pPrev = pPrev, pNext
-                    
-                        if xyPrev <= xyCoord <= xyNext:
-                            # it lies between; do interpolation
-                            if xyNext == xyPrev:
-                                kDeltas[p][xy] = (kDeltas[pPrev][xy] + kDeltas[pNext][xy]) / 2
-                            
-                            else:
-                                portion = (xyCoord - xyPrev) / (xyNext - xyPrev)
-                                totalDist = kDeltas[pNext][xy] - kDeltas[pPrev][xy]
-                                kDeltas[p][xy] = kDeltas[pPrev][xy] + portion * totalDist
-                    
-                        elif abs(xyPrev-xyCoord) < abs(xyNext-xyCoord):
-                            # it lies outside; shift by xyPrev's shift
-                            kDeltas[p][xy] = kDeltas[pPrev][xy]
-                    
-                        else:
-                            # it lies outside; shift by xyNext's shift
-                            kDeltas[p][xy] = kDeltas[pNext][xy]
+            r.append((tuple(keyCoord), edges, vx, vy))
+        
+        d['_compiled'] = (outlines, r)
+        return r
+    
+    def deltasForCoord_lists(self, coord, glyphObj, **kwArgs):
+        """
+        Returns a pair of lists with the total x and y deltas (unrounded) at
+        the specified location for every point in glyphObj, including the 4
+        phantom points, with untouched points interpolated. The scalar for
+        each tuple is computed once, and applied to deltas for the whole glyph
+        that are compiled on first use and cached.
+        
+        If the scalars keyword argument is a RegionScalars object for the
+        location, the scalars are looked up there instead of being computed.
+        
+        >>> from fontio3.glyf import ttsimpleglyph
+        >>> from fontio3.gvar import axial_coordinates, deltas_dict
+        >>> AC = axial_coordinates.AxialCoordinates
+        >>> glyphObj = ttsimpleglyph._testingValues[2]
+        >>> peak = AC((1.0,), axisOrder=('wght',))
+        >>> obj = PointDict({
+        ...   4: deltas_dict.DeltasDict({peak: deltas.Deltas(40, 10)})})
+        >>> vx, vy = obj.deltasForCoord_lists((0.25,), glyphObj)
+        >>> vx
+        [0.0, 0.0, 0.0, 0.0, 10.0, 10.0, 10.0, 10.0, 0.0, 0.0, 0.0, 0.0]
+        >>> vy
+        [0.0, 0.0, 0.0, 0.0, 2.5, 2.5, 2.5, 2.5, 0.0, 0.0, 0.0, 0.0]
+        
+        >>> from fontio3.fvar import regionscalars
+        >>> rs = regionscalars.RegionScalars({'wght': 0.25})
+        >>> coord = rs.coordinate(('wght',))
+        >>> obj.deltasForCoord_lists(coord, glyphObj, scalars=rs) == (vx, vy)
+        True
+        >>> len(rs)
+        1
+        """
+        
+        pointCount = sum(len(c) for c in glyphObj.contours) + 4
+        rx = [0] * pointCount
+        ry = [0] * pointCount
+        scalars = kwArgs.get('scalars', None)
+        
+        if scalars is None:
+            scalarFunc = regionscalars.tupleScalar
+        else:
+            scalarFunc = scalars.tupleScalar
+            coord = tuple(coord)
+        
+        for peak, edges, vx, vy in self._compiledTuples(glyphObj):
+            factor = scalarFunc(peak, edges, coord)
             
-            for p, dlt in kDeltas.items():
-                if p not in r:  # handle Zycon glyph 34 and similar cases
-                    continue
-                
-                r[p][0] += dlt[0]
-                r[p][1] += dlt[1]
+            if factor:
+                rx = [n + factor * dx for n, dx in zip(rx, vx)]
+                ry = [n + factor * dy for n, dy in zip(ry, vy)]
+        
+        return rx, ry
+    
+    def deltasForCoord_simple(self, coord, glyphObj, **kwArgs):
+        """
+        Returns a dict mapping every point index in glyphObj (including the 4
+        phantom points) to a Deltas object with the rounded total deltas at
+        the specified location, with untouched points interpolated. The
+        scalars keyword argument is used as in deltasForCoord_lists().
+        
+        >>> from fontio3.glyf import ttsimpleglyph
+        >>> from fontio3.gvar import axial_coordinates, deltas_dict
+        >>> AC = axial_coordinates.AxialCoordinates
+        >>> glyphObj = ttsimpleglyph._testingValues[2]
+        >>> [(p.x, p.y) for p in glyphObj.contours[0]]
+        [(620, 610), (620, 1090), (980, 1090), (980, 610)]
+        >>> peak = AC((1.0,), axisOrder=('wght',))
+        >>> obj = PointDict({
+        ...   1: deltas_dict.DeltasDict({peak: deltas.Deltas(40, 10)}),
+        ...   2: deltas_dict.DeltasDict({peak: deltas.Deltas(-20, 0)})})
+        >>> d = obj.deltasForCoord_simple((0.5,), glyphObj)
+        >>> len(d), [tuple(d[p]) for p in range(4)]
+        (12, [(20, 5), (20, 5), (-10, 0), (-10, 5)])
+        >>> set(d[p] for p in range(4, 12))
+        {Deltas(x=0, y=0)}
+        """
         
         D = deltas.Deltas
-        r = {p: D(int(round(v[0])), int(round(v[1]))) for p, v in r.items()}
-        return r
+        rx, ry = self.deltasForCoord_lists(coord, glyphObj, **kwArgs)
+        
+        return {
+          p: D(int(round(x)), int(round(y)))
+          for p, (x, y) in enumerate(zip(rx, ry))}
     
     def findCommonPoints(self):
         """
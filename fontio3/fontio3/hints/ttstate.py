@@ -140,6 +140,31 @@ class TrueTypeState(object):
     #
     
     def __deepcopy__(self, memo=None, **kwArgs):
+        """
+        Returns a deep copy of self. The following keyword arguments are
+        supported:
+        
+            copyOnWrite     If True, the keyData attributes are not copied
+                            now; each one is copied from self the first time
+                            it is used in the copy. Self must not be changed
+                            after such a copy is made. Default is False.
+            
+            excludeKeys     A set of attribute names that are not to be
+                            copied at all. Default is an empty set.
+        
+        >>> t1 = TrueTypeState()
+        >>> t1.cvt[3] = 5
+        >>> t2 = t1.__deepcopy__(copyOnWrite=True)
+        >>> 'cvt' in t2.__dict__
+        False
+        >>> t2.cvt[3] = 7
+        >>> t1.cvt, t2.cvt
+        ({3: 5}, {3: 7})
+        >>> t3 = t2.__deepcopy__()
+        >>> t3.cvt, 'storage' in t3.__dict__
+        ({3: 7}, False)
+        """
+        
         excludeKeys = set(kwArgs.get('excludeKeys', set()))
         r = type(self)(setAllAttrs=False)
         r._stamps = self._stamps.copy()  # NOT DEEP
@@ -149,12 +174,35 @@ class TrueTypeState(object):
         rd = r.__dict__
         kd = self.keyData
         
+        # Attributes of a copy-on-write copy that have not been used yet are
+        # still not present in its dict, so they stay lazy in copies of it.
+        
+        if kwArgs.get('copyOnWrite', False) and '_cowSource' not in d:
+            rd['_cowSource'] = self
+            excludeKeys.update(kd)
+        
         for k, obj in d.items():
             if k not in excludeKeys:
                 rd[k] = (kd[k][KEYDEEPCOPY](obj) if k in kd else obj)
         
         return r
     
+    def __getattr__(self, attr):
+        """
+        Copies a keyData attribute from the state a copy-on-write copy was
+        made from, the first time it is used.
+        """
+        
+        d = self.__dict__
+        
+        if attr in self.keyData and '_cowSource' in d:
+            source = d['_cowSource'].__dict__
+            r = d[attr] = self.keyData[attr][KEYDEEPCOPY](source[attr])
+            return r
+        
+        raise AttributeError(
+          "'%s' object has no attribute '%s'" % (type(self).__name__, attr))
+    
     def __eq__(self, other):
         """
         Returns True if the two TrueTypeState objects are equal. This method
@@ -182,15 +230,16 @@ class TrueTypeState(object):
             selfStamps = dSelf['_stamps']
             otherStamps = dOther['_stamps']
             
-            for k in dSelf:
-                if k[0] != '_':
-                    if selfStamps[k] != otherStamps[k]:
-                        # Only do actual comparison if stamps differ
-                        if dSelf[k] != dOther[k]:
-                            return False
+            for k in self.keyData:
+                if selfStamps[k] != otherStamps[k]:
+                    # Only do actual comparison if stamps differ
+                    if getattr(self, k) != getattr(other, k):
+                        return False
             
             return True
         
+        self._materializeAll()
+        other._materializeAll()
         return _filt(dSelf) == _filt(dOther)
     
 #     def __ne__(self, other):
@@ -200,6 +249,15 @@ class TrueTypeState(object):
     # Private methods
     #
     
+    def _materializeAll(self):
+        """
+        Makes sure all the attributes of a copy-on-write copy are present.
+        """
+        
+        if '_cowSource' in self.__dict__:
+            for k in self.keyData:
+                getattr(self, k)
+    
     def _editorCheck(self):
         """
         This method is called by any of the run-time public methods, and if an
@@ -234,7 +292,7 @@ class TrueTypeState(object):
         """
         
         d = self.__dict__
-        d[key].append(value)
+        getattr(self, key).append(value)
         d['_stamps'][key] = d['_stamper'].stamp()
     
     def assign(self, key, value):
@@ -244,7 +302,7 @@ class TrueTypeState(object):
         
         d = self.__dict__
         
-        if d[key] != value:
+        if getattr(self, key) != value:
             d[key] = value
             d['_stamps'][key] = d['_stamper'].stamp()
     
@@ -253,7 +311,7 @@ class TrueTypeState(object):
         Sets the specified value of self.key1.key2, adjusting stamps if needed.
         """
         
-        objDeep = self.__dict__[key1]
+        objDeep = getattr(self, key1)
         dDeep = objDeep.__dict__
         
         if dDeep[key2] != value:
@@ -292,8 +350,8 @@ class TrueTypeState(object):
                 if f is None:
                     continue
                 
-                valueSelf = dSelf[k]
-                valueOther = dOther[k]
+                valueSelf = getattr(self, k)
+                valueOther = getattr(other, k)
                 
                 if valueSelf is valueOther or valueSelf == valueOther:
                     continue
@@ -312,8 +370,8 @@ class TrueTypeState(object):
                 if f is None:
                     continue
                 
-                valueSelf = dSelf[k]
-                valueOther = dOther[k]
+                valueSelf = getattr(self, k)
+                valueOther = getattr(other, k)
                 
                 if valueSelf is valueOther or valueSelf == valueOther:
                     continue
@@ -438,11 +496,10 @@ class TrueTypeState(object):
         """
         
         p = pp.PP(**kwArgs)
-        d = self.__dict__
         kd = self.keyData
         
         for k in kwArgs.get('keys', self.pprintNormalKeys):
-            obj = d[k]
+            obj = getattr(self, k)
             
             if obj:
                 if k[0] == '_':
@@ -486,14 +543,12 @@ class TrueTypeState(object):
         """
         
         p = pp.PP(**kwArgs)
-        dSelf = self.__dict__
-        dPrior = prior.__dict__
         kd = self.keyData
         
         for k in kwArgs.get('keys', self.sortedKeys):
             if k[0] != '_':
-                selfValue = dSelf[k]
-                priorValue = dPrior[k]
+                selfValue = getattr(self, k)
+                priorValue = getattr(prior, k)
                 t = kd[k]
                 f, extras = t[KEYPPDIFF]
                 
@@ -519,7 +574,13 @@ class TrueTypeState(object):
         if not d.hintBytes:
             return ('', None)
         
-        runState = self._postPrepRun.__deepcopy__(excludeKeys=self._limitedCaseExcludedKeys)
+        # The per-glyph state only copies the post-prep values it actually
+        # uses; the rest are shared (see __deepcopy__).
+        
+        runState = self._postPrepRun.__deepcopy__(
+          copyOnWrite = True,
+          excludeKeys = self._limitedCaseExcludedKeys)
+        
         kd = self.keyData
         rd = runState.__dict__
         
@@ -10,16 +10,141 @@ Support for hint validation.
 
 # System imports
 import logging
+import multiprocessing
+import os
 
 # Other imports
 from fontio3.hints import ttstate
 
 # -----------------------------------------------------------------------------
 
+#
+# Private functions
+#
+
+if 0:
+    def __________________(): pass
+
+# This is set in the parent just before the worker pool is created, so that
+# forked workers inherit the post-prep TrueTypeState, the glyf table, and the
+# logger without any of them needing to be pickled.
+
+_workerContext = None
+
+def _shardRanges(count, shardCount):
+    """
+    Returns a list of (start, stop) pairs covering range(count) in order, with
+    at most shardCount contiguous pieces of roughly equal size.
+    
+    >>> _shardRanges(10, 3)
+    [(0, 4), (4, 7), (7, 10)]
+    >>> _shardRanges(2, 5)
+    [(0, 1), (1, 2)]
+    >>> _shardRanges(0, 4)
+    []
+    """
+    
+    shardCount = max(1, min(count, shardCount))
+    q, r = divmod(count, shardCount)
+    v = []
+    start = 0
+    
+    for i in range(shardCount):
+        stop = start + q + (1 if i < r else 0)
+        
+        if stop > start:
+            v.append((start, stop))
+        
+        start = stop
+    
+    return v
+
+def _validateGlyphs(s, g, glyphIndices, logger, extraInfo):
+    """
+    Runs the hints for each of the specified glyphs, given the TrueTypeState
+    s on which the pre-program has already been run. Returns True if any of
+    the glyphs failed validation.
+    """
+    
+    failed = False
+    
+    for i in glyphIndices:
+        if g[i] is None:
+            logger.error((
+              'V0551',
+              (i,),
+              "Unable to validate hints on glyph %d because it was "
+              "ill-formed and could not be created."))
+            
+            continue
+        
+        logger.debug(('Vxxxx', (i,), "Validating glyph %d"))
+        h, sSub = s.runGlyphSetup(i)
+        
+        if h:
+            sSub._validationFailed = False
+            h.run(sSub, logger=logger, extraInfo=extraInfo)
+            failed = failed or sSub._validationFailed
+    
+    return failed
+
+def _validateShard(glyphRange):
+    """
+    Worker-side function: validates the glyphs in the specified (start, stop)
+    range, capturing rather than emitting all log records. Returns a tuple
+    (failed, extraInfo, records), where records are the captured LogRecords
+    in the order they were logged.
+    """
+    
+    s, g, logger = _workerContext
+    handler = _RecordingHandler()
+    
+    # The fontio3 loggers are LoggerAdapters, so the handlers are swapped on
+    # the Logger they wrap.
+    
+    base = getattr(logger, 'logger', logger)
+    savedHandlers, savedPropagate = base.handlers, base.propagate
+    base.handlers = [handler]
+    base.propagate = False
+    extraInfo = {}
+    
+    try:
+        failed = _validateGlyphs(s, g, range(*glyphRange), logger, extraInfo)
+    
+    finally:
+        base.handlers = savedHandlers
+        base.propagate = savedPropagate
+    
+    return failed, extraInfo, handler.records
+
+# -----------------------------------------------------------------------------
+
 #
 # Classes
 #
 
+if 0:
+    def __________________(): pass
+
+class _RecordingHandler(logging.Handler):
+    """
+    Logging handler that just accumulates the records it is given, in a form
+    that can be sent back to a parent process.
+    """
+    
+    def __init__(self):
+        super(_RecordingHandler, self).__init__()
+        self.records = []
+    
+    def emit(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+              record.exc_info)
+            
+            record.exc_info = None
+        
+        self.records.append(record)
+
 class HintsValidator:
     """
     Class to support validating the hints in an entire Editor.
@@ -242,12 +367,76 @@ class HintsValidator:
         (True, True, True, False): _tcc_func_prep_cvt,
         (True, True, True, True): _tcc_allHints}
     
+    def _validateGlyphsInPool(self, s, processCount, logger, extraInfo):
+        """
+        Validates all the glyphs using a pool of processCount forked worker
+        processes, each of which handles contiguous ranges of glyphs. The log
+        records from the workers are replayed here in glyph order, so the
+        results are the same as for a serial run. Returns None if worker
+        processes cannot be forked on this platform.
+        """
+        
+        global _workerContext
+        
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            return None
+        
+        e = self.editor
+        shards = _shardRanges(e.maxp.numGlyphs, 4 * processCount)
+        _workerContext = (s, e.glyf, logger)
+        
+        try:
+            with context.Pool(processCount) as pool:
+                results = pool.map(_validateShard, shards, chunksize=1)
+        
+        finally:
+            _workerContext = None
+        
+        base = getattr(logger, 'logger', logger)
+        failed = False
+        
+        for shardFailed, shardExtraInfo, records in results:
+            failed = failed or shardFailed
+            extraInfo.update(shardExtraInfo)
+            
+            for record in records:
+                base.manager.getLogger(record.name).handle(record)
+        
+        return failed
+    
     #
     # Public methods
     #
     
     def validate(self, **kwArgs):
         """
+        Runs the pre-program and then the hints for every glyph, logging any
+        problems found. Returns True if the hints are valid. The following
+        keyword arguments are supported:
+        
+            logger          The logger to use. Default is the logger the
+                            HintsValidator was created with.
+            
+            processCount    Default is 1, meaning the glyphs are validated one
+                            after the other in this process. If greater than
+                            1, the glyphs are split into contiguous ranges that
+                            are validated in that many forked worker processes,
+                            each starting from the same post-pre-program
+                            state. The log records are replayed in glyph order,
+                            so the results match the serial case. If None, the
+                            number of CPUs is used.
+        
+        >>> logger = utilities.makeDoctestLogger("val", level="WARNING")
+        >>> v = HintsValidator(_makeTestEditor(), logger=logger)
+        val - WARNING - Font has glyph hints and a pre-program, but no CVT or function definitions.
+        >>> v.validate()
+        val.hints - CRITICAL - Stack underflow in Glyph 3 hints (PC 0).
+        False
+        >>> v.validate(processCount=2)
+        val.hints - CRITICAL - Stack underflow in Glyph 3 hints (PC 0).
+        False
         """
         
         e = self.editor
@@ -286,27 +475,30 @@ class HintsValidator:
         
         failed = s._validationFailed
         extraInfo = {}
+        processCount = kwArgs.get('processCount', 1)
+        
+        if processCount is None:
+            processCount = os.cpu_count() or 1
         
         if self.okToDoGlyphs:
-            g = e.glyf
+            glyphsFailed = None
             
-            for i in range(e.maxp.numGlyphs):
-                if g[i] is None:
-                    logger.error((
-                      'V0551',
-                      (i,),
-                      "Unable to validate hints on glyph %d because it was "
-                      "ill-formed and could not be created."))
-                    
-                    continue
-                
-                logger.debug(('Vxxxx', (i,), "Validating glyph %d"))
-                h, sSub = s.runGlyphSetup(i)
-                
-                if h:
-                    sSub._validationFailed = False
-                    h.run(sSub, logger=logger, extraInfo=extraInfo)
-                    failed = failed or sSub._validationFailed
+            if processCount > 1 and e.maxp.numGlyphs > 1:
+                glyphsFailed = self._validateGlyphsInPool(
+                  s,
+                  processCount,
+                  logger,
+                  extraInfo)
+            
+            if glyphsFailed is None:
+                glyphsFailed = _validateGlyphs(
+                  s,
+                  e.glyf,
+                  range(e.maxp.numGlyphs),
+                  logger,
+                  extraInfo)
+            
+            failed = failed or glyphsFailed
         
         if e.head.flags.opticalAdvanceViaHints:
             if extraInfo.get('phantomAdvanceHinted', False):
@@ -348,6 +540,38 @@ class HintsValidator:
 if 0:
     def __________________(): pass
 
+if __debug__:
+    from fontio3 import utilities
+    
+    def _makeTestEditor():
+        from fontio3 import fontedit, hmtx
+        from fontio3.glyf import ttcontour, ttcontours, ttpoint, ttsimpleglyph
+        
+        P = ttpoint.TTPoint
+        
+        box = ttsimpleglyph.TTSimpleGlyph(contours=ttcontours.TTContours([
+          ttcontour.TTContour([
+            P(200, 0),
+            P(200, 1000),
+            P(800, 1000),
+            P(800, 0)])]))
+        
+        e = fontedit.Editor.frommissingglyph(
+          box.recalculated(),
+          hmtx.MtxEntry(1000, 200),
+          unitsPerEm = 1000)
+        
+        # The prep and glyph 0 push a value and pop it again; glyph 3 pops
+        # from an empty stack.
+        
+        e.setRawTable(b'prep', b'\xB0\x01\x21')
+        g = e.glyf
+        g[0].hintBytes = b'\xB0\x01\x21'
+        g[3] = box.recalculated()
+        g[3].hintBytes = b'\x21'
+        e.changed(b'glyf')
+        return e
+
 def _test():
     import doctest
     doctest.testmod()
@@ -15,6 +15,8 @@ import logging
 import operator
 
 # Other imports
+from fontio3.GSUB import ligature_trie
+
 from fontio3.morx import (
   classtable,
   contextual,
@@ -608,55 +610,51 @@ def _analyze_insertion_simple_fixUpClasses(d, hasIgnores):
             
             row[cn] = E(noAdvance=True)
 
-def _analyze_ligature_addArray(zAll, firstGlyphs, nmbf):
+def _analyze_ligature_addArray(zAll, nmbf):
+    t = ligature_trie.LigatureTrie(
+      (tIn, (tOut, continueMatch))
+      for tIn, tOut, continueMatch in zAll)
+    
+    if t.count < len(zAll):
+        raise NotImplementedError()
+    
     d = {'Start of text': {}}
+    names = {(): 'Start of text'}
     
-    for firstGlyph in firstGlyphs:
-        z = [
-          (tIn, tOut, continueMatch)
-          for tIn, tOut, continueMatch in zAll
-          if tIn[0] == firstGlyph]
+    # Each trie node past the root is a state, named for the glyphs seen so
+    # far; a node ending a ligature becomes the transition into it instead.
+    
+    for tIn, node in t.walk():
+        g = tIn[-1]
+        prevState = names[tIn[:-1]]
         
-        glyphState = currState = "Saw_%s" % (nmbf(firstGlyph),)
-        d['Start of text'][firstGlyph] = (True, None, currState)
+        if len(tIn) == 1:
+            currState = names[tIn] = "Saw_%s" % (nmbf(g),)
+            d[prevState][g] = (True, None, currState)
+            continue
         
-        for tIn, tOut, continueMatch in z:
-            currState = glyphState
-            
-            for i, g in enumerate(tIn[1:], start=1):
-                isLast = i == (len(tIn) - 1)
-                
-                if currState not in d:
-                    d[currState] = {}
-                
-                nextState = "%s_%s" % (currState, nmbf(g))
-                
-                if g not in d[currState]:
-                    if i < (len(tIn) - 1):
-                        d[currState][g] = (
-                          True,
-                          None,
-                          nextState)
-                    
-                    else:
-                        nextState = continueMatch or 'Start of text'
-                        inGT = GTI(tIn)
-                        vWorkTemp = [None] * len(tIn)
-                        vWorkTemp[0] = tOut[0]
-                        outGT = GTO(vWorkTemp)
-                        
-                        d[currState][g] = (
-                          True,
-                          ((inGT,), (outGT,)),
-                          nextState)
-                
-                elif (not isLast) and (d[currState][g][1] is None):
-                    pass
-                
-                else:
-                    raise NotImplementedError()
-                
-                currState = nextState
+        currState = names[tIn] = "%s_%s" % (prevState, nmbf(g))
+        
+        if prevState not in d:
+            d[prevState] = {}
+        
+        if None not in node:
+            d[prevState][g] = (True, None, currState)
+            continue
+        
+        if len(node) > 1:
+            raise NotImplementedError()
+        
+        rank, tIn, (tOut, continueMatch) = node[None]
+        inGT = GTI(tIn)
+        vWorkTemp = [None] * len(tIn)
+        vWorkTemp[0] = tOut[0]
+        outGT = GTO(vWorkTemp)
+        
+        d[prevState][g] = (
+          True,
+          ((inGT,), (outGT,)),
+          continueMatch or 'Start of text')
     
     return d
 
@@ -1971,7 +1969,7 @@ def analyze_ligature(inTuples, outTuples, **kwArgs):
     # triples can be used as dict keys during processing.
     
     firstGlyphs = set(t[0][0] for t in zAll)
-    d = _analyze_ligature_addArray(zAll, firstGlyphs, nmbf)
+    d = _analyze_ligature_addArray(zAll, nmbf)
     
     # Now that the working version of the state array is filled out, we need to
     # add in all the cross-class transitions.
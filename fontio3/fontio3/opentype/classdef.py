@@ -159,10 +159,7 @@ class ClassDef(dict, metaclass=mapmeta.FontDataMetaclass):
         0
         """
         
-        if key in self:
-            return super(ClassDef, self).__getitem__(key)
-        
-        return 0
+        return self.get(key, 0)
     
     def __ne__(self, other): return not (self == other)
     
@@ -182,24 +179,13 @@ class ClassDef(dict, metaclass=mapmeta.FontDataMetaclass):
               10 | 000A 000B 0002 000F  000F 0002           |............    |
         """
         
-        if 'stakeValue' in kwArgs:
-            stakeValue = kwArgs.pop('stakeValue')
-            w.stakeCurrentWithValue(stakeValue)
-        else:
-            stakeValue = w.stakeCurrent()
+        # The data is gathered separately, so that identical ClassDefs can be
+        # written just once if the writer is sharing blocks.
+        
+        wLocal = writer.LinkedWriter()
         
         if self:
             v = sorted(self)
-            sv = []
-            
-            if len(v) == (v[-1] - v[0] + 1):
-                # ok to try format 1
-                w1 = writer.LinkedWriter()
-                w1.add("3H", 1, v[0], len(v))
-                w1.addGroup("H", [self[i] for i in v])
-                sv.append(w1.binaryString())
-            
-            w2 = writer.LinkedWriter()
             groups = []
             
             for start, stop, skip in utilities.monotonicGroupsGenerator(v):
@@ -216,14 +202,30 @@ class ClassDef(dict, metaclass=mapmeta.FontDataMetaclass):
                     
                     cumulCount += subCount
             
-            w2.add("HH", 2, len(groups))
-            w2.addGroup("3H", groups)
-            sv.append(w2.binaryString())
-            sv.sort(key=len)
-            w.addString(sv[0])  # shortest
+            # Format 1 is only possible for a dense range of glyphs, and takes
+            # 6 bytes plus 2 per glyph; format 2 takes 4 bytes plus 6 per group.
+            # Ties go to format 1.
+            
+            if (
+              (len(v) == (v[-1] - v[0] + 1)) and
+              (2 * len(v) + 2 <= 6 * len(groups))):
+                
+                wLocal.add("3H", 1, v[0], len(v))
+                wLocal.addGroup("H", [self[i] for i in v])
+            
+            else:
+                wLocal.add("HH", 2, len(groups))
+                wLocal.addGroup("3H", groups)
+        
+        else:
+            wLocal.add("HH", 2, 0)  # format 0, no ranges
+        
+        if 'stakeValue' in kwArgs:
+            w.addSharedString(kwArgs.pop('stakeValue'), wLocal.binaryString())
         
         else:
-            w.add("HH", 2, 0)  # format 0, no ranges
+            w.stakeCurrent()
+            w.addString(wLocal.binaryString())
     
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
@@ -0,0 +1,290 @@
+#
+# compiled_ivs.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for a compiled form of the LivingDeltas decoded from an item variation
+store, for fast evaluation at arbitrary locations.
+
+The HVAR, VVAR and MVAR tables map glyph indices or value tags to
+LivingDeltas, which are sets of (LivingRegion, delta) pairs. Interpolating
+one of these walks the set and works out each region's factor. A
+CompiledDeltas object instead numbers the distinct regions once, and turns
+each distinct LivingDeltas into a row of (region index, delta) pairs, so the
+value at a location is one dot product of that row with the vector of region
+scalars for the location. Both the vector and the row values are cached for
+each location, so evaluating a whole glyph array is mostly list lookups.
+"""
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# This is the number of locations for which a CompiledDeltas object keeps its
+# region-scalar vector and row values. When a new location is asked for and
+# this many are already kept, the oldest is discarded.
+
+keepLimit = 16
+
+# -----------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+if 0:
+    def __________________(): pass
+
+class CompiledDeltas(object):
+    """
+    Objects holding the compiled form of a dict mapping keys (glyph indices
+    or MVAR value tags) to LivingDeltas.
+    
+    A location, wherever one is used below, may be a dict mapping axis tags
+    to normalized coordinates, a LivingAxialCoordinate, or a RegionScalars
+    object (such as one returned by Editor.regionScalars(), which shares its
+    region scalars among all the tables evaluated at that location).
+    
+    >>> obj = CompiledDeltas(_makeTestDict())
+    >>> len(obj.regions), len(obj.rows)
+    (2, 2)
+    >>> obj.delta(1, {'wght': 0.5, 'wdth': 0.0})
+    -90.0
+    >>> obj.deltas([0, 1, 2, 3, 9], {'wght': 0.5, 'wdth': 0.5})
+    [30.0, -90.0, -90.0, 0, 0]
+    >>> LAC = living_variations.LivingAxialCoordinate
+    >>> obj.delta(0, LAC.fromdict({'wght': 0.5, 'wdth': 0.5}))
+    30.0
+    """
+    
+    #
+    # Methods
+    #
+    
+    def __init__(self, d):
+        regionIndices = {}
+        rowIndices = {}
+        self.regions = []
+        self.rows = []
+        self.rowOf = {}
+        self._locations = {}
+        
+        for key, ld in d.items():
+            if not ld:
+                continue
+            
+            r = rowIndices.get(ld, None)
+            
+            if r is None:
+                indices = []
+                deltas = []
+                
+                for region, delta in ld:
+                    if region not in regionIndices:
+                        regionIndices[region] = len(self.regions)
+                        self.regions.append(region)
+                    
+                    indices.append(regionIndices[region])
+                    deltas.append(delta)
+                
+                r = rowIndices[ld] = len(self.rows)
+                self.rows.append((tuple(indices), tuple(deltas)))
+            
+            self.rowOf[key] = r
+    
+    def __len__(self):
+        return len(self.rowOf)
+    
+    def _state(self, location):
+        """
+        Returns a pair (scalar vector, row values) for the location. The row
+        values are None until they are first asked for.
+        """
+        
+        isScalars = hasattr(location, 'regionScalar')
+        d = (location.location if isScalars else dict(location))
+        key = frozenset(d.items())
+        t = self._locations.get(key, None)
+        
+        if t is None:
+            if not isScalars:
+                from fontio3.fvar import regionscalars
+                
+                location = regionscalars.RegionScalars(d)
+            
+            if len(self._locations) >= keepLimit:
+                del self._locations[next(iter(self._locations))]
+            
+            t = self._locations[key] = (
+              [location.regionScalar(region) for region in self.regions],
+              [None] * len(self.rows))
+        
+        return t
+    
+    def delta(self, key, location):
+        """
+        Returns the interpolated delta for the specified key at the specified
+        location, or zero if the key has no deltas.
+        
+        >>> obj = CompiledDeltas(_makeTestDict())
+        >>> obj.delta(0, {'wght': 0.25, 'wdth': 1.0})
+        30.0
+        >>> obj.delta(2, {'wght': -0.25, 'wdth': 0.0})
+        0
+        >>> obj.delta(9, {'wght': 1.0, 'wdth': 0.0})
+        0
+        """
+        
+        r = self.rowOf.get(key, None)
+        
+        if r is None:
+            return 0
+        
+        vector, values = self._state(location)
+        v = values[r]
+        
+        if v is None:
+            indices, deltas = self.rows[r]
+            v = values[r] = sum(vector[i] * d for i, d in zip(indices, deltas))
+        
+        return v
+    
+    def deltas(self, keys, location):
+        """
+        Returns a list with the interpolated delta for each of the specified
+        keys (for instance, the glyphs in a glyph array) at the specified
+        location. Keys with no deltas get zero.
+        
+        >>> from fontio3.fvar import regionscalars
+        >>> rs = regionscalars.RegionScalars({'wght': 1.0, 'wdth': 0.0})
+        >>> obj = CompiledDeltas(_makeTestDict())
+        >>> obj.deltas([2, 2, 1, 0, -1], rs)
+        [-180, -180, -180, 40, 0]
+        >>> len(rs)
+        2
+        """
+        
+        vector, values = self._state(location)
+        rowOf = self.rowOf
+        rows = self.rows
+        r = []
+        
+        for key in keys:
+            i = rowOf.get(key, None)
+            
+            if i is None:
+                r.append(0)
+                continue
+            
+            v = values[i]
+            
+            if v is None:
+                indices, deltas = rows[i]
+                
+                v = values[i] = sum(
+                  vector[j] * d
+                  for j, d in zip(indices, deltas))
+            
+            r.append(v)
+        
+        return r
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def clearCaches(obj):
+    """
+    Discards all the CompiledDeltas cached in the specified object.
+    
+    >>> t = _makeTestTable()
+    >>> c = compiledFor(t, 'advances')
+    >>> clearCaches(t)
+    >>> compiledFor(t, 'advances') is c
+    False
+    """
+    
+    obj.__dict__.pop('_compiledDeltas', None)
+
+def compiledFor(obj, attr):
+    """
+    Returns a CompiledDeltas object for the dict of LivingDeltas in the
+    specified attribute of obj (for instance, the advances of an HVAR). It is
+    made the first time it is needed and then cached in obj until
+    clearCaches() is called. Changes to the attribute are not noticed
+    otherwise, so after the deltas are edited or replaced the Editor's
+    changed() method must be called for the table (it calls the table's
+    clearCaches() method), or clearCaches() itself for a table not in an
+    Editor.
+    
+    >>> t = _makeTestTable()
+    >>> c = compiledFor(t, 'advances')
+    >>> compiledFor(t, 'advances') is c
+    True
+    >>> compiledFor(t, 'leftsidebearings') is c
+    False
+    >>> len(compiledFor(t, 'rightsidebearings'))
+    0
+    >>> t.advances[1] = t.advances[0]
+    >>> compiledFor(t, 'advances').delta(1, {'wght': 1.0, 'wdth': 0.0})
+    -180
+    >>> clearCaches(t)
+    >>> compiledFor(t, 'advances').delta(1, {'wght': 1.0, 'wdth': 0.0})
+    40
+    """
+    
+    cache = obj.__dict__.setdefault('_compiledDeltas', {})
+    c = cache.get(attr, None)
+    
+    if c is None:
+        c = cache[attr] = CompiledDeltas(getattr(obj, attr) or {})
+    
+    return c
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+if __debug__:
+    from fontio3.opentype import living_variations
+    
+    def _makeTestDict():
+        LD = living_variations.LivingDeltas
+        LDM = living_variations.LivingDeltasMember
+        LR = living_variations.LivingRegion
+        r1 = LR.fromdict({'wght': (0.0, 1.0, 1.0)})
+        r2 = LR.fromdict({'wdth': (0.0, 1.0, 1.0)})
+        
+        return {
+          0: LD({LDM((r1, 40)), LDM((r2, 20))}),
+          1: LD({LDM((r1, -180))}),
+          2: LD({LDM((r1, -180))}),
+          3: LD()}
+    
+    def _makeTestTable():
+        from fontio3.HVAR import HVAR, livingdeltas_dict
+        
+        return HVAR.HVAR(
+          advances = livingdeltas_dict.LivingDeltasDict(_makeTestDict()))
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
@@ -13,7 +13,7 @@ import logging
 import operator
 
 # Other imports
-from fontio3 import utilities
+from fontio3 import utilities, utilitiesbackend
 from fontio3.fontdata import mapmeta
 from fontio3.utilities import valassist, writer
 
@@ -23,6 +23,19 @@ from fontio3.utilities import valassist, writer
 # Private functions
 #
 
+def _useFormat1(sortedKeys):
+    """
+    Returns True if format 1 is no larger than format 2 for the specified
+    sorted glyphs. Format 1 takes two bytes per glyph, and format 2 takes six
+    bytes per run of consecutive glyphs, so only the runs need counting.
+    
+    >>> _useFormat1([4, 9, 20]), _useFormat1(list(range(4, 9)))
+    (True, False)
+    """
+    
+    runCount = sum(1 for t in utilities.monotonicGroupsGenerator(sortedKeys))
+    return len(sortedKeys) <= 3 * runCount
+
 def _validate(obj, **kwArgs):
     logger = kwArgs['logger']
     
@@ -161,12 +174,6 @@ class Coverage(dict, metaclass=mapmeta.FontDataMetaclass):
         ValueError: Coverage values must be a dense, monotonic set!
         """
         
-        if 'stakeValue' in kwArgs:
-            stakeValue = kwArgs.pop('stakeValue')
-            w.stakeCurrentWithValue(stakeValue)
-        else:
-            stakeValue = w.stakeCurrent()
-        
         if self:
             if kwArgs.get('forceCoverageSort', False):
                 # rather than test and potentially fail on write, just force
@@ -182,13 +189,22 @@ class Coverage(dict, metaclass=mapmeta.FontDataMetaclass):
                     raise ValueError(
                       "Coverage values must be a dense, monotonic set!")
             
-            fmt1 = self._makeFormat1(sortedKeys)
-            fmt2 = self._makeFormat2(sortedKeys)
-            s = (fmt1 if len(fmt1) <= len(fmt2) else fmt2)
-            w.addString(s)
+            if _useFormat1(sortedKeys):
+                s = self._makeFormat1(sortedKeys)
+            else:
+                s = self._makeFormat2(sortedKeys)
+        
+        else:
+            s = utilitiesbackend.utPack("HH", 1, 0)  # format 1, glyph count = 0
+        
+        # Coverages have no links of their own, so they can be shared
+        
+        if 'stakeValue' in kwArgs:
+            w.addSharedString(kwArgs.pop('stakeValue'), s)
         
         else:
-            w.add("HH", 1, 0)  # format 1, glyph count = 0
+            w.stakeCurrent()
+            w.addString(s)
     
     @classmethod
     def fromglyphset(cls, glyphSet, **kwArgs):
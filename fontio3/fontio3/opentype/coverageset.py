@@ -94,9 +94,15 @@ class CoverageSet(frozenset, metaclass=setmeta.FontDataMetaclass):
         
         if self:
             sortedGlyphs = sorted(self)
-            fmt1 = self._makeFormat1(sortedGlyphs)
-            fmt2 = self._makeFormat2(sortedGlyphs)
-            w.addString(fmt1 if len(fmt1) <= len(fmt2) else fmt2)
+            it = utilities.monotonicGroupsGenerator(sortedGlyphs)
+            runCount = sum(1 for t in it)
+            
+            # Format 1 takes 2 bytes per glyph, format 2 takes 6 per run
+            
+            if len(sortedGlyphs) <= 3 * runCount:
+                w.addString(self._makeFormat1(sortedGlyphs))
+            else:
+                w.addString(self._makeFormat2(sortedGlyphs))
         
         else:
             w.add("HH", 1, 0)  # format 1, no glyphs
@@ -13,6 +13,7 @@ import functools
 import logging
 
 # Other imports
+from fontio3 import utilitiesbackend
 from fontio3.fontdata import mapmeta
 from fontio3.utilities import valassist
 
@@ -229,25 +230,32 @@ class Device(dict, metaclass=mapmeta.FontDataMetaclass):
                0 | 0008 0019 8000                           |......          |
         """
         
-        if 'stakeValue' in kwArgs:
-            stakeValue = kwArgs.pop('stakeValue')
-            w.stakeCurrentWithValue(stakeValue)
-        else:
-            stakeValue = w.stakeCurrent()
+        pack = utilitiesbackend.utPack
         
         if self.isVariable:
             # write format 0x8000; self[0] is outer, self[1] is inner
-            w.add("HHH", self[0], self[1], 0x8000)
+            s = pack("HHH", self[0], self[1], 0x8000)
 
         else:
             # use conventional/non-variable scheme as before
             keys = sorted(self)
-            w.add("HH", keys[0], keys[-1])
             v = [self.get(key, 0) for key in range(keys[0], keys[-1] + 1)]
             packed, chunkSize = _packDevice(v)
-            w.add("H", (chunkSize // 4) + 1) # cheapo log(2), OK for limited domain
-            fmt = "%dH" % (len(packed),)
-            w.add(fmt, *packed)
+            
+            # (chunkSize // 4) + 1 is a cheapo log(2), OK for limited domain
+            s = (
+              pack("HH", keys[0], keys[-1]) +
+              pack("H", (chunkSize // 4) + 1) +
+              pack("%dH" % (len(packed),), *packed))
+        
+        # Many Values use the same few Devices, so let the writer share them
+        
+        if 'stakeValue' in kwArgs:
+            w.addSharedString(kwArgs.pop('stakeValue'), s)
+        
+        else:
+            w.stakeCurrent()
+            w.addString(s)
     
     @classmethod
     def fromvalidatedwalker(cls, w, **kwArgs):
@@ -712,6 +712,8 @@ class LivingDeltas(frozenset, metaclass=setmeta.FontDataMetaclass):
     def interpolate(self, coordLAC, **kwArgs):
         """
         Given a specified LivingAxialCoordinate return the interpolated delta.
+        A RegionScalars object may be used instead of the coordLAC, so the
+        factor for each region is only computed once at that location.
         
         >>> d1 = {'wght': (-1.0, -0.5, 0), 'wdth': (0, 0.25, 0.75)}
         >>> obj1 = LivingRegion.fromdict(d1)
@@ -813,6 +815,10 @@ class LivingRegion(frozenset, metaclass=setmeta.FontDataMetaclass):
         applies to self. This returned factor will be between zero and one,
         inclusive.
         
+        The coordLAC may also be a RegionScalars object (see the
+        fvar.regionscalars module), in which case the factor is only computed
+        the first time it is needed at that location.
+        
         >>> d = {'wght': (-0.75, -0.5, 0), 'wdth': (0, 0.25, 0.75)}
         >>> obj = LivingRegion.fromdict(d)
         >>> fd = LivingAxialCoordinate.fromdict
@@ -824,8 +830,16 @@ class LivingRegion(frozenset, metaclass=setmeta.FontDataMetaclass):
         0.25
         >>> obj.factorFromLAC(fd({'wght': -0.75, 'wdth': 0.25}))
         0.0
+        
+        >>> from fontio3.fvar import regionscalars
+        >>> rs = regionscalars.RegionScalars({'wght': -0.25, 'wdth': 0.5})
+        >>> obj.factorFromLAC(rs), len(rs)
+        (0.25, 1)
         """
         
+        if hasattr(coordLAC, 'regionScalar'):
+            return coordLAC.regionScalar(self)
+        
         dC = dict(coordLAC)
         dS = dict(self)
         r = 1
@@ -9,10 +9,12 @@ Definition of single LookupTables, whether for GPOS or GSUB tables.
 """
 
 # System imports
+import functools
 import logging
 
 # Other imports
 from fontio3.fontdata import seqmeta
+from fontio3.GDEF import ignorables
 from fontio3.opentype import lookupflag, runningglyphs
 from fontio3.utilities import valassist
 
@@ -106,6 +108,100 @@ def _validate(obj, **kwArgs):
 # Classes
 #
 
+if 0:
+    def __________________(): pass
+
+class _PassIgnorables(object):
+    """
+    Objects of this class are used as the igsFunc for a single Lookup.run()
+    pass. They hold the ignorable and mark flags for the pass's current
+    GlyphList, so the subtables' repeated igsFunc calls on that list cost
+    nothing, and when a substitution replaces the list only the glyphs in the
+    affected span are reclassified.
+    
+    >>> f = lambda v: ([g == -1 for g in v], [g == -1 or g >= 100 for g in v])
+    >>> ga = runningglyphs.GlyphList.fromiterable([5, -1, 120, 7])
+    >>> pi = _PassIgnorables(ga, f)
+    >>> marks = []
+    >>> pi(ga, wantMarks=marks)
+    [False, True, False, False]
+    >>> marks
+    [False, True, True, False]
+    
+    Replacing glyphs 1 through 2 by three new glyphs only reclassifies those:
+    
+    >>> G = runningglyphs.Glyph
+    >>> ga2 = ga[:1] + [G(-1), G(150), G(8)] + ga[3:]
+    >>> pi.replace(ga2, 1, 3)
+    >>> pi(ga2, wantMarks=marks)
+    [False, True, False, False, False]
+    >>> marks
+    [False, True, True, False, False]
+    
+    Lists other than the pass's current one are classified from scratch:
+    
+    >>> pi([-1, 200])
+    [True, False]
+    """
+    
+    #
+    # Methods
+    #
+    
+    def __init__(self, glyphList, classifyFunc):
+        """
+        Initializes the object for the specified GlyphList. The classifyFunc
+        is called with a sequence of glyphs and returns a pair of lists: the
+        ignorable flags and the mark flags.
+        """
+        
+        self.classifyFunc = classifyFunc
+        self.glyphList = glyphList
+        self.igs, self.marks = classifyFunc(glyphList)
+    
+    def __call__(self, glyphArray, **kwArgs):
+        """
+        Returns the ignorables list for glyphArray, in the same form as the
+        Lookup.findIgnorables() method, including support for wantMarks.
+        """
+        
+        wantMarks = kwArgs.get('wantMarks', None)
+        
+        if glyphArray is self.glyphList:
+            if wantMarks is not None:
+                wantMarks[:] = self.marks
+            
+            return self.igs
+        
+        igs, marks = self.classifyFunc(glyphArray)
+        
+        if wantMarks is not None:
+            wantMarks[:] = marks
+        
+        return igs
+    
+    def replace(self, newList, startIndex, count):
+        """
+        Makes newList the pass's current GlyphList. It is the result of a
+        substitution at startIndex that produced count glyphs; everything
+        before startIndex and after the replaced span is unchanged, so only
+        the count new glyphs are classified.
+        """
+        
+        delta = len(newList) - len(self.glyphList)
+        stop = startIndex + count
+        
+        if (stop > len(newList)) or (count < delta):
+            self.__init__(newList, self.classifyFunc)
+            return
+        
+        igs, marks = self.classifyFunc(newList[startIndex:stop])
+        self.igs[startIndex:stop-delta] = igs
+        self.marks[startIndex:stop-delta] = marks
+        self.glyphList = newList
+
+# -----------------------------------------------------------------------------
+
 if 0:
     def __________________(): pass
 
@@ -511,6 +607,98 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
         doGPOSPiece(d)
         doGSUBPiece(d)
     
+    def _makeClassifier(self, **kwArgs):
+        """
+        Returns a function taking a sequence of glyphs and returning a pair of
+        lists: whether each glyph is ignorable, and whether each glyph is a
+        mark, based on this Lookup's flags and the GDEF table in the 'editor'
+        kwArg (if any). The GDEF table caches a mask for each distinct set of
+        flags, so this is cheap to call for every pass.
+        
+        >>> f = _testingValues[0]._makeClassifier()
+        >>> f([-1, 12])
+        ([True, False], [True, False])
+        """
+        
+        e = kwArgs.get('editor', None)
+        
+        if (
+          (e is None) or
+          (not e.reallyHas('GDEF')) or
+          (e.GDEF.glyphClasses is None)):
+            
+            def func(glyphArray):
+                v = [g == -1 for g in glyphArray]
+                return v, list(v)
+            
+            return func
+        
+        mask = e.GDEF.ignorableMask(self.flags, self.markFilteringSet)
+        return functools.partial(ignorables.classify, mask)
+    
+    def _runOne_GPOS(self, ga, startIndex, igs, fgi, r, **kwArgs):
+        """
+        Does the work of runOne_GPOS() once the GlyphList, ignorables, first
+        glyph index and cumulative effects are in hand. The kwArgs must include
+        igsFunc.
+        """
+        
+        if igs[startIndex]:
+            return (r, 0)
+        
+        d, default = fgi
+        
+        for subtable in d.get(ga[startIndex], default):
+            rNew, count = subtable.runOne(
+              ga,
+              startIndex,
+              cumulEffects = r,
+              **kwArgs)
+            
+            if not count:
+                assert rNew is None
+                continue
+            
+            # Something happened, so we're done, by the OpenType rule that
+            # states processing for a given glyph stops in a Lookup after the
+            # first subtable that actually matches (even if no actual changes
+            # are made to the glyph array).
+            
+            return (rNew, count)
+        
+        return (r, 0)
+    
+    def _runOne_GSUB(self, ga, startIndex, igs, fgi, **kwArgs):
+        """
+        Does the work of runOne_GSUB() once the GlyphList, ignorables and first
+        glyph index are in hand. The kwArgs must include igsFunc. If nothing
+        happens, the count returned will be zero and the returned list should
+        be ignored.
+        """
+        
+        if igs[startIndex]:
+            return (ga, 0)
+        
+        d, default = fgi
+        
+        for subtable in d.get(ga[startIndex], default):
+            rNew, count = subtable.runOne(
+              ga,
+              startIndex,
+              **kwArgs)
+            
+            if not count:
+                continue
+            
+            # Something happened, so we're done, by the OpenType rule that
+            # states processing for a given glyph stops in a Lookup after the
+            # first subtable that actually matches (even if no actual changes
+            # are made to the glyph array).
+            
+            return (rNew, count)
+        
+        return (ga, 0)
+    
     def buildBinary(self, w, **kwArgs):
         """
         Adds the binary data to the specified LinkedWriter. The following
@@ -642,6 +830,48 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
             for i, obj, stake in sorted(extPool.values()):
                 obj.buildBinary(w, stakeValue=stake, **kwArgs)
     
+    def clearCaches(self, **kwArgs):
+        """
+        Discards the firstGlyphIndex() index kept with this Lookup, along with
+        any caches kept by its subtables and by the Lookups its contextual
+        subtables refer to. This needs to be called after any of the subtables
+        is edited in place; the Editor's changed() method does this for every
+        Lookup in the GSUB or GPOS.
+        
+        If a memo keyword is provided it should be a set of the id() values of
+        Lookups already cleared; these are skipped, and this Lookup's id() is
+        added to it.
+        
+        >>> from fontio3.GSUB import single
+        >>> st = single.Single({5: 50, 6: 60})
+        >>> obj = Lookup([st])
+        >>> obj.run([5, 7]).asSimpleTuple()
+        (50, 7)
+        >>> del st[6]
+        >>> st[7] = 70
+        >>> obj.clearCaches()
+        >>> obj.run([5, 7]).asSimpleTuple()
+        (50, 70)
+        """
+        
+        memo = kwArgs.get('memo', set())
+        
+        if id(self) in memo:
+            return
+        
+        memo.add(id(self))
+        self.__dict__.pop('_firstGlyphIndex', None)
+        
+        for obj in self:
+            f = getattr(obj, 'clearCaches', None)
+            
+            if f is not None:
+                f()
+            
+            if _fwtype(getattr(obj, 'kind', None)) in {'context', 'chained'}:
+                for lk in obj.gatheredRefs().values():
+                    lk.clearCaches(memo=memo)
+    
     def findIgnorables(self, glyphArray, **kwArgs):
         """
         Given an array of glyph indices, return a list of True or False values
@@ -658,58 +888,64 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
         the corresponding glyph is a mark.
         """
         
-        r = [g == -1 for g in glyphArray]
+        igs, marks = self._makeClassifier(**kwArgs)(glyphArray)
         wantMarks = kwArgs.pop('wantMarks', [])
-        wantMarks[:] = r
-        
-        if 'editor' not in kwArgs:
-            return r
-        
-        e = kwArgs['editor']
-        
-        if not e.reallyHas('GDEF'):
-            return r
+        wantMarks[:] = marks
+        return igs
+    
+    def firstGlyphIndex(self, **kwArgs):
+        """
+        Returns a pair (d, default) used to find which subtables are worth
+        trying at a given start glyph. The dict d maps glyph indices to tuples
+        of subtables, and default is the tuple for glyphs not in d. The tuples
+        preserve subtable order, and a subtable whose firstGlyphs() method
+        returns None (or which has no such method) is in all of them.
+        
+        The index is built on first use and kept with the Lookup. It is rebuilt
+        automatically if a subtable is added, removed or replaced. A subtable
+        edited in place is not noticed, so after such edits call the Editor's
+        changed() method for the GSUB or GPOS (or this Lookup's clearCaches()
+        method), or pass forceRebuild=True.
+        
+        >>> d, default = _testingValues[5].firstGlyphIndex()
+        >>> sorted(d), default
+        ([4, 5, 11], ())
+        >>> [len(d[g]) for g in sorted(d)]
+        [1, 1, 1]
+        >>> _testingValues[5].firstGlyphIndex()[0] is d
+        True
+        """
         
-        gc = e.GDEF.glyphClasses
+        stamp = tuple(id(obj) for obj in self)
+        cached = self.__dict__.get('_firstGlyphIndex', None)
         
-        if gc is None:
-            return r
+        if (
+          (cached is not None) and
+          (cached[0] == stamp) and
+          (not kwArgs.get('forceRebuild', False))):
+            
+            return cached[1]
         
-        needToProcess = {1, 2, 3}
-        f = self.flags
-        mc = e.GDEF.markClasses or {}
+        always = set()
+        dWork = {}
         
-        for i, glyphIndex in enumerate(glyphArray):
-            if glyphIndex == -1:
-                continue
-            
-            thisClass = gc.get(glyphIndex, 0)
-            
-            if thisClass not in needToProcess:
-                continue
-            
-            if thisClass == 1:
-                if f.ignoreBaseGlyphs:
-                    r[i] = True
+        for i, obj in enumerate(self):
+            f = getattr(obj, 'firstGlyphs', None)
+            glyphs = (None if f is None else f())
             
-            elif thisClass == 2:
-                if f.ignoreLigatures:
-                    r[i] = True
+            if glyphs is None:
+                always.add(i)
             
             else:
-                wantMarks[i] = True
-                
-                if f.ignoreMarks:
-                    r[i] = True
-                
-                elif f.useMarkFilteringSet:
-                    if glyphIndex not in self.markFilteringSet:
-                        r[i] = True
-                
-                elif f.markAttachmentType:
-                    if f.markAttachmentType != mc.get(glyphIndex, 0):
-                        r[i] = True
+                for g in glyphs:
+                    dWork.setdefault(g, set()).add(i)
+        
+        d = {
+          g: tuple(self[i] for i in sorted(s | always))
+          for g, s in dWork.items()}
         
+        r = (d, tuple(self[i] for i in sorted(always)))
+        self.__dict__['_firstGlyphIndex'] = (stamp, r)
         return r
     
     @classmethod
@@ -1155,6 +1391,24 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
     
     def run(self, glyphArray, **kwArgs):
         """
+        Runs this Lookup over the entire glyphArray. For GSUB lookups the new
+        glyph array is returned (or glyphArray itself if nothing happened); for
+        GPOS lookups a list of Effect objects, one per glyph, is returned.
+        
+        The GlyphList and the ignorables are built once for the pass, and when
+        a substitution replaces the array only the glyphs it produced are
+        reclassified, so the cost of a pass grows linearly with the length of
+        glyphArray. If an igsFunc is provided in the kwArgs it is used as-is
+        instead.
+        
+        >>> obj = _testingValues[5]
+        >>> obj.run([4, 11, 29, 5, 9, 2]).asSimpleTuple()
+        (97, -1, -1, 32, -1, 2)
+        >>> obj.run([4, 11, 29, 5, 9, 2], useEmpties=False).asSimpleTuple()
+        (97, 32, 2)
+        >>> v = [1, 2, 3]
+        >>> obj.run(v) is v
+        True
         """
         
         whichTable, subKind = self[0].kind
@@ -1166,68 +1420,86 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
         else:
             isRLCase = False
         
+        ga = runningglyphs.GlyphList.fromiterable(glyphArray)
+        fgi = self.firstGlyphIndex()
+        
+        if 'igsFunc' in kwArgs:
+            tracker = None
+            igsFunc = kwArgs['igsFunc']
+        
+        else:
+            tracker = _PassIgnorables(ga, self._makeClassifier(**kwArgs))
+            igsFunc = kwArgs['igsFunc'] = tracker
+        
         if whichTable == 'GSUB':
-            r = glyphArray
+            changed = False
             
             if (subKind == 8) and self.flags.rightToLeft:
-                startIndex = len(r) - 1
-                
-                while startIndex >= 0:
-                    r, count = self.runOne_GSUB(r, startIndex, **kwArgs)
-                    startIndex -= (count or 1)
-            
+                startIndex = len(ga) - 1
+                step = -1
             else:
                 startIndex = 0
+                step = 1
+            
+            while 0 <= startIndex < len(ga):  # note len(ga) might change!
+                rNew, count = self._runOne_GSUB(
+                  ga,
+                  startIndex,
+                  igsFunc(ga, **kwArgs),
+                  fgi,
+                  **kwArgs)
+                
+                if count:
+                    if tracker is not None:
+                        tracker.replace(rNew, startIndex, count)
+                    
+                    ga = rNew
+                    changed = True
                 
-                while startIndex < len(r):  # note len(r) might change!
-                    r, count = self.runOne_GSUB(r, startIndex, **kwArgs)
-                    startIndex += (count or 1)
+                startIndex += step * (count or 1)
+            
+            return (ga if changed else glyphArray)
+        
+        # GPOS
         
-        else:  # GPOS
-            if 'cumulEffects' in kwArgs:
-                r = kwArgs.pop('cumulEffects')
+        if 'cumulEffects' in kwArgs:
+            r = kwArgs.pop('cumulEffects')
+        
+        else:
+            from fontio3.GPOS.effect import Effect
             
-            else:
-                from fontio3.GPOS.effect import Effect
-                
-                r = [Effect() for g in glyphArray]
-            
-            if (subKind == 3) and self.flags.rightToLeft:
-                startIndex = len(glyphArray) - 1
-            
-                while startIndex >= 0:
-                    rNew, count = self.runOne_GPOS(
-                      glyphArray,
-                      startIndex,
-                      cumulEffects = r,
-                      isRLCase = isRLCase,
-                      **kwArgs)
-                
-                    if rNew is not None:
-                        r = rNew
-                
-                    startIndex -= (count or 1)
+            r = [Effect() for g in glyphArray]
+        
+        if (subKind == 3) and self.flags.rightToLeft:
+            startIndex = len(ga) - 1
+            step = -1
+        else:
+            startIndex = 0
+            step = 1
+        
+        while 0 <= startIndex < len(ga):
+            rNew, count = self._runOne_GPOS(
+              ga,
+              startIndex,
+              igsFunc(ga, **kwArgs),
+              fgi,
+              r,
+              isRLCase = isRLCase,
+              **kwArgs)
             
-            else:
-                startIndex = 0
+            if rNew is not None:
+                r = rNew
             
-                while startIndex < len(glyphArray):
-                    rNew, count = self.runOne_GPOS(
-                      glyphArray,
-                      startIndex,
-                      cumulEffects = r,
-                      isRLCase = isRLCase,
-                      **kwArgs)
-                
-                    if rNew is not None:
-                        r = rNew
-                
-                    startIndex += (count or 1)
+            startIndex += step * (count or 1)
         
         return r
     
     def runOne_GPOS(self, glyphArray, startIndex, **kwArgs):
         """
+        Do the processing of this Lookup for a single index within the given
+        glyph array. This method may be called by the actions within
+        contextual or related subtables; the run() method uses a shared
+        GlyphList and ignorables for its whole pass instead.
         """
         
         from fontio3.GPOS.effect import Effect
@@ -1245,34 +1517,17 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
         # While inefficient, this has to be done here, because effects in GSUB
         # contextual or chaining subtables might redo the glyph array.
         
-        if kwArgs['igsFunc'](glyphArray, **kwArgs)[startIndex]:
-            return (r, 0)
-        
-        for subtable in self:
-            rNew, count = subtable.runOne(
-              ga,
-              startIndex,
-              cumulEffects = r,
-              **kwArgs)
-            
-            if not count:
-                assert rNew is None
-                continue
-            
-            # Something happened, so we're done, by the OpenType rule that
-            # states processing for a given glyph stops in a Lookup after the
-            # first subtable that actually matches (even if no actual changes
-            # are made to the glyph array).
-            
-            return (rNew, count)
-        
-        return (r, 0)
+        igs = kwArgs['igsFunc'](glyphArray, **kwArgs)
+        fgi = self.firstGlyphIndex()
+        return self._runOne_GPOS(ga, startIndex, igs, fgi, r, **kwArgs)
     
     def runOne_GSUB(self, glyphArray, startIndex, **kwArgs):
         """
         Do the processing of this Lookup for a single index within the given
-        glyph array. This method is called by the Lookup's run() method, and in
-        turn calls the runOne methods for the subtables.
+        glyph array. This method is called by actions within contextual or
+        related subtables, and in turn calls the runOne methods for the
+        subtables. The run() method does the same work for a whole pass
+        without rebuilding the GlyphList and ignorables at every index.
         """
         
         r = runningglyphs.GlyphList.fromiterable(glyphArray)  # preserves offsets
@@ -1280,27 +1535,11 @@ class Lookup(tuple, metaclass=seqmeta.FontDataMetaclass):
         if 'igsFunc' not in kwArgs:
             kwArgs['igsFunc'] = self.findIgnorables
         
-        if kwArgs['igsFunc'](glyphArray, **kwArgs)[startIndex]:
-            return (glyphArray, 0)
-        
-        for i, subtable in enumerate(self):
-            rNew, count = subtable.runOne(
-              r,
-              startIndex,
-              **kwArgs)
-            
-            if not count:
-                continue
-            
-            # Something happened, so we're done, by the OpenType rule that
-            # states processing for a given glyph stops in a Lookup after the
-            # first subtable that actually matches (even if no actual changes
-            # are made to the glyph array).
-            
-            return (rNew, count)
-        
-        return (glyphArray, 0)
-    
+        igs = kwArgs['igsFunc'](glyphArray, **kwArgs)
+        fgi = self.firstGlyphIndex()
+        rNew, count = self._runOne_GSUB(r, startIndex, igs, fgi, **kwArgs)
+        return ((rNew, count) if count else (glyphArray, 0))
+
     def writeFontWorkerSource(self, s, **kwArgs):
         """
         Write the lookup tag entry, sequence, and type to stream 's' in
@@ -18,6 +18,19 @@ from fontio3.opentype import lookup
 
 # -----------------------------------------------------------------------------
 
+#
+# Constants
+#
+
+# When identical blocks are shared across the subtables in an extension pool,
+# the held blocks are written out whenever the subtables added since the last
+# such flush, plus the held blocks, exceed this many bytes. This leaves plenty
+# of room for the next subtable before any 16-bit offset could overflow.
+
+sharedSpanLimit = 0x4000
+
+# -----------------------------------------------------------------------------
+
 #
 # Classes
 #
@@ -135,10 +148,11 @@ class LookupList(list, metaclass=seqmeta.FontDataMetaclass):
     # Methods
     #
     
-    def _forceAllExtensions(self):
+    def _forceAllExtensions(self, indices=None):
         """
         Creates and returns a new LookupList whose elements are Extension
-        objects of the originals.
+        objects of the originals. If indices is specified, only the Lookups at
+        those indices are changed.
         """
         
         v = [None] * len(self)
@@ -147,7 +161,10 @@ class LookupList(list, metaclass=seqmeta.FontDataMetaclass):
             if len(lkup):
                 k = lkup[0].kind
                 
-                if k == ('GPOS', 9) or k == ('GSUB', 7):
+                if indices is not None and i not in indices:
+                    v[i] = lkup
+                
+                elif k == ('GPOS', 9) or k == ('GSUB', 7):
                     v[i] = lkup
                 
                 elif k[0] == 'GPOS':
@@ -210,9 +227,126 @@ class LookupList(list, metaclass=seqmeta.FontDataMetaclass):
         
         self[:] = list(rawList[t[1]] for t in sorted(v))
     
+    def _splitAllPairClasses(self):
+        """
+        Creates and returns a new LookupList in which each PairClasses subtable
+        has been replaced by the subtables from its splitForSize() method. A
+        subtable may only become PairGlyphs subtables if no later subtable in
+        the same Lookup handles any of its first glyphs, since shaping engines
+        go on to later subtables for a glyph a PairGlyphs subtable covers but
+        does not pair, while a PairClasses subtable stops them.
+        
+        >>> obj = pairclasses_split._testingValues[0]
+        >>> ll = LookupList([lookup.Lookup([obj])])
+        >>> [type(obj).__name__ for obj in ll._splitAllPairClasses()[0]]
+        ['PairClasses', 'PairGlyphs']
+        >>> ll = _testingValues[1]
+        >>> ll._splitAllPairClasses()[0] is ll[0]
+        True
+        """
+        
+        from fontio3.GPOS import pairclasses
+        
+        PC = pairclasses.PairClasses
+        v = list(self)
+        
+        for i, lkup in enumerate(self):
+            if not any(isinstance(obj, PC) for obj in lkup):
+                continue
+            
+            later = [getattr(obj, 'firstGlyphs', None) for obj in lkup]
+            later = [(None if f is None else f()) for f in later]
+            v2 = []
+            
+            for j, obj in enumerate(lkup):
+                if not isinstance(obj, PC):
+                    v2.append(obj)
+                    continue
+                
+                covered = set(obj.classDef1) | set(obj.coverageExtras)
+                
+                allowFormat1 = not any(
+                  s is None or (covered & s)
+                  for s in later[j+1:])
+                
+                v2.extend(obj.splitForSize(allowFormat1=allowFormat1))
+            
+            v[i] = lookup.Lookup(
+              v2,
+              flags = lkup.flags,
+              markFilteringSet = lkup.markFilteringSet,
+              sequence = lkup.sequence)
+        
+        return type(self)(v)
+        
+    def _splitSubtables(self, splits):
+        """
+        Returns a pair: a new LookupList in which the subtables have been split
+        as specified by the splits dict (see the splitSubtables keyword
+        argument to buildBinary()), and a dict mapping the id() of each
+        subtable in the new LookupList (and of its original, for Extension
+        subtables) to a (lookupIndex, subtableIndex, pieceCount) triple for
+        the subtable it came from.
+        
+        >>> ll = LookupList([lookup._testingValues[4]])
+        >>> len(ll[0][0])
+        3
+        >>> ll2, origins = ll._splitSubtables({(0, 0): 2})
+        >>> [len(obj) for obj in ll2[0]]
+        [2, 1]
+        >>> sorted(origins.values())
+        [(0, 0, 2), (0, 0, 2)]
+        """
+        
+        from fontio3.opentype import overflow
+        
+        v = list(self)
+        origins = {}
+        
+        for i, lkup in enumerate(self):
+            v2 = []
+            
+            for j, obj in enumerate(lkup):
+                pieces = overflow.splitSubtable(obj, splits.get((i, j), 1))
+                t = (i, j, len(pieces))
+                
+                for piece in pieces:
+                    origins[id(piece)] = t
+                    
+                    if hasattr(piece, 'original'):
+                        origins[id(piece.original)] = t
+                
+                v2.extend(pieces)
+            
+            if len(v2) != len(lkup):
+                v[i] = lookup.Lookup(
+                  v2,
+                  flags = lkup.flags,
+                  markFilteringSet = lkup.markFilteringSet,
+                  sequence = lkup.sequence)
+        
+        return type(self)(v), origins
+    
     def buildBinary(self, w, **kwArgs):
         """
-        Adds the binary data to the specified LinkedWriter.
+        Adds the binary data to the specified LinkedWriter. The following
+        keyword arguments, normally provided by overflow.buildResolved(), are
+        used to change the layout so offsets do not overflow:
+        
+            extensionLookups    A set of indices of Lookups to be given
+                                Extension subtables, if forceExtensions is
+                                False.
+            
+            overflowRegions     A list to which (stake, lookupIndex,
+                                subtableIndex, pieceCount) tuples are added,
+                                for the start of each Lookup (with None as the
+                                subtableIndex) and each subtable added to the
+                                extensionPool. The pieceCount is the number of
+                                subtables made from the original one.
+            
+            splitSubtables      A dict mapping (lookupIndex, subtableIndex)
+                                pairs to the number of pieces into which those
+                                subtables should be split.
         
         >>> w = writer.LinkedWriter()
         >>> ep = {}
@@ -271,8 +405,19 @@ class LookupList(list, metaclass=seqmeta.FontDataMetaclass):
         else:
             stakeValue = w.stakeCurrent()
         
+        if kwArgs.get('splitPairClasses', False):
+            self = self._splitAllPairClasses()
+        
+        regions = kwArgs.get('overflowRegions', None)
+        
+        if regions is not None or kwArgs.get('splitSubtables'):
+            self, origins = self._splitSubtables(
+              kwArgs.get('splitSubtables', {}))
+        
         if kwArgs.get('forceExtensions', True):
             self = self._forceAllExtensions()
+        elif kwArgs.get('extensionLookups'):
+            self = self._forceAllExtensions(kwArgs['extensionLookups'])
         
         w.add("H", len(self))
         self._sort()
@@ -283,6 +428,15 @@ class LookupList(list, metaclass=seqmeta.FontDataMetaclass):
         
         for i, obj in enumerate(self):
             obj.buildBinary(w, stakeValue=objStakes[i], **kwArgs)
+        
+        if regions is not None:
+            regions.extend(
+              (stake, i, None, 1)
+              for i, stake in enumerate(objStakes))
+            
+            for i, obj, stake in kwArgs.get('extensionPool', {}).values():
+                if id(obj) in origins:
+                    regions.append((stake,) + origins[id(obj)])
     
     @classmethod
     def fromtoplevel(cls, gposOrGsub, **kwArgs):
@@ -428,6 +582,45 @@ class LookupList(list, metaclass=seqmeta.FontDataMetaclass):
 
 # -----------------------------------------------------------------------------
 
+#
+# Public functions
+#
+
+def buildExtensionPool(w, extPool, **kwArgs):
+    """
+    Adds the subtables in the specified extension pool (see the buildBinary()
+    method of Lookup) to the specified LinkedWriter, in pool order. Identical
+    Coverages, ClassDefs, Devices and Anchors in different subtables are only
+    written once, unless the shareBlocks keyword argument is False. The held
+    blocks are written out whenever the span reaches the sharedSpanLimit
+    keyword argument (default the module's sharedSpanLimit). All the keyword
+    arguments are passed through to the subtables.
+    
+    >>> def f(**kwArgs):
+    ...   w = writer.LinkedWriter()
+    ...   ep = {}
+    ...   _testingValues[1].buildBinary(w, extensionPool=ep)
+    ...   buildExtensionPool(w, ep, **kwArgs)
+    ...   return w.binaryString()
+    >>> len(f(shareBlocks=False)), len(f())
+    (292, 272)
+    >>> LookupList.frombytes(f(), forGPOS=True) == _testingValues[1]
+    True
+    """
+    
+    if kwArgs.get('shareBlocks', True):
+        w.startSharing()
+    
+    limit = kwArgs.get('sharedSpanLimit', sharedSpanLimit)
+    
+    for i, obj, stake in sorted(extPool.values()):
+        w.flushShared(ifSpanOver=limit)
+        obj.buildBinary(w, stakeValue=stake, **kwArgs)
+    
+    w.stopSharing()
+
+# -----------------------------------------------------------------------------
+
 #
 # Test code
 #
@@ -437,6 +630,7 @@ if 0:
 
 if __debug__:
     from fontio3 import utilities
+    from fontio3.GPOS import pairclasses_split
     from fontio3.utilities import namer, writer
     
     ltv = lookup._testingValues
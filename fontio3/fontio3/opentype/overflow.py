@@ -0,0 +1,319 @@
+#
+# overflow.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for automatically resolving 16-bit offset overflows when building GPOS
+and GSUB tables.
+
+The table is built into a separate LinkedWriter and resolved. If any offsets
+overflow, the layout is changed and the table is built again, until all the
+offsets fit. The changes are made in this order, as needed for each
+overflowing link:
+    
+    - If the link goes to a block shared among subtables, the shared blocks
+      are written closer to the subtables that use them, and finally not
+      shared at all.
+    
+    - If the link is within a Lookup that is not already an Extension, that
+      Lookup is promoted to using Extension subtables.
+    
+    - If the link is within a single subtable, that subtable is split into
+      more and more subtables, each handling a separate set of first glyphs.
+"""
+
+# System imports
+import bisect
+
+# Other imports
+from fontio3.opentype import lookuplist
+from fontio3.utilities import writer
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# This is the largest number of times a table will be rebuilt. All of the
+# overflows found are fixed at once on each pass, and subtables are split in
+# twice as many pieces each time, so this is far more than is ever needed.
+
+maxPassCount = 16
+
+# When shared blocks cause an overflow, the span limit between flushes of the
+# shared blocks is halved until it gets below this value. After that, blocks
+# are no longer shared at all.
+
+minSharedSpanLimit = 0x400
+
+# These are the kinds of subtables that can be split by first glyph. In each
+# of these, the glyph at the current position selects everything the subtable
+# can do there, so subtables handling separate first glyphs can be used in
+# any order.
+
+_firstGlyphKinds = frozenset([
+  ('GPOS', 1),
+  ('GPOS', 2),
+  ('GPOS', 3),
+  ('GSUB', 1),
+  ('GSUB', 2),
+  ('GSUB', 3),
+  ('GSUB', 4)])
+
+# -----------------------------------------------------------------------------
+
+#
+# Private functions
+#
+
+def _fixOverflows(w, e, regions, kwArgs):
+    """
+    Changes the keyword arguments in kwArgs to fix the overflows in the
+    OffsetOverflowError e, raised when resolving LinkedWriter w. The regions
+    are the (stake, lookupIndex, subtableIndex, pieceCount) tuples recorded
+    by LookupList.buildBinary(). Returns True if anything was changed.
+    """
+    
+    starts = sorted((w.stakes[t[0]],) + tuple(t[1:]) for t in regions)
+    startPieces = [t[0] for t in starts]
+    lookupStakes = {t[0]: t[1] for t in regions if t[2] is None}
+    sharedHit = False
+    toPromote = set()
+    toSplit = {}
+    
+    for tagFrom, tagTo in e.overflows:
+        if tagTo in w.sharedStakes:
+            sharedHit = True
+            continue
+        
+        # A link from the LookupList to a Lookup overflows because the
+        # Lookups before it are too big, so they are all made Extensions.
+        
+        if tagTo in lookupStakes:
+            toPromote.update(range(lookupStakes[tagTo]))
+            continue
+        
+        k = bisect.bisect_right(startPieces, w.stakes[tagFrom]) - 1
+        
+        if k < 0:
+            continue
+        
+        lookupIndex, subtableIndex, pieceCount = starts[k][1:]
+        
+        if subtableIndex is None:
+            toPromote.add(lookupIndex)
+        else:
+            toSplit[(lookupIndex, subtableIndex)] = pieceCount
+    
+    changed = False
+    
+    if sharedHit and kwArgs.get('shareBlocks', True):
+        limit = kwArgs['sharedSpanLimit'] // 2
+        
+        if limit >= minSharedSpanLimit:
+            kwArgs['sharedSpanLimit'] = limit
+        else:
+            kwArgs['shareBlocks'] = False
+        
+        changed = True
+    
+    if not kwArgs.get('forceExtensions', True):
+        extensionLookups = kwArgs['extensionLookups']
+        
+        if toPromote - extensionLookups:
+            extensionLookups.update(toPromote)
+            changed = True
+    
+    splits = kwArgs['splitSubtables']
+    
+    for key, pieceCount in toSplit.items():
+        # If the last split did not make as many pieces as were asked for,
+        # the subtable cannot be split any further.
+        
+        if pieceCount >= splits.get(key, 1):
+            splits[key] = 2 * pieceCount
+            changed = True
+    
+    return changed
+
+def _splitByFirstGlyph(obj, pieceCount):
+    """
+    Splits a dict-based subtable into at most pieceCount subtables with about
+    the same number of keys, each with a contiguous range of first glyphs.
+    """
+    
+    byFirst = {}
+    
+    for key in obj:
+        first = (key[0] if isinstance(key, tuple) else key)
+        byFirst.setdefault(first, []).append(key)
+    
+    n = min(pieceCount, len(byFirst))
+    
+    if n < 2:
+        return [obj]
+    
+    groups = [[] for i in range(n)]
+    keyCount = 0
+    
+    for first in sorted(byFirst):
+        groups[min(n - 1, keyCount * n // len(obj))].extend(byFirst[first])
+        keyCount += len(byFirst[first])
+    
+    attrs = {k: getattr(obj, k) for k in type(obj)._ATTRSPEC}
+    
+    return [
+      type(obj)({key: obj[key] for key in group}, **attrs)
+      for group in groups
+      if group]
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def buildResolved(buildFunc, **kwArgs):
+    """
+    Calls buildFunc with a new LinkedWriter and the specified keyword
+    arguments, plus resolveOverflows=False, and returns the resolved binary
+    string. The buildFunc is normally the buildBinary() method of a GPOS or
+    GSUB object. If any offsets overflow, the keyword arguments listed below
+    are changed to fix them and the table is built again. Any of them can be
+    given initially, as a starting point:
+        
+        extensionLookups    A set of indices of Lookups to be written with
+                            Extension subtables. This is only used if the
+                            forceExtensions keyword argument is False.
+        
+        shareBlocks         Default True. See buildExtensionPool() in the
+                            lookuplist module.
+        
+        sharedSpanLimit     Default lookuplist.sharedSpanLimit. The number of
+                            bytes of subtables and held shared blocks after
+                            which the shared blocks are written out.
+        
+        splitSubtables      A dict mapping (lookupIndex, subtableIndex) pairs
+                            to the number of pieces into which the subtable
+                            should be split. See splitSubtable().
+    
+    If the overflows cannot be fixed, the last OffsetOverflowError is raised.
+    
+    >>> from fontio3.GSUB import multiple, multiple_glyphtuple
+    >>> from fontio3.opentype import lookup
+    >>> T = multiple_glyphtuple.Multiple_GlyphTuple
+    >>> obj = multiple.Multiple(
+    ...   (g, T(range(g, g + 10)))
+    ...   for g in range(3000))
+    >>> ll = lookuplist.LookupList([lookup.Lookup([obj])])
+    >>> def f(w, **kwArgs):
+    ...   ep = {}
+    ...   ll.buildBinary(w, extensionPool=ep, **kwArgs)
+    ...   lookuplist.buildExtensionPool(w, ep, **kwArgs)
+    >>> w = writer.LinkedWriter()
+    >>> f(w)
+    >>> w.binaryString()
+    Traceback (most recent call last):
+      ...
+    fontio3.utilities.writer.OffsetOverflowError: Format 'H' requires 0 <= n < 65536!
+    
+    >>> d = {}
+    >>> s = buildResolved(f, splitSubtables=d)
+    >>> d
+    {(0, 0): 2}
+    >>> ll2 = lookuplist.LookupList.frombytes(s, forGPOS=False)
+    >>> [len(x) for x in ll2[0]]
+    [1500, 1500]
+    >>> {k: v for x in ll2[0] for k, v in x.items()} == obj
+    True
+    """
+    
+    kwArgs.pop('stakeValue', None)
+    kwArgs.setdefault('extensionLookups', set())
+    kwArgs.setdefault('sharedSpanLimit', lookuplist.sharedSpanLimit)
+    kwArgs.setdefault('splitSubtables', {})
+    kwArgs['resolveOverflows'] = False
+    
+    for i in range(maxPassCount):
+        w = writer.LinkedWriter()
+        regions = kwArgs['overflowRegions'] = []
+        buildFunc(w, **kwArgs)
+        
+        try:
+            return w.binaryString()
+        
+        except writer.OffsetOverflowError as e:
+            if not _fixOverflows(w, e, regions, kwArgs):
+                raise
+            
+            lastError = e
+    
+    raise lastError
+
+def splitSubtable(obj, pieceCount):
+    """
+    Returns a list of at most pieceCount subtables which together do what the
+    specified subtable does in a Lookup, each handling a separate set of first
+    glyphs. Extension subtables are split by splitting their originals. Only
+    single, pair, cursive, multiple, alternate and ligature subtables can be
+    split; for others, or if there are too few first glyphs, the list is just
+    [obj].
+    
+    >>> from fontio3.GSUB import ligature
+    >>> obj = ligature._testingValues[2]
+    >>> sorted(map(tuple, obj))
+    [(5, 3), (5, 9), (11, 12)]
+    >>> v = splitSubtable(obj, 2)
+    >>> [sorted(map(tuple, x)) for x in v]
+    [[(5, 3), (5, 9)], [(11, 12)]]
+    >>> v[0].keyOrder is obj.keyOrder
+    True
+    >>> len(splitSubtable(obj, 5))
+    2
+    
+    >>> from fontio3.GPOS import extension, pairclasses
+    >>> obj = extension.Extension(original=pairclasses._testingValues[0])
+    >>> [type(x.original).__name__ for x in splitSubtable(obj, 2)]
+    ['PairClasses', 'PairClasses']
+    """
+    
+    if pieceCount < 2:
+        return [obj]
+    
+    if obj.kind in {('GPOS', 9), ('GSUB', 7)}:
+        return [
+          type(obj)(original=x)
+          for x in splitSubtable(obj.original, pieceCount)]
+    
+    if obj.kind not in _firstGlyphKinds:
+        return [obj]
+    
+    if hasattr(obj, 'classDef1'):
+        from fontio3.GPOS import pairclasses_split
+        
+        return pairclasses_split.splitEvenly(obj, pieceCount)
+    
+    return _splitByFirstGlyph(obj, pieceCount)
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
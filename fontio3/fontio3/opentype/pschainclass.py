@@ -330,6 +330,24 @@ class PSChainClass(dict, metaclass=mapmeta.FontDataMetaclass):
                 obj.buildBinary(w, **kwArgs)
 
 
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs whose input class starts at least one
+        key, or None if some key's input starts with class zero (since then
+        any glyph not in the input ClassDef can match). The Lookup uses this to
+        skip the subtable for glyphs that cannot start a match.
+        
+        >>> sorted(_testingValues[1].firstGlyphs())
+        [20, 21]
+        """
+        
+        classes = {key[1][0] for key in self}
+        
+        if 0 in classes:
+            return None
+        
+        return {g for g, c in self.classDefInput.items() if c in classes}
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
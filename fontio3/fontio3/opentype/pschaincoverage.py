@@ -266,6 +266,23 @@ class PSChainCoverage(dict, metaclass=mapmeta.FontDataMetaclass):
         
         return r
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs in the first input coverage of all the
+        keys. The Lookup uses this to skip the subtable for glyphs that cannot
+        start a match.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [30, 31]
+        """
+        
+        r = set()
+        
+        for key in self:
+            r.update(key[1][0])
+        
+        return r
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
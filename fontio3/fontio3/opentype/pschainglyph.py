@@ -326,6 +326,18 @@ class PSChainGlyph(dict, metaclass=mapmeta.FontDataMetaclass):
                 w.add("H", len(obj))
                 obj.buildBinary(w, **kwArgs)
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the first input glyphs of all the keys; backtrack
+        glyphs precede the start index, so they do not matter here. The Lookup
+        uses this to skip the subtable for glyphs that cannot start a match.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [25, 30]
+        """
+        
+        return {key[1][0] for key in self}
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
@@ -228,6 +228,23 @@ class PSContextCoverage(dict, metaclass=mapmeta.FontDataMetaclass):
             w.stakeCurrentWithValue(ctStakes[ctIndex])
             covTable.buildBinary(w)
     
+    def firstGlyphs(self):
+        """
+        Returns a set with the glyphs in the first coverage of all the keys.
+        The Lookup uses this to skip the subtable for glyphs that cannot start
+        a match.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [20, 21]
+        """
+        
+        r = set()
+        
+        for key in self:
+            r.update(key[0])
+        
+        return r
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
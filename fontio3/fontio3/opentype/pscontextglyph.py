@@ -322,6 +322,17 @@ class PSContextGlyph(dict, metaclass=mapmeta.FontDataMetaclass):
                 obj.buildBinary(w, **kwArgs)
 
 
+    def firstGlyphs(self):
+        """
+        Returns a set with the first glyphs of all the keys. The Lookup uses
+        this to skip the subtable for glyphs that cannot start a match.
+        
+        >>> sorted(_testingValues[0].firstGlyphs())
+        [25, 30]
+        """
+        
+        return {key[0] for key in self}
+    
     @classmethod
     def fromValidatedFontWorkerSource(cls, fws, **kwArgs):
         """
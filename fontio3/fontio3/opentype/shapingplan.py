@@ -0,0 +1,267 @@
+#
+# shapingplan.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for shaping plans: the ordered GSUB and GPOS lookups that apply for a
+particular script, language and set of features in a font.
+"""
+
+# Other imports
+from fontio3.GPOS import effect
+from fontio3.opentype import runningglyphs
+
+# -----------------------------------------------------------------------------
+
+#
+# Constants
+#
+
+# These are the features applied when the client does not specify a set. They
+# are the features shaping engines turn on by default for simple scripts.
+
+defaultFeatures = frozenset({
+  b'abvm',
+  b'blwm',
+  b'calt',
+  b'ccmp',
+  b'clig',
+  b'curs',
+  b'dist',
+  b'kern',
+  b'liga',
+  b'locl',
+  b'mark',
+  b'mkmk',
+  b'rclt',
+  b'rlig'})
+
+# Scripts tried, in order, when the font does not include the requested one.
+
+fallbackScripts = (b'DFLT', b'dflt', b'latn')
+
+# -----------------------------------------------------------------------------
+
+#
+# Private functions
+#
+
+def _asTag(s):
+    """
+    Returns s as a bytes object, encoding it if it is a str.
+    
+    >>> _asTag('latn'), _asTag(b'latn'), _asTag(None)
+    (b'latn', b'latn', None)
+    """
+    
+    if isinstance(s, str):
+        return s.encode('ascii')
+    
+    return s
+
+def _resolveLookups(table, script, language, features):
+    """
+    Returns a list of the Lookup objects from the specified GSUB or GPOS table
+    that apply for the script, language and feature set, in the order they are
+    to be run. Each Lookup appears only once, even if several features share
+    it.
+    """
+    
+    if not table:
+        return []
+    
+    scripts = table.scripts
+    
+    for tag in (script,) + fallbackScripts:
+        if tag in scripts:
+            lsd = scripts[tag]
+            break
+    
+    else:
+        return []
+    
+    langSys = lsd.get(language, lsd.defaultLangSys)
+    
+    if langSys is None:
+        return []
+    
+    featTags = {t for t in langSys.optionalFeatures if t[:4] in features}
+    
+    if langSys.requiredFeature is not None:
+        featTags.add(langSys.requiredFeature)
+    
+    seen = {}
+    
+    for featTag in featTags:
+        for lk in table.features.get(featTag, []):
+            seen[id(lk)] = lk
+    
+    return sorted(seen.values(), key=(lambda lk: lk.sequence))
+
+# -----------------------------------------------------------------------------
+
+#
+# Classes
+#
+
+if 0:
+    def __________________(): pass
+
+class ShapingPlan(object):
+    """
+    Objects holding the resolved lookups for one script, language and feature
+    set in one font. Building a plan walks the ScriptDict, LangSysDict and
+    FeatureDict once; running it just runs the lookups, so a plan should be
+    reused across all the strings shaped with the same settings. There are
+    four attributes:
+        
+        gposLookups     A list of the GPOS Lookups to be run, in order.
+        
+        gsubLookups     A list of the GSUB Lookups to be run, in order.
+        
+        key             The (script, language, features) tuple the plan was
+                        built for.
+        
+        sources         A pair with the GSUB and GPOS objects the plan was
+                        built from, used to detect when it is out of date.
+    
+    >>> p = ShapingPlan(_testingGSUB, None, b'latn')
+    >>> [lk.sequence for lk in p.gsubLookups], p.gposLookups
+    ([5], [])
+    >>> glyphs, effects = p.run([4, 11, 29, 5, 9, 2])
+    >>> glyphs.asSimpleTuple()
+    (97, -1, -1, 32, -1, 2)
+    >>> len(effects)
+    6
+    
+    Unknown scripts fall back to DFLT (or latn), and features not in the set
+    are not applied:
+    
+    >>> ShapingPlan(_testingGSUB, None, b'grek').gsubLookups == p.gsubLookups
+    True
+    >>> ShapingPlan(_testingGSUB, None, b'latn', features={b'smcp'}).gsubLookups
+    []
+    """
+    
+    #
+    # Methods
+    #
+    
+    def __init__(self, GSUBTable, GPOSTable, script, **kwArgs):
+        """
+        Initializes the plan from the specified GSUB and GPOS objects (either
+        may be None). The following keyword arguments are supported:
+            
+            features    An iterable of four-byte feature tags to apply. If not
+                        specified, defaultFeatures is used. A required feature
+                        for the language is always applied.
+            
+            language    The language tag. If not specified, or not present in
+                        the font, the script's default LangSys is used.
+        """
+        
+        script = _asTag(script)
+        language = _asTag(kwArgs.get('language', None))
+        features = kwArgs.get('features', None)
+        
+        if features is None:
+            features = defaultFeatures
+        else:
+            features = frozenset(_asTag(t) for t in features)
+        
+        self.key = (script, language, features)
+        self.sources = (GSUBTable, GPOSTable)
+        
+        self.gsubLookups = _resolveLookups(
+          GSUBTable,
+          script,
+          language,
+          features)
+        
+        self.gposLookups = _resolveLookups(
+          GPOSTable,
+          script,
+          language,
+          features)
+    
+    def isCurrent(self, GSUBTable, GPOSTable):
+        """
+        Returns True if the plan was built from the specified GSUB and GPOS
+        objects. Note this is an identity check; a plan will not notice edits
+        made in place to the lookups or features of those objects.
+        
+        >>> p = ShapingPlan(_testingGSUB, None, b'latn')
+        >>> p.isCurrent(_testingGSUB, None), p.isCurrent(None, None)
+        (True, False)
+        """
+        
+        a, b = self.sources
+        return (a is GSUBTable) and (b is GPOSTable)
+    
+    def run(self, glyphs, **kwArgs):
+        """
+        Shapes the specified sequence of glyph indices, running all the GSUB
+        lookups and then all the GPOS lookups. Returns a pair: the resulting
+        GlyphList, and a list of the same length with the accumulated Effect
+        objects for each glyph.
+        
+        The keyword arguments are passed through to the Lookup.run() calls; in
+        particular, an 'editor' should be provided so GDEF glyph classes are
+        available for the lookup flags.
+        """
+        
+        ga = runningglyphs.GlyphList.fromiterable(glyphs)
+        
+        for lk in self.gsubLookups:
+            ga = lk.run(ga, **kwArgs)
+        
+        r = [effect.Effect() for g in ga]
+        
+        for lk in self.gposLookups:
+            r = lk.run(ga, cumulEffects=r, **kwArgs)
+        
+        return (ga, r)
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+if __debug__:
+    from fontio3.GSUB import GSUB_v10
+    
+    from fontio3.opentype import (
+      featuredict,
+      featuretable,
+      langsys,
+      langsysdict,
+      lookup,
+      scriptdict)
+    
+    _testingGSUB = GSUB_v10.GSUB(
+      features = featuredict.FeatureDict({
+        b'liga0001': featuretable.FeatureTable([lookup._testingValues[5]]),
+        b'smcp0002': featuretable.FeatureTable([lookup._testingValues[4]])}),
+      
+      scripts = scriptdict.ScriptDict({
+        b'DFLT': langsysdict.LangSysDict(
+          defaultLangSys = langsys.LangSys(
+            optionalFeatures = {b'liga0001'})),
+        
+        b'latn': langsysdict.LangSysDict(
+          defaultLangSys = langsys.LangSys(
+            optionalFeatures = {b'liga0001'}))}))
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
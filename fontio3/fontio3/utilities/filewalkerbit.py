@@ -8,8 +8,12 @@
 Front-end module for Python programs using fast FileWalkerBits.
 """
 
+# System imports
+import mmap
+
 # Other imports
-from fontio3 import filewalkerbitbackend
+from fontio3 import filewalkerbitbackend, walkerbitbackend
+from fontio3.utilities import walkerbit
 
 # -----------------------------------------------------------------------------
 
@@ -392,6 +396,27 @@ class FileWalkerBit:
         r.context = newContext
         return r
     
+    @staticmethod
+    def mapped(path, bitStart=0, bitLimit=None, endian='>', zeroCopy=False):
+        """
+        Returns a MappedFileWalkerBit for the specified path. This is the
+        memory-mapped alternative to the usual FileWalkerBit constructor; see
+        the MappedFileWalkerBit class for details.
+        
+        >>> wb = FileWalkerBit.mapped(_tempPath, bitStart=65 * 8)
+        >>> wb.unpack("3c")
+        (b'A', b'B', b'C')
+        >>> type(wb.subWalker(2)).__name__
+        'MappedFileWalkerBit'
+        """
+        
+        return MappedFileWalkerBit(
+          path,
+          bitStart = bitStart,
+          bitLimit = bitLimit,
+          endian = endian,
+          zeroCopy = zeroCopy)
+    
     def getBitOffset(self, relative=False):
         """
         Returns the current offset. This is always relative to the original
@@ -966,6 +991,299 @@ class FileWalker(FileWalkerBit):
 
 # -----------------------------------------------------------------------------
 
+if 0:
+    def __________________(): pass
+
+class MappedFileWalkerBit(walkerbit.StringWalkerBit):
+    """
+    FileWalkerBits backed by a read-only memory mapping of the file, instead
+    of by fseek/fread calls. All of the unpacking is done by the same C code
+    used for StringWalkerBits, so no system calls are made after the file is
+    mapped, and sub-walkers simply share the mapping (there is no per-walker
+    file position bookkeeping).
+    
+    If zeroCopy is True, then the chunk(), piece() and rest() methods return
+    memoryview slices of the mapping rather than new bytestrings, whenever the
+    requested data are byte-aligned. The chunkView(), pieceView() and
+    restView() methods always do this, regardless of the zeroCopy setting.
+    Clients wanting zero-copy data should be prepared to accept any object
+    supporting the buffer protocol.
+    """
+    
+    #
+    # Initialization method
+    #
+    
+    def __init__(
+      self,
+      path,
+      bitStart = 0,
+      bitLimit = None,
+      endian = '>',
+      zeroCopy = False):
+        
+        """
+        Initializes the MappedFileWalkerBit for the specified file path.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8)
+        >>> wb.chunk(3)
+        b'ABC'
+        >>> wb.bitLength()
+        1504
+        """
+        
+        if path is not None:
+            with open(path, "rb") as f:
+                try:
+                    m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                
+                except ValueError:  # empty files cannot be mapped
+                    m = b''
+            
+            self._setup(m, bitStart, bitLimit, endian, zeroCopy)
+    
+    #
+    # Private methods
+    #
+    
+    def _setup(self, m, bitStart, bitLimit, endian, zeroCopy):
+        super().__init__(m, bitStart=bitStart, bitLimit=bitLimit, endian=endian)
+        self.mapping = m
+        self.zeroCopy = zeroCopy
+    
+    def _viewAt(self, bitOffset, byteLength):
+        return memoryview(self.mapping)[
+          bitOffset // 8:
+          bitOffset // 8 + byteLength]
+    
+    #
+    # Public methods
+    #
+    
+    def bitSubWalker(
+      self,
+      bitOffset,
+      relative = False,
+      newBitLimit = None,
+      anchor = False):
+        
+        """
+        Returns a new MappedFileWalkerBit sharing the same mapping as self.
+        See FileWalkerBit.bitSubWalker() for a description of the parameters.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=20, bitLimit=100)
+        >>> wb.skipBits(10)
+        >>> wSub = wb.bitSubWalker(5, True, 30)
+        >>> wSub.mapping is wb.mapping
+        True
+        >>> wSub.unpack("3B")
+        (32, 40, 48)
+        """
+        
+        m, start, limit, endian = walkerbitbackend.wkbSubWalkerSetup(
+          self.context,
+          bitOffset,
+          relative,
+          anchor,
+          newBitLimit)
+        
+        r = type(self)(None)
+        r._setup(m, start, limit, endian, self.zeroCopy)
+        return r
+    
+    def chunk(self, byteLength):
+        """
+        Returns a bytestring (or a memoryview, if zeroCopy is True) of the
+        specified length from the current location.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8)
+        >>> wb.chunk(3)
+        b'ABC'
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8, zeroCopy=True)
+        >>> v = wb.chunk(3)
+        >>> type(v).__name__, v == b'ABC'
+        ('memoryview', True)
+        """
+        
+        if self.zeroCopy:
+            return self.chunkView(byteLength)
+        
+        return super().chunk(byteLength)
+    
+    def chunkView(self, byteLength):
+        """
+        Like chunk(), but returns a memoryview into the mapping instead of a
+        new bytestring. If the current location is not byte-aligned the data
+        have to be shifted, so in that case a bytestring is returned.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8)
+        >>> wb.chunkView(3).tobytes()
+        b'ABC'
+        >>> wb.chunkView(2).tobytes()
+        b'DE'
+        >>> wb.chunkView(500)
+        Traceback (most recent call last):
+          ...
+        IndexError: Attempt to unpack past end of string!
+        >>> ignore = wb.unpackBits(4)
+        >>> wb.chunkView(1)
+        b'd'
+        """
+        
+        bitOffset = self.getBitOffset()
+        
+        if bitOffset % 8:
+            return super().chunk(byteLength)
+        
+        if 8 * byteLength > self.bitLength():
+            raise IndexError("Attempt to unpack past end of string!")
+        
+        self.skip(byteLength)
+        return self._viewAt(bitOffset, byteLength)
+    
+    def piece(self, byteLength, byteOffset=0, relative=True):
+        """
+        Returns a chunk of data from anywhere within the walker, without
+        advancing the walker. This is a memoryview if zeroCopy is True.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8)
+        >>> wb.piece(3, byteOffset=7)
+        b'HIJ'
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8, zeroCopy=True)
+        >>> wb.piece(3, byteOffset=1, relative=False).tobytes()
+        b'BCD'
+        """
+        
+        if self.zeroCopy:
+            return self.pieceView(byteLength, byteOffset, relative)
+        
+        return super().piece(byteLength, byteOffset, relative)
+    
+    def pieceView(self, byteLength, byteOffset=0, relative=True):
+        """
+        Like piece(), but returns a memoryview into the mapping instead of a
+        new bytestring, as long as the piece starts on a byte boundary.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=65 * 8)
+        >>> wb.pieceView(3).tobytes()
+        b'ABC'
+        >>> wb.pieceView(3, byteOffset=7).tobytes()
+        b'HIJ'
+        >>> wb.pieceView(300)
+        Traceback (most recent call last):
+          ...
+        IndexError: Specified piece larger than available data!
+        """
+        
+        currBitOffset = self.getBitOffset()
+        bitLimit = currBitOffset + self.bitLength()
+        bitOffset = 8 * byteOffset
+        
+        if relative:
+            bitOffset += currBitOffset
+        else:
+            bitOffset += currBitOffset - self.getBitOffset(relative=True)
+        
+        if bitOffset + 8 * byteLength > bitLimit:
+            raise IndexError("Specified piece larger than available data!")
+        
+        if bitOffset % 8:
+            return super().piece(byteLength, byteOffset, relative)
+        
+        return self._viewAt(bitOffset, byteLength)
+    
+    def rest(self):
+        """
+        Returns the rest of the unread data, as a memoryview if zeroCopy is
+        True or as a bytestring otherwise.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=252 * 8)
+        >>> wb.rest()
+        b'\\xfc\\xfd\\xfe\\xff'
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=252 * 8, zeroCopy=True)
+        >>> list(wb.rest())
+        [252, 253, 254, 255]
+        """
+        
+        if self.zeroCopy:
+            return self.restView()
+        
+        return super().rest()
+    
+    def restView(self):
+        """
+        Like rest(), but returns a memoryview into the mapping.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=248 * 8)
+        >>> wb.unpack("3B")
+        (248, 249, 250)
+        >>> list(wb.restView())
+        [251, 252, 253, 254, 255]
+        >>> wb.atEnd()
+        True
+        """
+        
+        bitLength = self.bitLength()
+        
+        if bitLength % 8:
+            return self.unpackBits(bitLength)
+        
+        return self.chunkView(bitLength // 8)
+    
+    def subWalker(
+      self,
+      byteOffset,
+      relative = False,
+      absoluteAnchor = False,
+      newLimit = None):
+        
+        """
+        Returns a new MappedFileWalkerBit sharing the same mapping as self.
+        See FileWalkerBit.subWalker() for a description of the parameters.
+        
+        >>> wb = MappedFileWalkerBit(_tempPath, bitStart=520, bitLimit=1024)
+        >>> wb.skip(2)
+        >>> wSub = wb.subWalker(1, relative=True, newLimit=7)
+        >>> wSub.length()
+        7.0
+        >>> wSub.unpack("3c")
+        (b'D', b'E', b'F')
+        >>> wb.subWalker(1, absoluteAnchor=True, newLimit=0).length()
+        255.0
+        """
+        
+        return self.bitSubWalker(
+          8 * byteOffset,
+          relative = relative,
+          newBitLimit = (None if newLimit is None else 8 * newLimit),
+          anchor = absoluteAnchor)
+
+# -----------------------------------------------------------------------------
+
+#
+# Functions
+#
+
+def walkerForPath(path, useMmap=False, zeroCopy=False):
+    """
+    Returns a walker for the whole of the file at the specified path. This is
+    a FileWalkerBit unless useMmap is True, in which case it is a
+    MappedFileWalkerBit (with the specified zeroCopy setting).
+    
+    >>> type(walkerForPath(_tempPath)).__name__
+    'FileWalkerBit'
+    >>> w = walkerForPath(_tempPath, useMmap=True, zeroCopy=True)
+    >>> type(w).__name__, w.zeroCopy
+    ('MappedFileWalkerBit', True)
+    """
+    
+    if useMmap:
+        return MappedFileWalkerBit(path, zeroCopy=zeroCopy)
+    
+    return FileWalkerBit(path)
+
+# -----------------------------------------------------------------------------
+
 #
 # Test code
 #
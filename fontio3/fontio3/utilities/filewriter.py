@@ -18,6 +18,7 @@ import tempfile
 
 # Other imports
 from fontio3 import utilities, utilitiesbackend
+from fontio3.utilities import writer
 
 # -----------------------------------------------------------------------------
 
@@ -162,9 +163,9 @@ class LinkedFileWriter:
         rememberTell = f.tell()
         
         if any((t[2] is not None) and (t[2] & 7) for t in v):
-            partial = []
-            implode = utilitiesbackend.utImplode
-            explode = utilitiesbackend.utExplode
+            buffer = bytearray()
+            bufferBitCount = 0
+            appendBits = writer.appendBits
             
             for offset, byteLen, bitCount in v:
                 if not byteLen:
@@ -173,26 +174,27 @@ class LinkedFileWriter:
                 f.seek(offset)
                 bs = f.read(byteLen)
                 
-                if bitCount is None:
-                    if partial:
-                        thisBitLen = 8 * len(bs)
-                        partial += explode(bs)
-                        yield implode(partial[0:thisBitLen])
-                        partial = partial[thisBitLen:]
+                if bitCount is None and not (bufferBitCount & 7):
+                    # this is purely an accelerator
+                    if buffer:
+                        yield bytes(buffer)
+                        del buffer[:]
+                        bufferBitCount = 0
                     
-                    else:  # this is purely an accelerator
-                        yield bs
+                    yield bs
+                    continue
                 
-                else:
-                    partial += explode(bs)[0:bitCount]
-                    
-                    if len(partial) > 7:
-                        thisBitLen = 8 * (len(partial) // 8)
-                        yield implode(partial[0:thisBitLen])
-                        partial = partial[thisBitLen:]
+                bufferBitCount = appendBits(buffer, bufferBitCount, bs, bitCount)
+                
+                if len(buffer) > 65536:
+                    # yield the complete bytes, keeping any partial byte
+                    keep = 1 if (bufferBitCount & 7) else 0
+                    yield bytes(buffer[0:len(buffer) - keep])
+                    del buffer[0:len(buffer) - keep]
+                    bufferBitCount &= 7
             
-            if partial:
-                yield implode(partial)
+            if buffer:
+                yield bytes(buffer)
         
         else:
             for offset, byteLen, bitCount in v:
@@ -428,9 +430,17 @@ class LinkedFileWriter:
         if any(n < 0 or n >= subDelta for n in v):
             raise ValueError("Value out of range for specified bitsPerEntry!")
         
-        s = ''.join(bin(n+subDelta)[3:] for n in v)
-        it = (c == '1' for c in s)
-        self.addBits(utilitiesbackend.utImplode(it), bitsPerEntry*len(v))
+        bitCount = bitsPerEntry * len(v)
+        
+        if bitCount:
+            packed = 0
+            
+            for n in v:
+                packed = (packed << bitsPerEntry) | n
+            
+            byteCount = (bitCount + 7) >> 3
+            packed <<= (8 * byteCount - bitCount)
+            self.addBits(packed.to_bytes(byteCount, 'big'), bitCount)
     
     def addDeferredValue(self, format, value=0):
         """
@@ -822,43 +832,82 @@ class LinkedFileWriter:
         0x3040000
         """
         
-        start = (0 if start is None else start)
-        stop = (self.byteLength if stop is None else stop)
-        currMod = cumul = currPosition = 0
+        return self.checkSums({None: (start, stop)}, **kwArgs)[None]
+    
+    def checkSums(self, ranges, **kwArgs):
+        """
+        Returns a dict mapping the keys of the specified ranges dict to the
+        checksums of the corresponding portions of the LinkedWriter. The values
+        in ranges are (start, stop) pairs of byte offsets; as with checkSum(),
+        a start of None means zero and a stop of None means the end of the
+        writer. All of the checksums are computed in a single pass, so offsets
+        are only resolved once no matter how many ranges are requested. The
+        ranges may overlap.
+        
+        >>> w = LinkedFileWriter()
+        >>> w.add("B2H", 1, 0x203, 0x405)
+        >>> w.addString(b"abcdefg")
+        >>> d = w.checkSums({'a': (2, 4), 'b': (0, None), 'c': (3, 12)})
+        >>> [hex(d[k]) for k in 'abc']
+        ['0x3040000', '0x6ac8cbce', '0xce69c6c8']
+        >>> [hex(w.checkSum(2, 4)), hex(w.checkSum()), hex(w.checkSum(3, 12))]
+        ['0x3040000', '0x6ac8cbce', '0xce69c6c8']
+        """
+        
+        byteLength = self.byteLength
+        results = dict.fromkeys(ranges, 0)
+        
+        todo = list(
+          (
+            (0 if start is None else start),
+            (byteLength if stop is None else stop),
+            key)
+          for key, (start, stop) in ranges.items())
+        
+        todo.sort(key=(lambda t: t[0:2]))
+        
         f = utilitiesbackend.utChecksum
+        active = []  # [key, start, stop, currMod] lists
+        nextIndex = currPosition = 0
         
         for s in self._makeResolvedIterator(**kwArgs):
-            sOrigOrig = s
+            if not s:
+                continue
             
-            if currPosition >= stop:
-                break
+            pieceStop = currPosition + len(s)
             
-            elif (currPosition + len(s)) < start:
-                currPosition += len(s)
-                continue
+            while nextIndex < len(todo) and todo[nextIndex][0] < pieceStop:
+                start, stop, key = todo[nextIndex]
+                active.append([key, start, stop, 0])
+                nextIndex += 1
             
-            else:
-                # we know it intersects
-                delFromFront = max(0, start - currPosition)
-                delFromBack = max(0, (currPosition + len(s)) - stop)
+            for t in active:
+                key, start, stop, currMod = t
+                lo = max(start, currPosition)
+                hi = min(stop, pieceStop)
                 
-                if delFromFront and delFromBack:
-                    s = s[delFromFront:-delFromBack]
-                elif delFromFront:
-                    s = s[delFromFront:]
-                elif delFromBack:
-                    s = s[:-delFromBack]
-            
-            sOrig = s
+                if lo >= hi:
+                    continue
+                
+                if lo == currPosition and hi == pieceStop:
+                    piece = s
+                else:
+                    piece = s[lo - currPosition:hi - currPosition]
+                
+                if currMod:
+                    results[key] += f((b'\x00' * currMod) + piece)
+                else:
+                    results[key] += f(piece)
+                
+                t[3] = (currMod + len(piece)) % 4
             
-            if currMod:
-                s = (b'\x00' * currMod) + s
+            active = [t for t in active if t[2] > pieceStop]
+            currPosition = pieceStop
             
-            cumul += f(s)
-            currMod = (currMod + (len(sOrig) % 4)) % 4
-            currPosition += len(sOrigOrig)
+            if nextIndex == len(todo) and not active:
+                break
         
-        return cumul % 0x100000000
+        return {key: n % 0x100000000 for key, n in results.items()}
     
     def deleteIndexMap(self, tag):
         """
@@ -1042,13 +1091,43 @@ class LinkedFileWriter:
         else:
             raise ValueError("Duplicate stake!")
     
-    def writeToFile(self, path):
+    def writeToFile(self, f, **kwArgs):
         """
+        Resolves the pieces and writes them, one at a time, to the specified
+        destination, which may be either a path or an object with a write()
+        method (like an open binary file). Each piece is read back from the
+        backing file just before it is written, so the unified binary string
+        is never created. A path is written via writer.writeToPathAtomically(),
+        so it is either completely replaced or left untouched. Returns the
+        number of bytes written.
+        
+        >>> import io
+        >>> w = LinkedFileWriter()
+        >>> startStake = w.stakeCurrent()
+        >>> futureStake = w.getNewStake()
+        >>> w.addUnresolvedOffset("H", startStake, futureStake)
+        >>> w.addString(b"Hi there!")
+        >>> w.stakeCurrentWithValue(futureStake)
+        >>> w.add("h", -1)
+        >>> f = io.BytesIO()
+        >>> w.writeToFile(f)
+        13
+        >>> f.getvalue() == w.binaryString()
+        True
         """
         
-        with open(path, "wb") as f:
-            for bs in self._makeResolvedIterator():
-                f.write(bs)
+        if not hasattr(f, 'write'):
+            return writer.writeToPathAtomically(
+              f,
+              lambda fileObj: self.writeToFile(fileObj, **kwArgs))
+        
+        byteCount = 0
+        
+        for bs in self._makeResolvedIterator(**kwArgs):
+            f.write(bs)
+            byteCount += len(bs)
+        
+        return byteCount
 
 # -----------------------------------------------------------------------------
 
@@ -0,0 +1,168 @@
+#
+# sharedtables.py
+#
+# Copyright © 2026 Monotype Imaging Inc. All Rights Reserved.
+#
+
+"""
+Support for finding the tables that can be shared among the fonts of a
+collection or family when they are written together.
+"""
+
+# System imports
+import functools
+import hashlib
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def makeUniques(editors, changedKeys):
+    """
+    Returns a dict mapping each tag to a dict whose keys are the indices of
+    "avatar" fonts in the specified sequence of Editors (the ones whose copy
+    of the table will actually be written) and whose values are sets of the
+    indices of other fonts whose table is the same as the avatar's. The
+    changedKeys is a list with the set of changed table tags for each font.
+    
+    Rather than comparing each table against every earlier avatar, raw
+    tables are looked up by a digest of their bytes, and edited tables by
+    a hash of their asImmutable() form; actual comparisons are only done
+    against avatars in the same bucket. A raw table found to be equal to an
+    edited one is added to changedKeys, as it will be written from the
+    edited version.
+    """
+    
+    uniques = {}  # tag -> {avatar1: set(equals), avatar2: set(equals)...}
+    allTags = functools.reduce(set.union, (set(obj) for obj in editors))
+    
+    for tag in allTags:
+        uniques[tag] = d = {}
+        rawAvatars = {}  # raw digest -> avatar index
+        sigAvatars = {}  # signature -> [avatar indices]
+        signatures = {}  # font index -> signature
+        unsigned = []  # raw avatars not yet added to sigAvatars
+        haveEdited = False
+        
+        def isRaw(i):
+            return (
+              (tag not in changedKeys[i]) or
+              isinstance(editors[i][tag], (str, bytes)))
+        
+        def sigFor(i):
+            if i not in signatures:
+                signatures[i] = structuralSignature(editors[i][tag])
+            
+            return signatures[i]
+        
+        def findEqual(i, editedOnly):
+            for avatarIndex in sigAvatars.get(sigFor(i), []):
+                if editedOnly and isRaw(avatarIndex):
+                    continue
+                
+                if editors[i][tag] == editors[avatarIndex][tag]:
+                    return avatarIndex
+            
+            return None
+        
+        for i, obj in enumerate(editors):
+            if tag not in obj:
+                continue
+            
+            if isRaw(i):
+                raw = obj.getRawTable(tag)
+                digest = hashlib.sha1(raw).digest()
+                avatarIndex = rawAvatars.get(digest)
+                
+                if (
+                  (avatarIndex is not None) and
+                  (raw == editors[avatarIndex].getRawTable(tag))):
+                    
+                    d[avatarIndex].add(i)
+                    continue
+                
+                # A raw table is compared as an object only against the
+                # edited avatars, and if it matches one of them it will be
+                # written from that edited version.
+                if haveEdited:
+                    avatarIndex = findEqual(i, True)
+                    
+                    if avatarIndex is not None:
+                        changedKeys[i].add(tag)
+                        d[avatarIndex].add(i)
+                        continue
+                
+                d[i] = set()
+                rawAvatars.setdefault(digest, i)
+                
+                if i in signatures:
+                    sigAvatars.setdefault(signatures[i], []).append(i)
+                else:
+                    unsigned.append(i)
+            
+            else:
+                for avatarIndex in unsigned:
+                    sigAvatars.setdefault(
+                      sigFor(avatarIndex),
+                      []).append(avatarIndex)
+                
+                del unsigned[:]
+                avatarIndex = findEqual(i, False)
+                haveEdited = True
+                
+                if avatarIndex is None:
+                    d[i] = set()
+                    sigAvatars.setdefault(sigFor(i), []).append(i)
+                
+                else:
+                    if isRaw(avatarIndex):
+                        changedKeys[avatarIndex].add(tag)
+                    
+                    d[avatarIndex].add(i)
+    
+    return uniques
+
+def structuralSignature(obj):
+    """
+    Returns a hashable signature for obj, such that equal objects will almost
+    always have equal signatures. If obj cannot produce a hashable immutable
+    form, None is returned (and all such objects just share a bucket).
+    
+    >>> structuralSignature([1, 2, 3]) is None
+    True
+    >>> structuralSignature(b'abc') == structuralSignature(b'abc')
+    True
+    """
+    
+    try:
+        return hash(obj.asImmutable())
+    
+    except (AttributeError, NotImplementedError, TypeError):
+        pass
+    
+    try:
+        return hash(obj)
+    except TypeError:
+        return None
+
+# -----------------------------------------------------------------------------
+
+#
+# Test code
+#
+
+if 0:
+    def __________________(): pass
+
+def _test():
+    import doctest
+    doctest.testmod()
+
+if __name__ == "__main__":
+    if __debug__:
+        _test()
@@ -17,7 +17,9 @@ external references in the construction of a binary string.
 
 # System imports
 import inspect
+import os
 import sys
+import tempfile
 
 # Other imports
 from fontio3 import utilities, utilitiesbackend
@@ -100,8 +102,9 @@ class LinkedWriter(object):
         if n >> keepLowestCount:
             raise ValueError("Losing significant bits!")
         
-        v = [int(b) for b in bin(n + klc)[3:]]
-        return utilitiesbackend.utImplode(v)
+        byteCount = (keepLowestCount + 7) >> 3
+        n <<= (8 * byteCount - keepLowestCount)
+        return n.to_bytes(byteCount, 'big')
     
     def _byteLength(self):
         """
@@ -152,36 +155,39 @@ class LinkedWriter(object):
         
         # Now create the actual string list to be returned
         if any((n is not None) and (n & 7) for s, n in v):
-            partial = []
-            implode = utilitiesbackend.utImplode
-            explode = utilitiesbackend.utExplode
+            buffer = bytearray()
+            bufferBitCount = 0
             
             for s, bitCount in v:
-                if s:
-                    if bitCount is None:
-                        if partial:
-                            thisBitLen = 8 * len(s)
-                            partial += explode(s)
-                            yield implode(partial[0:thisBitLen])
-                            partial = partial[thisBitLen:]
-                        
-                        else:  # this is purely an accelerator
-                            yield s
+                if not s:
+                    continue
+                
+                if bitCount is None and not (bufferBitCount & 7):
+                    # this is purely an accelerator
+                    if buffer:
+                        yield bytes(buffer)
+                        del buffer[:]
+                        bufferBitCount = 0
                     
-                    else:
-                        partial += explode(s)[0:bitCount]
-                        
-                        if len(partial) > 7:
-                            thisBitLen = 8 * (len(partial) // 8)
-                            yield implode(partial[0:thisBitLen])
-                            partial = partial[thisBitLen:]
+                    yield s
+                    continue
+                
+                bufferBitCount = appendBits(buffer, bufferBitCount, s, bitCount)
+                
+                if len(buffer) > 65536:
+                    # yield the complete bytes, keeping any partial byte
+                    keep = 1 if (bufferBitCount & 7) else 0
+                    yield bytes(buffer[0:len(buffer) - keep])
+                    del buffer[0:len(buffer) - keep]
+                    bufferBitCount &= 7
             
-            if partial:
-                yield implode(partial)
+            if buffer:
+                yield bytes(buffer)
         
         else:
-            for x in v:
-                yield x[0]
+            for s, bitCount in v:
+                # bit pieces are bytearrays, so don't hand those out
+                yield (s if bitCount is None else bytes(s))
     
     def _resolveVariableFormatOffsets(self, **kwArgs):
         """
@@ -217,6 +223,8 @@ class LinkedWriter(object):
         pieceStarts = utilities.cumulCount(g)
         unresolvedOK = kwArgs.get('unresolvedOK', False)
         sawCallable = False
+        overflows = []
+        firstMessage = None
         
         for i, t in enumerate(self.links):
             format, \
@@ -260,22 +268,31 @@ class LinkedWriter(object):
                 v[pieceIndex] = self.pieces[pieceIndex]
                 sawCallable = True
             
-            elif bitLength is None:
+            else:
+                n = actualBitDelta // 8
+                
                 try:
-                    v[pieceIndex] = (
-                      utilitiesbackend.utPack(format, actualBitDelta // 8),
-                      None)
+                    if bitLength is None:
+                        s = utilitiesbackend.utPack(format, n)
+                    else:
+                        s = self._bitsFromNumber(n, bitLength)
+                    
+                    v[pieceIndex] = (s, bitLength)
                 
-                except ValueError:
+                except ValueError as e:
                     if self.linkHistory is not None:
                         print(self.linkHistory[i], file=sys.stderr)
                     
-                    raise
-            
-            else:
-                v[pieceIndex] = (
-                  self._bitsFromNumber(actualBitDelta // 8, bitLength),
-                  bitLength)
+                    # Keep going, so the caller learns about all the links
+                    # that overflow and not just the first one.
+                    
+                    overflows.append((tagFrom, tagTo))
+                    
+                    if firstMessage is None:
+                        firstMessage = str(e)
+        
+        if overflows:
+            raise OffsetOverflowError(firstMessage, overflows)
         
         if not sawCallable:
             return v
@@ -402,6 +419,8 @@ class LinkedWriter(object):
         """
         Adds the specified number of bits from the bytes in the specified
         bytestring or bytes object. The bits are taken from the high-order end.
+        Successive calls with no intervening stakes or other additions are
+        packed together into a single piece.
         
         >>> w = LinkedWriter()
         >>> w.addBits(bytes.fromhex("FF FF"), 9)
@@ -411,9 +430,24 @@ class LinkedWriter(object):
         >>> w.addBits(bytes.fromhex("55"), 6)
         >>> utilities.hexdump(w.binaryString())
                0 | FFAA                                     |..              |
+        >>> len(w.pieces)
+        1
         """
         
-        self.pieces.append((bitString, bitCount))
+        pieces = self.pieces
+        
+        if self._openBitsIndex == len(pieces) - 1:
+            # Consecutive bit additions are packed into a single piece
+            buffer, oldCount = pieces[-1]
+            newCount = appendBits(buffer, oldCount, bitString, bitCount)
+            pieces[-1] = (buffer, newCount)
+        
+        else:
+            buffer = bytearray()
+            appendBits(buffer, 0, bitString, bitCount)
+            pieces.append((buffer, bitCount))
+            self._openBitsIndex = len(pieces) - 1
+        
         self.bitLength += bitCount
     
     def addBitsFromNumber(self, n, keepLowestCount):
@@ -482,11 +516,15 @@ class LinkedWriter(object):
         if any(n < 0 or n >= subDelta for n in v):
             raise ValueError("Value out of range for specified bitsPerEntry!")
         
-        s = ''.join(bin(n+subDelta)[3:] for n in v)
+        bitCount = bitsPerEntry * len(v)
         
-        self.addBits(
-          utilitiesbackend.utImplode([int(c) for c in s]),
-          bitsPerEntry * len(v))
+        if bitCount:
+            packed = 0
+            
+            for n in v:
+                packed = (packed << bitsPerEntry) | n
+            
+            self.addBits(self._bitsFromNumber(packed, bitCount), bitCount)
     
     def addDeferredValue(self, format, value=0):
         """
@@ -609,6 +647,43 @@ class LinkedWriter(object):
         self.stakeCurrentWithValue(stakeName)
         self.addString(s)
     
+    def addSharedString(self, stakeValue, s):
+        """
+        Adds a self-contained block of binary data (one with no links of its
+        own), marking its start with the specified stakeValue, which will have
+        been allocated earlier via getNewStake(). If sharing is off, this is
+        the same as stakeCurrentWithValue() followed by addString().
+        
+        If sharing is on (see startSharing()), the block is not added yet.
+        Instead, it is held until the next flushShared() call, when a single
+        copy of each distinct block is added with all of its stakes marking
+        it. Blocks are only ever placed after the data that links to them.
+        
+        >>> w = LinkedWriter()
+        >>> w.startSharing()
+        >>> base = w.stakeCurrent()
+        >>> stakes = [w.getNewStake() for i in range(3)]
+        >>> for stake in stakes: w.addUnresolvedOffset("H", base, stake)
+        >>> w.addSharedString(stakes[0], b"AB")
+        >>> w.addSharedString(stakes[1], b"CD")
+        >>> w.addSharedString(stakes[2], b"AB")
+        >>> w.stopSharing()
+        >>> utilities.hexdump(w.binaryString())
+               0 | 0006 0008 0006 4142  4344                |......ABCD      |
+        """
+        
+        if self.sharedBlocks is None:
+            self.stakeCurrentWithValue(stakeValue)
+            self.addString(s)
+        
+        else:
+            v = self.sharedBlocks.setdefault(bytes(s), [])
+            
+            if not v:
+                self.sharedLength += len(s)
+            
+            v.append(stakeValue)
+    
     def addString(self, s):
         """
         Adds a single bytestring.
@@ -788,7 +863,10 @@ class LinkedWriter(object):
         elif bitLength is None:
             self.add(format, 0)
         else:
+            # the placeholder must be a piece of its own
+            self._openBitsIndex = None
             self.addBitsFromNumber(0, bitLength)
+            self._openBitsIndex = None
         
         if self.linkHistory is not None:
             self.linkHistory.append(inspect.stack()[1][1:4])
@@ -888,41 +966,82 @@ class LinkedWriter(object):
         0x3040000
         """
         
-        start = (0 if start is None else start)
-        stop = (self.byteLength if stop is None else stop)
-        currMod = cumul = currPosition = 0
+        return self.checkSums({None: (start, stop)}, **kwArgs)[None]
+    
+    def checkSums(self, ranges, **kwArgs):
+        """
+        Returns a dict mapping the keys of the specified ranges dict to the
+        checksums of the corresponding portions of the LinkedWriter. The values
+        in ranges are (start, stop) pairs of byte offsets; as with checkSum(),
+        a start of None means zero and a stop of None means the end of the
+        writer. All of the checksums are computed in a single pass, so offsets
+        are only resolved once no matter how many ranges are requested. The
+        ranges may overlap.
+        
+        >>> w = LinkedWriter()
+        >>> w.add("B2H", 1, 0x203, 0x405)
+        >>> w.addString(b"abcdefg")
+        >>> d = w.checkSums({'a': (2, 4), 'b': (0, None), 'c': (3, 12)})
+        >>> [hex(d[k]) for k in 'abc']
+        ['0x3040000', '0x6ac8cbce', '0xce69c6c8']
+        >>> [hex(w.checkSum(2, 4)), hex(w.checkSum()), hex(w.checkSum(3, 12))]
+        ['0x3040000', '0x6ac8cbce', '0xce69c6c8']
+        """
+        
+        byteLength = self.byteLength
+        results = dict.fromkeys(ranges, 0)
+        
+        todo = list(
+          (
+            (0 if start is None else start),
+            (byteLength if stop is None else stop),
+            key)
+          for key, (start, stop) in ranges.items())
+        
+        todo.sort(key=(lambda t: t[0:2]))
+        
         f = utilitiesbackend.utChecksum
+        active = []  # [key, start, stop, currMod] lists
+        nextIndex = currPosition = 0
         
         for s in self._makeResolvedIterator(**kwArgs):
-            sOrigOrig = s
-            
-            if currPosition >= stop:
-                break
-            elif (currPosition + len(s)) < start:
-                currPosition += len(s)
+            if not s:
                 continue
-            else:
-                # we know it intersects
-                delFromFront = max(0, start - currPosition)
-                delFromBack = max(0, (currPosition + len(s)) - stop)
-                
-                if delFromFront and delFromBack:
-                    s = s[delFromFront:-delFromBack]
-                elif delFromFront:
-                    s = s[delFromFront:]
-                elif delFromBack:
-                    s = s[:-delFromBack]
             
-            sOrig = s
+            pieceStop = currPosition + len(s)
+            
+            while nextIndex < len(todo) and todo[nextIndex][0] < pieceStop:
+                start, stop, key = todo[nextIndex]
+                active.append([key, start, stop, 0])
+                nextIndex += 1
+            
+            for t in active:
+                key, start, stop, currMod = t
+                lo = max(start, currPosition)
+                hi = min(stop, pieceStop)
+                
+                if lo >= hi:
+                    continue
+                
+                if lo == currPosition and hi == pieceStop:
+                    piece = s
+                else:
+                    piece = s[lo - currPosition:hi - currPosition]
+                
+                if currMod:
+                    results[key] += f((b'\x00' * currMod) + piece)
+                else:
+                    results[key] += f(piece)
+                
+                t[3] = (currMod + len(piece)) % 4
             
-            if currMod:
-                s = (b'\x00' * currMod) + s
+            active = [t for t in active if t[2] > pieceStop]
+            currPosition = pieceStop
             
-            cumul += f(s)
-            currMod = (currMod + (len(sOrig) % 4)) % 4
-            currPosition += len(sOrigOrig)
+            if nextIndex == len(todo) and not active:
+                break
         
-        return cumul % 0x100000000
+        return {key: n % 0x100000000 for key, n in results.items()}
     
     def deleteIndexMap(self, tag):
         """
@@ -939,6 +1058,55 @@ class LinkedWriter(object):
         
         self.linkHistory = [None] * len(self.links)
     
+    def flushShared(self, **kwArgs):
+        """
+        Adds all the blocks held since sharing was started (or since the last
+        flush), one copy of each. This does nothing if sharing is off. The
+        following keyword argument is supported:
+        
+            ifSpanOver      If specified, the flush is only done if the number
+                            of bytes from the start of the current sharing
+                            span to the end of the held blocks would exceed
+                            this value. Callers adding data with 16-bit links
+                            to the held blocks should flush this way between
+                            the objects they add, so the links stay in range.
+        
+        >>> w = LinkedWriter()
+        >>> w.startSharing()
+        >>> base = w.stakeCurrent()
+        >>> stake = w.getNewStake()
+        >>> w.addUnresolvedOffset("H", base, stake)
+        >>> w.addSharedString(stake, b"AB")
+        >>> w.flushShared(ifSpanOver=10)
+        >>> w.byteLength
+        2
+        >>> w.flushShared()
+        >>> w.byteLength
+        4
+        """
+        
+        if self.sharedBlocks is None:
+            return
+        
+        limit = kwArgs.get('ifSpanOver', None)
+        
+        if limit is not None:
+            span = self.byteLength - self.sharedStart + self.sharedLength
+            
+            if self.sharedBlocks and span <= limit:
+                return
+        
+        for s, stakes in self.sharedBlocks.items():
+            for stakeValue in stakes:
+                self.stakeCurrentWithValue(stakeValue)
+            
+            self.addString(s)
+            self.sharedStakes.update(stakes)
+        
+        self.sharedBlocks = {}
+        self.sharedLength = 0
+        self.sharedStart = self.byteLength
+    
     def getNewIndexTag(self):
         """
         Returns a unique tag (string), not currently in use, so clients of the
@@ -1006,6 +1174,11 @@ class LinkedWriter(object):
         self.nextAvailableStake = 1
         self.negOffsetsOK = False
         self.bitLength = 0
+        self._openBitsIndex = None  # index of piece addBits may extend
+        self.sharedBlocks = None  # bytes -> stakes, while sharing is on
+        self.sharedLength = 0
+        self.sharedStart = 0
+        self.sharedStakes = set()  # stakes of all blocks written shared
     
     def setDeferredValue(self, stakeName, format, value):
         """
@@ -1065,6 +1238,7 @@ class LinkedWriter(object):
           8 * (len(s) - len(self.pieces[self.stakes[stakeName]][0])))
         
         self.pieces[self.stakes[stakeName]] = (s, None)
+        self._openBitsIndex = None
     
     def stakeCurrent(self):
         """
@@ -1087,6 +1261,7 @@ class LinkedWriter(object):
         
         if stakeValue not in self.stakes:
             self.stakes[stakeValue] = len(self.pieces)
+            self._openBitsIndex = None
         else:
             raise ValueError("Duplicate stake!")
         
@@ -1111,8 +1286,226 @@ class LinkedWriter(object):
         
         if stakeValue not in self.stakes:
             self.stakes[stakeValue] = len(self.pieces)
+            self._openBitsIndex = None
         else:
             raise ValueError("Duplicate stake!")
+    
+    def startSharing(self):
+        """
+        Turns on sharing, so that identical blocks added via addSharedString()
+        are only written once. See that method for an example.
+        """
+        
+        self.sharedBlocks = {}
+        self.sharedLength = 0
+        self.sharedStart = self.byteLength
+    
+    def stopSharing(self):
+        """
+        Adds any held shared blocks and turns sharing off.
+        """
+        
+        self.flushShared()
+        self.sharedBlocks = None
+    
+    def writeToFile(self, f, **kwArgs):
+        """
+        Resolves the pieces and writes them, one at a time, to the specified
+        destination, which may be either a path or an object with a write()
+        method (like an open binary file). The pieces themselves all stay in
+        memory; only the unified binary string is never created. A path is
+        written via writeToPathAtomically(), so it is either completely
+        replaced or left untouched. Returns the number of bytes written.
+        
+        >>> import io
+        >>> w = LinkedWriter()
+        >>> startStake = w.stakeCurrent()
+        >>> futureStake = w.getNewStake()
+        >>> w.addUnresolvedOffset("H", startStake, futureStake)
+        >>> w.addString(b"Hi there!")
+        >>> w.stakeCurrentWithValue(futureStake)
+        >>> w.add("h", -1)
+        >>> f = io.BytesIO()
+        >>> w.writeToFile(f)
+        13
+        >>> f.getvalue() == w.binaryString()
+        True
+        """
+        
+        if not hasattr(f, 'write'):
+            return writeToPathAtomically(
+              f,
+              lambda fileObj: self.writeToFile(fileObj, **kwArgs))
+        
+        byteCount = 0
+        
+        for bs in self._makeResolvedIterator(**kwArgs):
+            f.write(bs)
+            byteCount += len(bs)
+        
+        return byteCount
+
+class OffsetOverflowError(ValueError):
+    """
+    Exception class raised when one or more resolved offsets do not fit in
+    the formats they were added with. There is one attribute:
+    
+        overflows       A list of (tagFrom, tagTo) pairs, one for each link
+                        that overflowed, in the order the links were added.
+    
+    The message is the one for the first such link. Clients able to change how
+    they lay out their data (see fontio3.opentype.overflow, for instance) can
+    use the stakes to find the data that needs to move.
+    
+    >>> w = LinkedWriter()
+    >>> base = w.stakeCurrent()
+    >>> near, far = w.getNewStake(), w.getNewStake()
+    >>> w.addUnresolvedOffset("H", base, near)
+    >>> w.addUnresolvedOffset("B", base, far)
+    >>> w.stakeCurrentWithValue(near)
+    >>> w.addString(bytes(300))
+    >>> w.stakeCurrentWithValue(far)
+    >>> try:
+    ...   w.binaryString()
+    ... except OffsetOverflowError as e:
+    ...   print(e.overflows == [(base, far)], isinstance(e, ValueError))
+    True True
+    """
+    
+    def __init__(self, message, overflows):
+        super(OffsetOverflowError, self).__init__(message)
+        self.overflows = overflows
+
+# -----------------------------------------------------------------------------
+
+#
+# Public functions
+#
+
+if 0:
+    def __________________(): pass
+
+def appendBits(buffer, bufferBitCount, bitString, bitCount=None):
+    """
+    Appends the high-order bitCount bits of bitString to buffer, which is a
+    bytearray whose first bufferBitCount bits are meaningful (any bits after
+    those in the last byte must be zero). If bitCount is None, all the bits in
+    bitString are used. Returns the new meaningful bit count.
+    
+    When buffer is byte-aligned, the new bytes are simply copied as a slice;
+    otherwise the new bits are shifted into place as a single integer, and
+    only the partial last byte of buffer is touched.
+    
+    >>> b = bytearray()
+    >>> n = appendBits(b, 0, bytes.fromhex("FF FF"), 9)
+    >>> n, b.hex()
+    (9, 'ff80')
+    >>> n = appendBits(b, n, bytes.fromhex("55"), 6)
+    >>> n, b.hex()
+    (15, 'ffaa')
+    >>> n = appendBits(b, n, b"ABC")
+    >>> n, b.hex()
+    (39, 'ffaa828486')
+    >>> appendBits(b, n, b"Z", 0)
+    39
+    """
+    
+    if bitCount is None:
+        bitCount = 8 * len(bitString)
+    
+    if not bitCount:
+        return bufferBitCount
+    
+    byteCount = (bitCount + 7) >> 3
+    partialBits = bufferBitCount & 7
+    
+    if not partialBits:
+        buffer += bitString[0:byteCount]
+        
+        if bitCount & 7:
+            buffer[-1] &= (0xFF00 >> (bitCount & 7)) & 0xFF
+    
+    else:
+        n = int.from_bytes(bitString[0:byteCount], 'big')
+        n >>= (8 * byteCount - bitCount)
+        n |= (buffer.pop() >> (8 - partialBits)) << bitCount
+        totalBits = partialBits + bitCount
+        totalBytes = (totalBits + 7) >> 3
+        n <<= (8 * totalBytes - totalBits)
+        buffer += n.to_bytes(totalBytes, 'big')
+    
+    return bufferBitCount + bitCount
+
+def writeToPathAtomically(path, func):
+    """
+    Calls func with a binary file object opened on a new temporary file in
+    the same directory as path, and then renames that file over path. If func
+    raises an exception the temporary file is removed and path is left alone,
+    so a failed write can never leave a truncated file behind. This also makes
+    it safe to write over a file that is still memory-mapped (for instance, by
+    a MappedFileWalkerBit with zeroCopy set), since the mapped data are never
+    modified. An existing file's permission bits are kept, and a symbolic
+    link at path is followed rather than replaced. Returns whatever func
+    returns.
+    
+    >>> import os, tempfile
+    >>> from fontio3.utilities import filewalkerbit
+    >>> d = tempfile.mkdtemp()
+    >>> p = os.path.join(d, "test.bin")
+    >>> writeToPathAtomically(p, lambda f: f.write(b"abcdef"))
+    6
+    >>> w = filewalkerbit.MappedFileWalkerBit(p, zeroCopy=True)
+    >>> lw = LinkedWriter()
+    >>> lw.addString(w.chunk(3))
+    >>> lw.addString(w.rest())
+    >>> lw.addString(b"!")
+    >>> lw.writeToFile(p)
+    7
+    >>> open(p, "rb").read()
+    b'abcdef!'
+    >>> def fail(f):
+    ...     f.write(b"partial")
+    ...     raise ValueError("failed")
+    >>> writeToPathAtomically(p, fail)
+    Traceback (most recent call last):
+      ...
+    ValueError: failed
+    >>> open(p, "rb").read(), os.listdir(d)
+    (b'abcdef!', ['test.bin'])
+    >>> del w
+    >>> os.remove(p)
+    >>> os.rmdir(d)
+    """
+    
+    path = os.path.realpath(path)
+    
+    fd, tempPath = tempfile.mkstemp(
+      dir = os.path.dirname(path),
+      prefix = ".%s." % (os.path.basename(path),),
+      suffix = ".tmp")
+    
+    try:
+        with os.fdopen(fd, "wb") as f:
+            r = func(f)
+        
+        if os.path.exists(path):
+            mode = os.stat(path).st_mode & 0o7777
+        
+        else:
+            mask = os.umask(0)
+            os.umask(mask)
+            mode = 0o666 & ~mask
+        
+        os.chmod(tempPath, mode)
+        os.replace(tempPath, path)
+    
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        
+        raise
+    
+    return r
 
 # -----------------------------------------------------------------------------
 